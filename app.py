@@ -3,35 +3,134 @@ Law-to-Code MVP Prototype — DCL + CLEARANCE + Use-Case Storage
 
 Routes:
 - GET  /                : eenvoudige demo-UI (DCL + CLEARANCE)
-- POST /dcl/parse       : law-text -> DCL schema
-- POST /clearance/check : schema + data -> compliance + proof hash
+- POST /dcl/parse       : law-text -> DCL schema (optioneel registreren)
+- GET  /dcl/schemas/{h} : geregistreerd schema opvragen op hash
+- DELETE /dcl/schemas/{h} : schema uit de registry halen (+ caches invalideren)
+- POST /clearance/check : schema (of schema_ref) + data -> compliance + proof hash
+- POST /clearance/check-batch : schema + NDJSON records -> NDJSON resultaten
+- GET  /proofs/batches/{root}/{i} : inclusion path van record i in een batch
+- POST /proofs/verify   : inclusion proof controleren tegen een Merkle-root
+- POST /proofs/verify-log : proof_hash van een ProofLog herberekenen
+- POST /library/laws    : schema (of schema_ref) aan de wettenbibliotheek toevoegen
+- GET  /library/laws    : wetten in de bibliotheek
+- DELETE /library/laws/{h} : wet uit de bibliotheek halen
+- POST /library/check   : één record tegen alle toepasselijke wetten checken
+- GET  /ledger/entries  : proof-ledger, nieuwste eerst (filter op wet, gepagineerd)
+- GET  /ledger/entries/{proof_hash} : ledger-entries (met proof) voor één proof hash
+- GET  /ledger/verify   : integriteitscontrole van de hash-keten (parallel per stuk)
 - POST /usecases/submit : Use-Case Inventory formulier -> DB + hash
-- GET  /admin/usecases  : JSON lijst met alle use-cases
+- GET  /admin/usecases  : JSON lijst met use-cases (gepagineerd, filterbaar)
+- GET  /admin/usecases/export : volledige inventory als NDJSON/CSV/Parquet (gestreamd)
+- GET  /metrics         : Prometheus-metrics (latency per route en per stap)
 
 Opmerking:
 Deze versie verwacht dat er in dezelfde map een `database.py`
-en een `models_usecase.py` staan met de SQLAlchemy instellingen.
+en een `models_usecase.py` staan met de SQLAlchemy instellingen,
+plus `models_dcl.py` (DCL-modellen), `dcl_compiler.py` (gecompileerde
+evaluatie van schema's), `schema_registry.py` (schema's op hash) en
+`proofs.py` (canonieke JSON + proof hashes) en `law_library.py` +
+`predicate_network.py` (alle wetten tegelijk checken).
 """
 
 from __future__ import annotations
 
+import asyncio
+import base64
+import codecs
 import hashlib
 import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import FastAPI, Body, Form
-from fastapi.responses import HTMLResponse
-from pydantic import BaseModel, Field
-
-from sqlalchemy.orm import Session
-from database import Base, engine, SessionLocal
-from models_usecase import UseCase
+from fastapi import FastAPI, Body, Depends, Form, HTTPException, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import HTMLResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, ValidationError, field_validator, model_validator
+
+from sqlalchemy import func, insert, null, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.schema import CreateIndex
+from database import (
+    AsyncSessionLocal,
+    Base,
+    async_engine,
+    engine,
+    get_async_db,
+)
+from models_usecase import CONTEXT_INDEX_PREFIX, UseCase
+from models_ledger import LedgerEntry
+from models_dcl import DCLRule, DCLSchema, ClearanceResult, InclusionProof, ProofLog
+from dcl_compiler import CompiledSchema, compile_schema, schema_key
+from dcl_parser import (
+    StreamParser,
+    auto_cast,
+    chunk_rules,
+    gc_paused,
+    line_chunks,
+    parse_law_text,
+    reparse,
+    rules_from_chunks,
+    splice_changes,
+)
+from batch_pool import BatchPool, ChunkResult, count_records, mp_context, result_lines
+from proofs import (
+    HASH_ALGORITHMS,
+    canonical_json,
+    new_hasher,
+    proof_log_bytes,
+    verify_proof_log,
+)
+from law_library import LawLibrary
+from lru import LRUCache
+from ledger import GENESIS_HASH, chain_rows, verify_chunk
+from merkle import MerkleBuilder, close_builder, verify_inclusion
+from schema_registry import RegisteredSchema, SchemaRegistry, schema_digest
+from result_cache import SchemaScopedCache
+from streaming import DuplexStreamingResponse, aiter_line_batches
+from usecase_export import EXPORT_FORMATS, parquet_available
+from write_behind import WriteBehindQueue
+from metrics import (
+    REGISTRY,
+    STAGE_LATENCY,
+    CallbackCounter,
+    Gauge,
+    MetricsMiddleware,
+    count_rule_evaluations,
+)
 
 # -------------------------------------------------
 # FastAPI app
 # -------------------------------------------------
-app = FastAPI(title="Law-to-Code MVP: DCL + CLEARANCE + Storage")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # na een vorige shutdown (bv. een tweede TestClient) zijn de queues gesloten
+    ledger_writer.start()
+    if usecase_writer is not None:
+        usecase_writer.start()
+    yield
+    if usecase_writer is not None:
+        await usecase_writer.stop()
+    await ledger_writer.stop()
+    shutdown_ledger_pool()
+    shutdown_parse_pool()
+    shutdown_batch_pool()
+    await async_engine.dispose()
+
+
+app = FastAPI(title="Law-to-Code MVP: DCL + CLEARANCE + Storage", lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
+
+# Standaard hashalgoritme voor nieuwe proofs (zie proofs.HASH_ALGORITHMS)
+PROOF_HASH_ALGORITHM = os.getenv("PROOF_HASH_ALGORITHM", "sha256")
+new_hasher(PROOF_HASH_ALGORITHM)  # onbekend algoritme: meteen falen bij het opstarten
+
+# Geregistreerde (en gecompileerde) schema's, op hash van hun inhoud
+schema_registry = SchemaRegistry(maxsize=int(os.getenv("SCHEMA_REGISTRY_SIZE", "1024")))
 
 # -------------------------------------------------
 # DATABASE-SETUP
@@ -41,55 +140,11 @@ app = FastAPI(title="Law-to-Code MVP: DCL + CLEARANCE + Storage")
 # Maak tabellen aan als ze nog niet bestaan
 Base.metadata.create_all(bind=engine)
 
-
-def get_db():
-    """Eenvoudige dependency om een DB-sessie te krijgen."""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-# -------------------------------------------------
-# DCL-MODELLEN
-# -------------------------------------------------
-class DCLRule(BaseModel):
-    id: str
-    type: str  # required | equals | max | min | in
-    field: str
-    value: Optional[Any] = None
-
-
-class DCLSchema(BaseModel):
-    law_title: str = "Untitled Law Snippet"
-    rules: List[DCLRule]
-    source_text: str
-    generated_at: str = Field(
-        default_factory=lambda: datetime.now(timezone.utc).isoformat()
-    )
-
-
-# -------------------------------------------------
-# CLEARANCE-MODELLEN
-# -------------------------------------------------
-class ClearanceResult(BaseModel):
-    rule_id: str
-    field: str
-    passed: bool
-    details: str
-
-
-class ProofLog(BaseModel):
-    law_title: str
-    schema: DCLSchema
-    data_checked: Dict[str, Any]
-    results: List[ClearanceResult]
-    overall_passed: bool
-    generated_at: str = Field(
-        default_factory=lambda: datetime.now(timezone.utc).isoformat()
-    )
-    proof_hash: str
+# create_all maakt geen nieuwe indexen op bestaande tabellen
+with engine.begin() as _conn:
+    for _table in (UseCase.__table__, LedgerEntry.__table__):
+        for _index in _table.indexes:
+            _conn.execute(CreateIndex(_index, if_not_exists=True))
 
 
 # -------------------------------------------------
@@ -110,31 +165,10 @@ Voorbeeld:
   require category
   in category [electronics, furniture]
   max weight 50
-"""
-
-
-def auto_cast(txt: str) -> Any:
-    t = txt.strip()
-
-    if t.lower() in {"true", "false"}:
-        return t.lower() == "true"
-
-    try:
-        return int(t)
-    except ValueError:
-        pass
-
-    try:
-        return float(t)
-    except ValueError:
-        pass
-
-    if (t.startswith("'") and t.endswith("'")) or (
-        t.startswith('"') and t.endswith('"')
-    ):
-        return t[1:-1]
 
-    return t
+`parse_rule_line()` is de referentie per lijn; de API gebruikt `parse_rules()`
+uit `dcl_parser.py`, die in één doorgang exact dezelfde regels geeft.
+"""
 
 
 def parse_rule_line(line: str, idx: int) -> Optional[DCLRule]:
@@ -196,6 +230,8 @@ def parse_rule_line(line: str, idx: int) -> Optional[DCLRule]:
 # -------------------------------------------------
 # CLEARANCE LOGICA
 # -------------------------------------------------
+# Referentie-interpreter. De API gebruikt de gecompileerde variant uit
+# `dcl_compiler.py`, die exact dezelfde resultaten geeft.
 def evaluate(schema: DCLSchema, data: Dict[str, Any]) -> Tuple[List[ClearanceResult], bool]:
     results: List[ClearanceResult] = []
     overall = True
@@ -249,71 +285,901 @@ def evaluate(schema: DCLSchema, data: Dict[str, Any]) -> Tuple[List[ClearanceRes
     return results, overall
 
 
-def proof_hash(payload: Dict[str, Any]) -> str:
-    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode(
-        "utf-8"
-    )
-    return hashlib.sha256(canonical).hexdigest()
-
-
 # -------------------------------------------------
 # API: DCL + CLEARANCE
 # -------------------------------------------------
 class ParseRequest(BaseModel):
     law_text: str
     law_title: Optional[str] = None
+    # schema registreren; de hash komt terug in de header X-Schema-Hash
+    register: bool = False
+    # hash van een vorige versie die door dit schema vervangen wordt
+    replaces: Optional[str] = None
+
+
+def law_text_digest(law_text: str) -> str:
+    # surrogatepass: ook losse surrogates uit JSON (\ud800) geven een digest
+    return hashlib.sha256(law_text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+# Geparste schema's op digest van law_text. Bij een hit worden enkel
+# law_title en generated_at opnieuw ingevuld; de regels worden gedeeld.
+parse_cache: LRUCache[str, DCLSchema] = LRUCache(
+    maxsize=int(os.getenv("PARSE_CACHE_SIZE", "1024")),
+    max_bytes=int(os.getenv("PARSE_CACHE_MAX_MB", "64")) << 20,
+    # ruwe schatting: de tekst zelf plus een vaste kost per DCLRule
+    sizeof=lambda schema: len(schema.source_text) + 300 * len(schema.rules) + 200,
+)
+
+
+# Grote teksten (vanaf PARSE_POOL_MIN_CHARS tekens) worden in stukken van
+# ~PARSE_POOL_CHUNK_CHARS tekens (op een lijngrens) in een procespool
+# geparst. Standaard uit (PARSE_POOL_WORKERS = 1): de stap naar DCLRule's
+# (80-90% van het werk) blijft in het webproces, en een winst is nog niet
+# gemeten op een machine met meerdere cores.
+PARSE_POOL_WORKERS = int(os.getenv("PARSE_POOL_WORKERS", "1"))
+PARSE_POOL_MIN_CHARS = int(os.getenv("PARSE_POOL_MIN_CHARS", "4000000"))
+PARSE_POOL_CHUNK_CHARS = int(os.getenv("PARSE_POOL_CHUNK_CHARS", "500000"))
+parse_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _parse_pool() -> ProcessPoolExecutor:
+    global parse_pool
+    if parse_pool is None:
+        parse_pool = ProcessPoolExecutor(max_workers=PARSE_POOL_WORKERS, mp_context=mp_context())
+    return parse_pool
+
+
+def shutdown_parse_pool() -> None:
+    global parse_pool
+    if parse_pool is not None:
+        parse_pool.shutdown()
+        parse_pool = None
+
+
+async def parse_law_text_pooled(law_text: str, law_title: Optional[str] = None) -> DCLSchema:
+    """`parse_law_text()`, voor grote teksten verdeeld over de parse-pool."""
+    if PARSE_POOL_WORKERS <= 1 or len(law_text) < PARSE_POOL_MIN_CHARS:
+        return parse_law_text(law_text, law_title)
+
+    loop = asyncio.get_running_loop()
+    pool = _parse_pool()
+    blobs = await asyncio.gather(
+        *(
+            loop.run_in_executor(pool, chunk_rules, chunk, first_line)
+            for chunk, first_line in line_chunks(law_text, PARSE_POOL_CHUNK_CHARS)
+        )
+    )
+    return DCLSchema(
+        law_title=law_title or "Law Snippet",
+        rules=rules_from_chunks(blobs),
+        source_text=law_text,
+    )
 
 
 @app.post("/dcl/parse", response_model=DCLSchema)
-async def dcl_parse(req: ParseRequest):
-    lines = req.law_text.splitlines()
-    rules: List[DCLRule] = []
+async def dcl_parse(req: ParseRequest, response: Response):
+    key = law_text_digest(req.law_text)
+    law_title = req.law_title or "Law Snippet"
+    cached = parse_cache.get(key)
+    if cached is not None:
+        schema = cached.model_copy(
+            update={
+                "law_title": law_title,
+                "generated_at": datetime.now(timezone.utc).isoformat(),
+            }
+        )
+        response.headers["X-Parse-Cache"] = "hit"
+    else:
+        with STAGE_LATENCY.time("parse"):
+            schema = await parse_law_text_pooled(req.law_text, law_title)
+        parse_cache.put(key, schema)
+        response.headers["X-Parse-Cache"] = "miss"
 
-    for i, line in enumerate(lines, start=1):
-        r = parse_rule_line(line, i)
-        if r:
-            rules.append(r)
+    if req.register:
+        entry = schema_registry.register(schema, replaces=req.replaces)
+        response.headers["X-Schema-Hash"] = entry.hash
 
-    return DCLSchema(
-        law_title=req.law_title or "Law Snippet",
-        rules=rules,
-        source_text=req.law_text,
+    return schema
+
+
+@app.post("/dcl/parse/stream")
+async def dcl_parse_stream(request: Request):
+    """
+    Law-text als ruwe UTF-8 body (mag chunked); de regels komen als NDJSON
+    terug terwijl de tekst binnenkomt, met een afsluitende lijn
+    `{"lines", "rules", "law_text_digest"}`. Ongeldige UTF-8 geeft een lijn
+    `{"error": ...}` en stopt.
+    """
+
+    async def rules():
+        parser = StreamParser()
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        digest = hashlib.sha256()
+        count = 0
+        try:
+            async for chunk in request.stream():
+                digest.update(chunk)
+                parsed = parser.feed(decoder.decode(chunk))
+                if parsed:
+                    count += len(parsed)
+                    yield _ndjson_rules(parsed)
+            parsed = parser.feed(decoder.decode(b"", final=True)) + parser.close()
+        except UnicodeDecodeError:
+            yield b'{"error":"law text is not valid UTF-8"}\n'
+            return
+        count += len(parsed)
+        if parsed:
+            yield _ndjson_rules(parsed)
+        trailer = {"lines": parser.line, "rules": count, "law_text_digest": digest.hexdigest()}
+        yield (json.dumps(trailer, separators=(",", ":")) + "\n").encode("utf-8")
+
+    return DuplexStreamingResponse(rules(), media_type="application/x-ndjson")
+
+
+def _ndjson_rules(rules: List[DCLRule]) -> bytes:
+    return b"".join(rule.model_dump_json().encode("utf-8") + b"\n" for rule in rules)
+
+
+class ParseEditRequest(BaseModel):
+    # geregistreerde vorige versie (X-Schema-Hash van /dcl/parse)
+    schema_ref: str
+    # lijnen start..end-1 (vanaf 1) worden vervangen door de lijnen van `text`;
+    # start == end voegt in vóór lijn `start`
+    start: int
+    end: int
+    text: str = ""
+    law_title: Optional[str] = None
+    # vorige versie uit de registry verwijderen
+    replace: bool = False
+
+
+class ParseEditResult(BaseModel):
+    """Wijzigingen t.o.v. `schema_ref`; het volledige schema via GET /dcl/schemas/{hash}."""
+
+    schema_hash: str
+    law_title: str
+    # ids (van de vorige versie) die verdwenen en de nieuwe regels; een regel
+    # met enkel een verschoven id staat er niet in
+    removed: List[str]
+    added: List[DCLRule]
+    # regels vanaf lijn `shift_from` (vorige versie) schoven `shift` lijnen op
+    shift: int
+    shift_from: int
+
+
+@app.post("/dcl/parse/edit", response_model=ParseEditResult)
+async def dcl_parse_edit(req: ParseEditRequest, response: Response):
+    base = schema_registry.get(req.schema_ref)
+    if base is None:
+        raise HTTPException(status_code=404, detail="Unknown schema_ref")
+    try:
+        with STAGE_LATENCY.time("parse"):
+            schema, splice = reparse(base.schema, req.start, req.end, req.text, req.law_title)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    # een edit die lijnen verschuift maakt per regel erna nieuwe objecten
+    with gc_paused():
+        entry = schema_registry.register_splice(
+            base,
+            schema,
+            splice.start,
+            splice.stop,
+            splice.count,
+            replaces=req.schema_ref if req.replace else None,
+        )
+    parse_cache.put(law_text_digest(schema.source_text), schema)
+    response.headers["X-Schema-Hash"] = entry.hash
+    removed, added = splice_changes(base.schema, schema, splice)
+    return ParseEditResult(
+        schema_hash=entry.hash,
+        law_title=schema.law_title,
+        removed=[r.id for r in removed],
+        added=added,
+        shift=splice.shift,
+        shift_from=splice.shift_from,
     )
 
 
-class ClearanceRequest(BaseModel):
-    schema: DCLSchema
+@app.get("/dcl/schemas/{schema_hash}", response_model=DCLSchema)
+async def dcl_schema_get(schema_hash: str):
+    entry = schema_registry.get(schema_hash)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Unknown schema hash")
+    return entry.schema
+
+
+@app.delete("/dcl/schemas/{schema_hash}", status_code=204)
+async def dcl_schema_delete(schema_hash: str):
+    if not schema_registry.remove(schema_hash):
+        raise HTTPException(status_code=404, detail="Unknown schema hash")
+    return Response(status_code=204)
+
+
+class SchemaSource(BaseModel):
+    """Een schema inline (`schema`) of via de registry (`schema_ref`)."""
+
+    schema: Optional[DCLSchema] = None
+    schema_ref: Optional[str] = None
+
+    @model_validator(mode="after")
+    def _exactly_one(self):
+        if (self.schema is None) == (self.schema_ref is None):
+            raise ValueError("Provide exactly one of 'schema' or 'schema_ref'")
+        return self
+
+
+# Gecompileerde inline schema's, op `schema_key()`: compileren kost meer dan
+# één keer interpreteren, dus een herhaald inline schema wordt hergebruikt.
+inline_schemas: LRUCache[str, CompiledSchema] = LRUCache(
+    maxsize=int(os.getenv("INLINE_SCHEMA_CACHE_SIZE", "256")),
+    max_bytes=int(os.getenv("INLINE_SCHEMA_CACHE_MAX_MB", "64")) << 20,
+    # ruwe schatting: DCLRule + gecompileerde regel (closures) + schema-JSON
+    sizeof=lambda c: len(c.schema.source_text) + 1100 * len(c.rules) + 200,
+)
+
+
+def compile_inline(schema: DCLSchema, key: Optional[str] = None) -> CompiledSchema:
+    """`compile_schema()` met de cache `inline_schemas`; `key` = `schema_key(schema)`."""
+    if key is None:
+        key = schema_key(schema)
+    compiled = inline_schemas.get(key)
+    if compiled is None:
+        compiled = compile_schema(schema)
+        inline_schemas.put(key, compiled)
+    return compiled
+
+
+def _registered(schema_ref: str) -> RegisteredSchema:
+    entry = schema_registry.get(schema_ref)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Unknown schema_ref")
+    return entry
+
+
+def resolve_schema(
+    src: SchemaSource, key: Optional[str] = None
+) -> Tuple[DCLSchema, CompiledSchema]:
+    """Schema en gecompileerd schema; `key` = `resolve_schema_key(src)`, als al bekend."""
+    if src.schema_ref is not None:
+        entry = _registered(src.schema_ref)
+        return entry.schema, entry.compiled
+    return src.schema, compile_inline(src.schema, key)
+
+
+def resolve_schema_key(src: SchemaSource) -> Tuple[DCLSchema, str]:
+    """Schema en `schema_key()`, zonder een inline schema te compileren."""
+    if src.schema_ref is not None:
+        entry = _registered(src.schema_ref)
+        return entry.schema, entry.compiled.key
+    return src.schema, schema_key(src.schema)
+
+
+class ClearanceRequest(SchemaSource):
     data: Dict[str, Any]
+    # Deterministische proof: `generated_at` wordt overgenomen als het
+    # meegegeven is, en anders weggelaten (i.p.v. het huidige tijdstip).
+    generated_at: Optional[str] = None
+    deterministic: bool = False
+    # standaard PROOF_HASH_ALGORITHM
+    hash_algorithm: Optional[str] = None
+    # proof in de ledger bewaren; standaard volgens PROOF_LEDGER
+    persist: Optional[bool] = None
+
+    @field_validator("hash_algorithm")
+    @classmethod
+    def _known_algorithm(cls, v: Optional[str]) -> Optional[str]:
+        if v is not None and v not in HASH_ALGORITHMS:
+            raise ValueError(f"hash_algorithm must be one of {sorted(HASH_ALGORITHMS)}")
+        return v
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def _timed(cls, data: Any, handler):
+        # FastAPI valideert de body vóór de handler, dus buiten de andere stappen
+        with STAGE_LATENCY.time("validate"):
+            return handler(data)
+
+
+# Caches per schema (sleutel: `schema_key()` van het schema):
+# - result_cache: data-digest -> (canonieke results-JSON, overall)
+# - proof_cache : (data-digest, generated_at, algoritme) -> (response-body,
+#                 proof hash) van een deterministische proof
+_MB = 1 << 20
+result_cache: SchemaScopedCache[Tuple[str, bool]] = SchemaScopedCache(
+    maxsize=int(os.getenv("RESULT_CACHE_SIZE", "10000")),
+    max_bytes=int(os.getenv("RESULT_CACHE_MAX_MB", "64")) * _MB,
+    sizeof=lambda v: len(v[0]) + 64,
+    ttl=float(os.getenv("RESULT_CACHE_TTL", "3600")) or None,
+)
+proof_cache: SchemaScopedCache[Tuple[bytes, str]] = SchemaScopedCache(
+    maxsize=int(os.getenv("PROOF_CACHE_SIZE", "4096")),
+    max_bytes=int(os.getenv("PROOF_CACHE_MAX_MB", "64")) * _MB,
+    sizeof=lambda v: len(v[0]) + 64,
+)
+
+
+def _invalidate_schema_caches(entry: RegisteredSchema) -> None:
+    result_cache.invalidate(entry.compiled.key)
+    proof_cache.invalidate(entry.compiled.key)
+
+
+schema_registry.on_remove(_invalidate_schema_caches)
 
 
 @app.post("/clearance/check", response_model=ProofLog)
 async def clearance_check(req: ClearanceRequest):
-    results, overall = evaluate(req.schema, req.data)
+    # eerst de caches: een hit compileert en serialiseert het schema niet
+    schema, key = resolve_schema_key(req)
+    data_json = canonical_json(req.data)
+    data_hash = hashlib.sha256(data_json.encode("utf-8")).hexdigest()
+
+    algorithm = req.hash_algorithm or PROOF_HASH_ALGORITHM
+    persist = PROOF_LEDGER if req.persist is None else req.persist
+    deterministic = req.deterministic or req.generated_at is not None
+    if deterministic:
+        generated_at = req.generated_at
+        hit = proof_cache.get(key, (data_hash, generated_at, algorithm))
+        if hit is not None:
+            body, h = hit
+            if persist:
+                await persist_proof(schema.law_title, h, algorithm, body)
+            return Response(
+                content=body, media_type="application/json", headers={"X-Proof-Cache": "hit"}
+            )
+    else:
+        generated_at = datetime.now(timezone.utc).isoformat()
+
+    _, compiled = resolve_schema(req, key)
+    cached = result_cache.get(key, data_hash)
+    if cached is None:
+        with STAGE_LATENCY.time("evaluate"):
+            results, overall = compiled.evaluate_dicts(req.data)
+        count_rule_evaluations(compiled.type_counts)
+        cached = (canonical_json(results), overall)
+        result_cache.put(key, data_hash, cached)
+    results_json, overall = cached
+
+    # Eén serialisatie: dezelfde canonieke bytes worden gehasht én als body
+    # teruggestuurd (zonder extra validatie door response_model).
+    with STAGE_LATENCY.time("hash"):
+        body, h = proof_log_bytes(
+            law_title=schema.law_title,
+            schema_json=compiled.schema_json,
+            data_json=data_json,
+            results_json=results_json,
+            overall_passed=overall,
+            generated_at=generated_at,
+            hash_algorithm=algorithm,
+        )
 
-    payload = {
-        "law_title": req.schema.law_title,
-        "schema": json.loads(req.schema.model_dump_json()),
-        "data_checked": req.data,
-        "results": [r.model_dump() for r in results],
-        "overall_passed": overall,
-        "generated_at": datetime.now(timezone.utc).isoformat(),
+    if persist:
+        await persist_proof(schema.law_title, h, algorithm, body)
+
+    headers = None
+    if deterministic:
+        proof_cache.put(key, (data_hash, generated_at, algorithm), (body, h))
+        headers = {"X-Proof-Cache": "miss"}
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# -------------------------------------------------
+# API: BATCH-CLEARANCE (NDJSON)
+# -------------------------------------------------
+"""
+POST /clearance/check-batch, body = NDJSON:
+
+  lijn 1     : {"schema": {...}} of {"schema_ref": "<hash>"}
+  lijn 2..n  : één data-object per lijn
+
+Antwoord (NDJSON, gestreamd), één compacte lijn per record:
+
+  {"index":0,"overall_passed":false,"failed":["r3"]}
+  {"index":1,"error":"invalid JSON object"}
+
+Lege lijnen worden overgeslagen en krijgen geen index.
+
+Met `?proofs=true` krijgt elke lijn ook een `proof_hash` (over schema-hash,
+index, data en uitkomst). Die hashes vormen een Merkle-boom; de laatste lijn
+is dan {"merkle_root": ..., "tree_size": n, "schema_hash": ...,
+"hash_algorithm": ...}. Het algoritme geldt voor de proof hashes van de
+records; de boom zelf gebruikt altijd SHA-256 (RFC 6962). Een inclusion path
+per record volgt via GET /proofs/batches/{root}/{index}.
+"""
+
+# Grote batches: vanaf BATCH_POOL_MIN_RECORDS records gaan stukken van
+# BATCH_POOL_CHUNK_RECORDS records naar één procespool van BATCH_POOL_WORKERS
+# processen, gedeeld door alle batches. BATCH_POOL_WORKERS <= 1 zet dat uit.
+BATCH_POOL_WORKERS = int(os.getenv("BATCH_POOL_WORKERS", str(os.cpu_count() or 1)))
+BATCH_POOL_MIN_RECORDS = int(os.getenv("BATCH_POOL_MIN_RECORDS", "100000"))
+BATCH_POOL_CHUNK_RECORDS = int(os.getenv("BATCH_POOL_CHUNK_RECORDS", "10000"))
+batch_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _batch_pool() -> ProcessPoolExecutor:
+    global batch_pool
+    if batch_pool is None:
+        batch_pool = ProcessPoolExecutor(max_workers=BATCH_POOL_WORKERS, mp_context=mp_context())
+    return batch_pool
+
+
+def shutdown_batch_pool() -> None:
+    global batch_pool
+    if batch_pool is not None:
+        batch_pool.shutdown(cancel_futures=True)
+        batch_pool = None
+
+# Afgewerkte batch-bomen, op hex-root (voor inclusion paths achteraf)
+batch_proofs: LRUCache[str, MerkleBuilder] = LRUCache(
+    maxsize=int(os.getenv("MERKLE_BATCH_STORE_SIZE", "64")), on_evict=close_builder
+)
+
+
+async def _read_batch_header(batches) -> Tuple[SchemaSource, List[bytes]]:
+    """Leest de schema-lijn; geeft ook de rest van die eerste batch terug."""
+    async for lines in batches:
+        for pos, line in enumerate(lines):
+            if not line.strip():
+                continue
+            try:
+                src = SchemaSource.model_validate_json(line)
+            except ValidationError as e:
+                raise RequestValidationError(e.errors())
+            return src, lines[pos + 1 :]
+    raise HTTPException(status_code=400, detail="Missing schema header line")
+
+
+async def _prepend(first: List[bytes], batches):
+    if first:
+        yield first
+    async for lines in batches:
+        yield lines
+
+
+def _batch_chunk_done(
+    compiled: CompiledSchema, result: ChunkResult, tree: Optional[MerkleBuilder]
+) -> bytes:
+    chunk, _, evaluated, hashes = result
+    if tree is not None:
+        for h in hashes:
+            tree.append(h)
+    # lijnen met ongeldige JSON tellen niet mee
+    count_rule_evaluations(compiled.type_counts, records=evaluated)
+    return chunk
+
+
+@app.post("/clearance/check-batch")
+async def clearance_check_batch(request: Request, proofs: bool = False):
+    batches = aiter_line_batches(request.stream())
+    src, first_lines = await _read_batch_header(batches)
+    schema, compiled = resolve_schema(src)
+
+    schema_hash = None
+    tree = None
+    if proofs:
+        schema_hash = src.schema_ref or schema_digest(schema)
+        tree = MerkleBuilder()
+
+    async def results():
+        finished = False
+        pool: Optional[BatchPool] = None
+        # stuk voor de pool in opbouw
+        pending: List[bytes] = []
+        pending_records = 0
+        pending_start = index = 0
+
+        try:
+            # eerst inline; vanaf BATCH_POOL_MIN_RECORDS records naar de procespool
+            async for lines in _prepend(first_lines, batches):
+                if pool is None:
+                    if BATCH_POOL_WORKERS > 1 and index >= BATCH_POOL_MIN_RECORDS:
+                        pool = BatchPool(
+                            _batch_pool(),
+                            compiled,
+                            schema_hash,
+                            PROOF_HASH_ALGORITHM,
+                            max_pending=2 * BATCH_POOL_WORKERS,
+                        )
+                        pending_start = index
+                    else:
+                        result = result_lines(
+                            compiled, lines, index, schema_hash, PROOF_HASH_ALGORITHM
+                        )
+                        chunk = _batch_chunk_done(compiled, result, tree)
+                        index = result[1]
+                        if chunk:
+                            yield chunk
+                        continue
+
+                pending.extend(lines)
+                pending_records += count_records(lines)
+                if pending_records < BATCH_POOL_CHUNK_RECORDS:
+                    continue
+                if pool.full:
+                    yield _batch_chunk_done(compiled, await pool.next_result(), tree)
+                pool.submit(pending, pending_start)
+                pending_start += pending_records
+                pending, pending_records = [], 0
+
+            if pool is not None:
+                if pending:
+                    pool.submit(pending, pending_start)
+                    pending = []
+                while len(pool):
+                    yield _batch_chunk_done(compiled, await pool.next_result(), tree)
+
+            if tree is not None:
+                root = tree.root().hex()
+                batch_proofs.put(root, tree)
+                finished = True
+                trailer = {
+                    "merkle_root": root,
+                    "tree_size": tree.size,
+                    "schema_hash": schema_hash,
+                    "hash_algorithm": PROOF_HASH_ALGORITHM,
+                }
+                yield (json.dumps(trailer, separators=(",", ":")) + "\n").encode("utf-8")
+        finally:
+            if pool is not None:
+                pool.close()
+            if tree is not None and not finished:
+                tree.close()
+
+    return DuplexStreamingResponse(results(), media_type="application/x-ndjson")
+
+
+# -------------------------------------------------
+# API: PROOFS
+# -------------------------------------------------
+@app.get("/proofs/batches/{root}/{index}", response_model=InclusionProof)
+async def proofs_batch_inclusion(root: str, index: int):
+    tree = batch_proofs.get(root)
+    if tree is None:
+        raise HTTPException(status_code=404, detail="Unknown batch root")
+    if not 0 <= index < tree.size:
+        raise HTTPException(status_code=404, detail="Index out of range")
+
+    return InclusionProof(
+        proof_hash=tree.proof_hash_at(index).hex(),
+        index=index,
+        tree_size=tree.size,
+        path=[p.hex() for p in tree.inclusion_path(index)],
+        root=root,
+    )
+
+
+@app.post("/proofs/verify")
+async def proofs_verify(proof: InclusionProof):
+    """Controleert een inclusion proof tegen een Merkle-root, in O(log n)."""
+    try:
+        valid = verify_inclusion(
+            bytes.fromhex(proof.proof_hash),
+            proof.index,
+            proof.tree_size,
+            [bytes.fromhex(p) for p in proof.path],
+            bytes.fromhex(proof.root),
+        )
+    except ValueError:
+        valid = False
+    return {"valid": valid}
+
+
+@app.post("/proofs/verify-log")
+async def proofs_verify_log(log: Dict[str, Any] = Body(...)):
+    """
+    Controleert de proof_hash van een ProofLog (zoals /clearance/check hem
+    teruggaf) met het algoritme uit `hash_algorithm`; zonder dat veld sha256.
+    """
+    algorithm = log.get("hash_algorithm", "sha256")
+    if not isinstance(algorithm, str) or algorithm not in HASH_ALGORITHMS:
+        raise HTTPException(status_code=400, detail=f"Unknown hash algorithm: {algorithm}")
+    return {"valid": verify_proof_log(log), "hash_algorithm": algorithm}
+
+
+# -------------------------------------------------
+# API: WETTENBIBLIOTHEEK
+# -------------------------------------------------
+# Alle wetten waartegen /library/check een record controleert. Los van de
+# registry-LRU: een wet blijft in de bibliotheek tot ze verwijderd wordt.
+law_library = LawLibrary()
+
+
+class LibraryCheckRequest(BaseModel):
+    data: Dict[str, Any]
+    # per wet ook de resultaten per regel (zoals /clearance/check)
+    details: bool = False
+    # ook wetten zonder enig veld in de record
+    all_laws: bool = False
+
+
+@app.post("/library/laws")
+async def library_add(src: SchemaSource):
+    if src.schema_ref is not None:
+        entry = schema_registry.get(src.schema_ref)
+        if entry is None:
+            raise HTTPException(status_code=404, detail="Unknown schema_ref")
+        schema_hash, schema = entry.hash, entry.schema
+    else:
+        schema_hash, schema = schema_digest(src.schema), src.schema
+    law_library.add(schema_hash, schema)
+    return {"schema_hash": schema_hash, "laws": len(law_library)}
+
+
+@app.get("/library/laws")
+async def library_list():
+    return [
+        {
+            "schema_hash": law.hash,
+            "law_title": law.schema.law_title,
+            "rules": len(law.schema.rules),
+        }
+        for law in law_library
+    ]
+
+
+@app.delete("/library/laws/{schema_hash}", status_code=204)
+async def library_remove(schema_hash: str):
+    if not law_library.remove(schema_hash):
+        raise HTTPException(status_code=404, detail="Unknown schema hash")
+    return Response(status_code=204)
+
+
+@app.post("/library/check")
+async def library_check(req: LibraryCheckRequest):
+    """
+    Checkt één record tegen alle wetten waarvan minstens één veld in de
+    record voorkomt (of alle wetten, met `all_laws`); gedeelde predicaten
+    worden maar één keer geëvalueerd.
+    """
+    with STAGE_LATENCY.time("library"):
+        laws, evaluated = law_library.check(
+            req.data, details=req.details, all_laws=req.all_laws
+        )
+    return {
+        "applicable": len(laws),
+        "predicates_evaluated": evaluated,
+        "laws": laws,
     }
 
-    h = proof_hash(payload)
 
-    return ProofLog(
-        law_title=req.schema.law_title,
-        schema=req.schema,
-        data_checked=req.data,
-        results=results,
-        overall_passed=overall,
-        proof_hash=h,
+# -------------------------------------------------
+# API: PROOF-LEDGER
+# -------------------------------------------------
+"""
+Append-only ledger met ProofLogs (tabel `proof_ledger`, keten in `ledger.py`).
+
+Schrijven gebeurt write-behind: /clearance/check zet de proof enkel in een
+queue en wacht niet op de commit. De flusher zet telkens een hele batch
+achter de staart van de keten, in één transactie. `prev_hash` is uniek:
+schrijft een andere worker ondertussen op dezelfde staart, dan faalt de
+insert en wordt de batch op de nieuwe staart opnieuw geketend.
+"""
+
+# standaard elke proof bewaren (per request te overschrijven met `persist`)
+PROOF_LEDGER = os.getenv("PROOF_LEDGER", "").lower() in ("1", "true", "yes")
+LEDGER_APPEND_RETRIES = 5
+LEDGER_VERIFY_WORKERS = int(os.getenv("LEDGER_VERIFY_WORKERS", str(os.cpu_count() or 1)))
+
+logger = logging.getLogger(__name__)
+
+
+async def append_ledger_entries(items: List[Dict[str, Any]]) -> List[int]:
+    """Ketent een batch proofs achter de huidige staart en schrijft ze weg."""
+    async with AsyncSessionLocal() as db:
+        for _ in range(LEDGER_APPEND_RETRIES):
+            tail = await db.scalar(
+                select(LedgerEntry.entry_hash).order_by(LedgerEntry.id.desc()).limit(1)
+            )
+            rows = chain_rows(tail or GENESIS_HASH, items)
+            try:
+                result = await db.execute(
+                    insert(LedgerEntry).returning(LedgerEntry.id, sort_by_parameter_order=True),
+                    rows,
+                )
+                ids = list(result.scalars())
+                await db.commit()
+                return ids
+            except IntegrityError:
+                await db.rollback()
+    raise RuntimeError("Could not append to the proof ledger (concurrent writers)")
+
+
+ledger_writer = WriteBehindQueue(
+    append_ledger_entries,
+    max_batch=int(os.getenv("LEDGER_BATCH_SIZE", "500")),
+    max_delay=int(os.getenv("LEDGER_BATCH_WINDOW_MS", "50")) / 1000,
+)
+
+
+def _ledger_write_done(fut: "asyncio.Future[Any]") -> None:
+    if not fut.cancelled() and fut.exception() is not None:
+        logger.error("Proof ledger write failed", exc_info=fut.exception())
+
+
+async def persist_proof(law_title: str, proof_hash: str, hash_algorithm: str, body: bytes) -> None:
+    """Zet een proof in de ledger-queue (fire-and-forget)."""
+    fut = await ledger_writer.enqueue(
+        {
+            "law_title": law_title,
+            "proof_hash": proof_hash,
+            "hash_algorithm": hash_algorithm,
+            "payload": body.decode("utf-8"),
+        }
+    )
+    fut.add_done_callback(_ledger_write_done)
+
+
+def ledger_entry_to_dict(e: LedgerEntry, with_proof: bool = False) -> Dict[str, Any]:
+    d = {
+        "id": e.id,
+        "created_at": e.created_at.isoformat() if e.created_at else None,
+        "law_title": e.law_title,
+        "proof_hash": e.proof_hash,
+        "hash_algorithm": e.hash_algorithm,
+        "prev_hash": e.prev_hash,
+        "entry_hash": e.entry_hash,
+    }
+    if with_proof:
+        d["proof"] = json.loads(e.payload)
+    return d
+
+
+@app.get("/ledger/entries")
+async def ledger_entries(
+    response: Response,
+    law_title: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Ledger-entries, nieuwste eerst, optioneel enkel voor één wet. Keyset op
+    id: de volgende pagina volgt met `cursor` uit de header X-Next-Cursor.
+    """
+    stmt = select(LedgerEntry)
+    if law_title is not None:
+        stmt = stmt.where(LedgerEntry.law_title == law_title)
+    if cursor is not None:
+        stmt = stmt.where(LedgerEntry.id < cursor)
+    stmt = stmt.order_by(LedgerEntry.id.desc()).limit(limit + 1)
+
+    with STAGE_LATENCY.time("db"):
+        entries = (await db.execute(stmt)).scalars().all()
+
+    if len(entries) > limit:
+        entries = entries[:limit]
+        response.headers["X-Next-Cursor"] = str(entries[-1].id)
+
+    return [ledger_entry_to_dict(e) for e in entries]
+
+
+@app.get("/ledger/entries/{proof_hash}")
+async def ledger_entry_get(proof_hash: str, db: AsyncSession = Depends(get_async_db)):
+    """Alle entries met deze proof hash (een herhaalde deterministische check geeft er meer)."""
+    with STAGE_LATENCY.time("db"):
+        entries = (
+            await db.execute(
+                select(LedgerEntry)
+                .where(LedgerEntry.proof_hash == proof_hash)
+                .order_by(LedgerEntry.id)
+            )
+        ).scalars().all()
+    if not entries:
+        raise HTTPException(status_code=404, detail="Unknown proof hash")
+    return [ledger_entry_to_dict(e, with_proof=True) for e in entries]
+
+
+ledger_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _ledger_pool() -> ProcessPoolExecutor:
+    global ledger_pool
+    if ledger_pool is None:
+        ledger_pool = ProcessPoolExecutor(
+            max_workers=LEDGER_VERIFY_WORKERS, mp_context=mp_context()
+        )
+    return ledger_pool
+
+
+def shutdown_ledger_pool() -> None:
+    global ledger_pool
+    if ledger_pool is not None:
+        ledger_pool.shutdown()
+        ledger_pool = None
+
+
+@app.get("/ledger/verify")
+async def ledger_verify(
+    chunk_size: int = Query(10_000, ge=100, le=1_000_000),
+    payloads: bool = False,
+):
+    """
+    Integriteitscontrole van de hele keten. De id-range wordt in stukken
+    verdeeld die parallel gelezen en in een procespool gecontroleerd worden;
+    daarna worden de naden tussen de stukken nagekeken. Met `payloads=true`
+    wordt ook elke proof hash opnieuw berekend.
+    """
+    async with AsyncSessionLocal() as db:
+        lo, hi = (
+            await db.execute(select(func.min(LedgerEntry.id), func.max(LedgerEntry.id)))
+        ).one()
+    if lo is None:
+        return {"valid": True, "entries": 0, "first_invalid_id": None, "head": GENESIS_HASH}
+
+    columns = (
+        LedgerEntry.id,
+        LedgerEntry.prev_hash,
+        LedgerEntry.hash_algorithm,
+        LedgerEntry.proof_hash,
+        LedgerEntry.entry_hash,
+        LedgerEntry.payload if payloads else null(),
     )
+    starts = list(range(lo, hi + 1, chunk_size))
+    loop = asyncio.get_running_loop()
+    pool = _ledger_pool()
+    # niet meer gelijktijdige stukken dan workers (begrensd geheugen)
+    sem = asyncio.Semaphore(LEDGER_VERIFY_WORKERS)
+
+    async def check(start: int):
+        async with sem:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    select(*columns)
+                    .where(LedgerEntry.id >= start, LedgerEntry.id < start + chunk_size)
+                    .order_by(LedgerEntry.id)
+                )
+                rows = [tuple(r) for r in result]
+            return await loop.run_in_executor(pool, verify_chunk, rows, payloads)
+
+    chunks = await asyncio.gather(*(check(start) for start in starts))
+
+    entries, head, first_invalid = 0, GENESIS_HASH, None
+    for chunk in chunks:
+        if chunk.first_invalid_id is not None:
+            first_invalid = chunk.first_invalid_id
+            break
+        if not chunk.count:
+            continue
+        if chunk.first_prev != head:
+            first_invalid = chunk.first_id
+            break
+        entries += chunk.count
+        head = chunk.last_entry
+
+    return {
+        "valid": first_invalid is None,
+        "entries": entries,
+        "first_invalid_id": first_invalid,
+        "head": head,
+    }
 
 
 # -------------------------------------------------
 # API: USE-CASE INVENTORY → DATABASE
 # -------------------------------------------------
+async def insert_usecases(rows: List[Dict[str, Any]]) -> List[int]:
+    """Multi-row INSERT ... RETURNING id, ids in dezelfde volgorde als `rows`."""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            insert(UseCase).returning(UseCase.id, sort_by_parameter_order=True), rows
+        )
+        ids = list(result.scalars())
+        await db.commit()
+    return ids
+
+
+# Optionele write-behind modus: inserts worden gebundeld in batches
+# (USECASE_BATCH_SIZE rijen of USECASE_BATCH_WINDOW_MS, wat eerst komt)
+usecase_writer: Optional[WriteBehindQueue] = None
+if os.getenv("USECASE_WRITE_BEHIND", "").lower() in ("1", "true", "yes"):
+    usecase_writer = WriteBehindQueue(
+        insert_usecases,
+        max_batch=int(os.getenv("USECASE_BATCH_SIZE", "100")),
+        max_delay=int(os.getenv("USECASE_BATCH_WINDOW_MS", "10")) / 1000,
+    )
+
+
 @app.post("/usecases/submit")
 async def submit_usecase(
     system_name: str = Form(...),
@@ -322,6 +1188,7 @@ async def submit_usecase(
     data_used: str = Form(...),
     safeguards: str = Form(...),
     extra_details: str = Form(""),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Ontvangt de velden van het Use-Case Inventory formulier en bewaart ze in de DB.
@@ -342,54 +1209,277 @@ async def submit_usecase(
     payload_str = json.dumps(payload, sort_keys=True)
     record_hash = hashlib.sha256(payload_str.encode("utf-8")).hexdigest()
 
-    db: Session = next(get_db())
-    entry = UseCase(
-        system_name=system_name,
-        purpose=purpose,
-        context=context,
-        data_used=data_used,
-        safeguards=safeguards,
-        extra_details=extra_details,
-        record_hash=record_hash,
-    )
-    db.add(entry)
-    db.commit()
-    db.refresh(entry)
+    row = {
+        "system_name": system_name,
+        "purpose": purpose,
+        "context": context,
+        "data_used": data_used,
+        "safeguards": safeguards,
+        "extra_details": extra_details,
+        "record_hash": record_hash,
+    }
+
+    with STAGE_LATENCY.time("db"):
+        if usecase_writer is not None:
+            entry_id = await usecase_writer.submit(row)
+        else:
+            entry = UseCase(**row)
+            db.add(entry)
+            await db.commit()
+            await db.refresh(entry)
+            entry_id = entry.id
 
     return {
         "status": "ok",
-        "id": entry.id,
+        "id": entry_id,
         "hash": record_hash,
         "stored": True,
     }
 
 
+def usecase_to_dict(r: UseCase) -> Dict[str, Any]:
+    return {
+        "id": r.id,
+        "created_at": r.created_at.isoformat() if r.created_at else None,
+        "system_name": r.system_name,
+        "purpose": r.purpose,
+        "context": r.context,
+        "data_used": r.data_used,
+        "safeguards": r.safeguards,
+        "extra_details": r.extra_details,
+        "record_hash": r.record_hash,
+    }
+
+
+def _naive_utc(dt: datetime) -> datetime:
+    """created_at staat als naïeve UTC in de DB (datetime.utcnow)."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _encode_cursor(r: UseCase) -> str:
+    raw = json.dumps([r.created_at.isoformat(), r.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def usecase_filters(
+    system_name: Optional[str] = None,
+    context: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+) -> List[Any]:
+    """WHERE-voorwaarden voor de filters van /admin/usecases."""
+    conds: List[Any] = []
+    if system_name is not None:
+        conds.append(UseCase.system_name == system_name)
+    if context is not None:
+        # prefix-voorwaarde zodat de (geprefixte) index gebruikt wordt
+        conds.append(
+            func.substr(UseCase.context, 1, CONTEXT_INDEX_PREFIX)
+            == context[:CONTEXT_INDEX_PREFIX]
+        )
+        conds.append(UseCase.context == context)
+    if created_from is not None:
+        conds.append(UseCase.created_at >= _naive_utc(created_from))
+    if created_to is not None:
+        conds.append(UseCase.created_at < _naive_utc(created_to))
+    return conds
+
+
 @app.get("/admin/usecases")
-async def admin_usecases():
+async def admin_usecases(
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    system_name: Optional[str] = None,
+    context: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
     """
-    JSON-lijst met alle geregistreerde use-cases.
+    JSON-lijst met de geregistreerde use-cases, nieuwste eerst.
     (Dit is de backend-tegenhanger van jouw admin/overview.)
+
+    Keyset-paginatie op (created_at, id): is er nog een volgende pagina, dan
+    staat de cursor ervoor in de header X-Next-Cursor. Filters: system_name,
+    context (exact) en created_from (incl.) / created_to (excl.).
     """
-    db: Session = next(get_db())
-    records = db.query(UseCase).order_by(UseCase.id.desc()).all()
-
-    out: List[Dict[str, Any]] = []
-    for r in records:
-        out.append(
-            {
-                "id": r.id,
-                "created_at": r.created_at.isoformat() if r.created_at else None,
-                "system_name": r.system_name,
-                "purpose": r.purpose,
-                "context": r.context,
-                "data_used": r.data_used,
-                "safeguards": r.safeguards,
-                "extra_details": r.extra_details,
-                "record_hash": r.record_hash,
-            }
+    stmt = select(UseCase).where(
+        *usecase_filters(system_name, context, created_from, created_to)
+    )
+    if cursor is not None:
+        c_created_at, c_id = _decode_cursor(cursor)
+        stmt = stmt.where(tuple_(UseCase.created_at, UseCase.id) < tuple_(c_created_at, c_id))
+    stmt = stmt.order_by(UseCase.created_at.desc(), UseCase.id.desc()).limit(limit + 1)
+
+    with STAGE_LATENCY.time("db"):
+        result = await db.execute(stmt)
+        records = result.scalars().all()
+
+    if len(records) > limit:
+        records = records[:limit]
+        response.headers["X-Next-Cursor"] = _encode_cursor(records[-1])
+
+    return [usecase_to_dict(r) for r in records]
+
+
+@app.get("/admin/usecases/export")
+async def admin_usecases_export(
+    format: str = Query("ndjson", pattern="^(ndjson|csv|parquet)$"),
+    batch_size: int = Query(1000, ge=1, le=50_000),
+    system_name: Optional[str] = None,
+    context: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+):
+    """
+    Volledige export van de inventory (zelfde filters als /admin/usecases),
+    gestreamd uit een server-side cursor. Het geheugen blijft begrensd tot
+    `batch_size` rijen, los van de grootte van de tabel.
+    """
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+
+    stmt = (
+        select(UseCase.__table__)
+        .where(*usecase_filters(system_name, context, created_from, created_to))
+        .order_by(UseCase.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+    async def batches():
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(stmt)
+            async for rows in result.partitions():
+                yield [usecase_to_dict(r) for r in rows]
+
+    writer, media_type = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        writer(batches()),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="usecases.{format}"'},
+    )
+
+
+# -------------------------------------------------
+# METRICS (Prometheus)
+# -------------------------------------------------
+def _pool_checked_out():
+    for name, eng in (("sync", engine), ("async", async_engine.sync_engine)):
+        checkedout = getattr(eng.pool, "checkedout", None)
+        if checkedout is not None:
+            yield (name,), checkedout()
+
+
+REGISTRY.register(
+    Gauge(
+        "db_pool_checked_out",
+        "Connections currently checked out of the pool",
+        ("engine",),
+        _pool_checked_out,
+    )
+)
+
+
+REGISTRY.register(
+    Gauge(
+        "law_library_laws",
+        "Laws in the law library",
+        (),
+        lambda: [((), len(law_library))],
+    )
+)
+REGISTRY.register(
+    Gauge(
+        "law_library_predicates",
+        "Distinct (shared) predicates in the law library",
+        (),
+        lambda: [((), law_library.predicate_count)],
+    )
+)
+
+
+def _parse_cache_stat(stat: str):
+    return lambda: [((), parse_cache.stats()[stat])]
+
+
+def _parse_cache_hit_ratio():
+    lookups = parse_cache.hits + parse_cache.misses
+    return [((), parse_cache.hits / lookups if lookups else 0.0)]
+
+
+for _stat in ("entries", "bytes"):
+    REGISTRY.register(
+        Gauge(
+            f"dcl_parse_cache_{_stat}",
+            f"Current {_stat} in the /dcl/parse cache",
+            (),
+            _parse_cache_stat(_stat),
+        )
+    )
+for _stat in ("hits", "misses", "evictions"):
+    REGISTRY.register(
+        CallbackCounter(
+            f"dcl_parse_cache_{_stat}_total",
+            f"/dcl/parse cache {_stat}",
+            (),
+            _parse_cache_stat(_stat),
         )
+    )
+REGISTRY.register(
+    Gauge(
+        "dcl_parse_cache_hit_ratio",
+        "Share of /dcl/parse calls answered from the cache since startup",
+        (),
+        _parse_cache_hit_ratio,
+    )
+)
+
+
+def _cache_stat(stat: str):
+    def collect():
+        caches = (("result", result_cache), ("proof", proof_cache), ("schema", inline_schemas))
+        for name, cache in caches:
+            yield (name,), cache.stats()[stat]
 
-    return out
+    return collect
+
+
+for _stat in ("entries", "bytes"):
+    REGISTRY.register(
+        Gauge(
+            f"clearance_cache_{_stat}",
+            f"Current {_stat} in the clearance caches",
+            ("cache",),
+            _cache_stat(_stat),
+        )
+    )
+for _stat in ("hits", "misses", "evictions", "expirations"):
+    REGISTRY.register(
+        CallbackCounter(
+            f"clearance_cache_{_stat}_total",
+            f"Clearance cache {_stat}",
+            ("cache",),
+            _cache_stat(_stat),
+        )
+    )
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
 
 
 # -------------------------------------------------
@@ -0,0 +1,210 @@
+"""
+Batch-clearance: resultaatlijnen per stuk records, inline of in een procespool.
+
+`result_lines()` zet een stuk NDJSON-lijnen om naar de antwoordlijnen van
+/clearance/check-batch (en optioneel de proof hashes per record). Het wordt
+zowel in het webproces gebruikt als in de workers van de procespool.
+
+Alle batches delen één procespool (in app.py). `BatchPool` geeft de stukken
+van één batch door en haalt de resultaten in de volgorde van de input
+terug. Een stuk draagt enkel de `schema_key()` van het schema mee; elke
+worker houdt de laatst gebruikte gecompileerde schema's bij op die sleutel.
+Kent een worker het schema nog niet, dan geeft hij None terug en gaat het
+stuk opnieuw, met het gepickelde schema erbij (floats zoals inf/nan blijven
+exact).
+
+Deze module importeert app.py niet, zodat een worker licht opstart.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import multiprocessing
+import pickle
+from collections import deque
+from concurrent.futures import Executor
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from dcl_compiler import CompiledSchema, compile_schema
+from lru import LRUCache
+from proofs import small_proof_hash
+
+# (antwoordbytes, volgende index, aantal geëvalueerde records, proof hashes
+# als ruwe digests)
+ChunkResult = Tuple[bytes, int, int, List[bytes]]
+
+
+def batch_record_payload(
+    schema_hash: str, index: int, data: Optional[Dict[str, Any]], failed: Optional[List[str]]
+) -> Dict[str, Any]:
+    """Wat de proof hash van één batch-record dekt."""
+    if data is None:
+        return {"schema_hash": schema_hash, "index": index, "error": "invalid JSON object"}
+    return {
+        "schema_hash": schema_hash,
+        "index": index,
+        "data_checked": data,
+        "failed": failed,
+        "overall_passed": not failed,
+    }
+
+
+def count_records(lines: List[bytes]) -> int:
+    """Aantal records (niet-lege lijnen): de indexen schuiven enkel daarmee op."""
+    return sum(1 for line in lines if line.strip())
+
+
+def result_lines(
+    compiled: CompiledSchema,
+    lines: List[bytes],
+    start: int,
+    schema_hash: Optional[str] = None,
+    hash_algorithm: Optional[str] = None,
+) -> ChunkResult:
+    """Antwoordlijnen voor `lines`; met `schema_hash` ook proof hashes."""
+    out: List[str] = []
+    hashes: List[bytes] = []
+    index = start
+    evaluated = 0
+    failed_rule_ids = compiled.failed_rule_ids
+
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            failed = failed_rule_ids(data)
+            evaluated += 1
+            out_line = (
+                f'{{"index":{index},"overall_passed":{"false" if failed else "true"},'
+                f'"failed":{json.dumps(failed, separators=(",", ":"))}'
+            )
+        else:
+            data, failed = None, None
+            out_line = f'{{"index":{index},"error":"invalid JSON object"'
+
+        if schema_hash is not None:
+            h = small_proof_hash(
+                batch_record_payload(schema_hash, index, data, failed), hash_algorithm
+            )
+            hashes.append(bytes.fromhex(h))
+            out_line += f',"proof_hash":"{h}"'
+
+        out.append(out_line + "}\n")
+        index += 1
+
+    return "".join(out).encode("utf-8"), index, evaluated, hashes
+
+
+# -------------------------------------------------
+# WORKERS
+# -------------------------------------------------
+# Gecompileerde schema's per workerproces, op `schema_key()`
+WORKER_SCHEMAS = 16
+_compiled: LRUCache[str, CompiledSchema] = LRUCache(WORKER_SCHEMAS)
+
+
+def _worker_chunk(
+    key: str,
+    schema_blob: Optional[bytes],
+    blob: bytes,
+    start: int,
+    schema_hash: Optional[str],
+    hash_algorithm: Optional[str],
+) -> Optional[ChunkResult]:
+    """Resultaat van één stuk; None als het schema hier onbekend is en niet meegestuurd."""
+    compiled = _compiled.get(key)
+    if compiled is None:
+        if schema_blob is None:
+            return None
+        compiled = compile_schema(pickle.loads(schema_blob))
+        _compiled.put(key, compiled)
+    return result_lines(compiled, blob.split(b"\n"), start, schema_hash, hash_algorithm)
+
+
+# Modules die de workers van de procespools nodig hebben (batch- en
+# parse-pool in app.py); de forkserver wordt één keer gestart, voor alle
+# pools (ook de ledger-pool, die `ledger` zelf importeert).
+WORKER_PRELOAD = ["batch_pool", "dcl_parser"]
+
+
+def mp_context():
+    # forkserver: geen fork van het (multithreaded) webproces zelf
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(WORKER_PRELOAD)
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+class BatchPool:
+    """
+    Eén batch op de gedeelde procespool `executor`. `submit()` geeft stukken
+    in volgorde door; `next_result()` geeft de resultaten in dezelfde volgorde
+    terug. Er staan maximaal `max_pending` stukken tegelijk uit.
+    """
+
+    def __init__(
+        self,
+        executor: Executor,
+        compiled: CompiledSchema,
+        schema_hash: Optional[str] = None,
+        hash_algorithm: Optional[str] = None,
+        max_pending: int = 2,
+    ):
+        self._executor = executor
+        self._compiled = compiled
+        self._schema_blob: Optional[bytes] = None
+        self._hashing = (schema_hash, hash_algorithm)
+        self.max_pending = max_pending
+        # (future, stuk, startindex): het stuk blijft bewaard voor een herhaling
+        self._pending: Deque[Tuple["asyncio.Future[Optional[ChunkResult]]", bytes, int]] = deque()
+
+    @property
+    def full(self) -> bool:
+        return len(self._pending) >= self.max_pending
+
+    def _run(
+        self, blob: bytes, start: int, schema_blob: Optional[bytes] = None
+    ) -> "asyncio.Future[Optional[ChunkResult]]":
+        return asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            _worker_chunk,
+            self._compiled.key,
+            schema_blob,
+            blob,
+            start,
+            *self._hashing,
+        )
+
+    def submit(self, lines: List[bytes], start: int) -> None:
+        # één bytes-object pickelt veel sneller dan een lijst lijnen
+        blob = b"\n".join(lines)
+        self._pending.append((self._run(blob, start), blob, start))
+
+    async def next_result(self) -> ChunkResult:
+        """Resultaat van het oudste openstaande stuk."""
+        fut, blob, start = self._pending.popleft()
+        result = await fut
+        if result is None:
+            # de worker kende het schema nog niet: opnieuw, met het schema erbij
+            if self._schema_blob is None:
+                # pickle i.p.v. JSON: inf/nan in de regels blijven behouden
+                self._schema_blob = pickle.dumps(
+                    self._compiled.schema, protocol=pickle.HIGHEST_PROTOCOL
+                )
+            result = await self._run(blob, start, self._schema_blob)
+        return result
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def close(self) -> None:
+        """Openstaande stukken annuleren; de gedeelde pool blijft draaien."""
+        for fut, _, _ in self._pending:
+            fut.cancel()
+        self._pending.clear()
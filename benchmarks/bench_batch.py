@@ -0,0 +1,68 @@
+"""
+Benchmark: N losse `/clearance/check` calls vs. één `/clearance/check-batch`.
+
+Draait in-process (httpx + ASGITransport), dus zonder netwerk; in productie
+komt daar per losse call nog een round trip bij.
+
+    python -m benchmarks.bench_batch [N]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import time
+
+from benchmarks.common import ensure_env
+
+ensure_env()
+
+import httpx  # noqa: E402
+
+from app import app, schema_registry  # noqa: E402
+from benchmarks.bench_compile import make_schema  # noqa: E402
+
+RECORD = {"manufacturer": "ACME", "country": "BE", "weight": 42, "category": "toys"}
+
+
+async def main(n: int) -> None:
+    entry = schema_registry.register(make_schema(20))
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        t0 = time.perf_counter()
+        for _ in range(n):
+            r = await client.post(
+                "/clearance/check", json={"schema_ref": entry.hash, "data": RECORD}
+            )
+            r.raise_for_status()
+        t_single = time.perf_counter() - t0
+
+        line = json.dumps(RECORD).encode() + b"\n"
+
+        async def body():
+            yield json.dumps({"schema_ref": entry.hash}).encode() + b"\n"
+            for _ in range(n // 1000):
+                yield line * 1000
+            yield line * (n % 1000)
+
+        t0 = time.perf_counter()
+        r = await client.post("/clearance/check-batch", content=body())
+        r.raise_for_status()
+        t_batch = time.perf_counter() - t0
+        assert r.text.count("\n") == n
+
+    t0 = time.perf_counter()
+    for _ in range(n):
+        entry.compiled.failed_rule_ids(json.loads(line))
+    t_eval = time.perf_counter() - t0
+
+    print(f"records: {n}, rules: 20")
+    print(f"single calls : {t_single / n * 1e6:8.1f} us/record")
+    print(f"batch        : {t_batch / n * 1e6:8.1f} us/record")
+    print(f"  of which json.loads + evaluation: {t_eval / n * 1e6:8.1f} us/record")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000))
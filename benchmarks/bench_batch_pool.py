@@ -0,0 +1,116 @@
+"""
+Benchmark: /clearance/check-batch met 1, 2, 4 en 8 processen.
+
+Eén proces = alles inline in het webproces; vanaf 2 gaan stukken van
+BATCH_POOL_CHUNK_RECORDS records naar de procespool (de drempel
+BATCH_POOL_MIN_RECORDS staat hier op 0). Elke run wordt (met proofs)
+vergeleken met de inline-uitvoer: zelfde lijnen, zelfde volgorde, zelfde
+Merkle-root. Vooraf twee controles: een schema met inf/nan-waarden geeft in
+de pool dezelfde uitvoer als inline, en drie gelijktijdige batches delen
+één pool van twee processen. De schaling hangt uiteraard af van het aantal
+cores.
+
+    python -m benchmarks.bench_batch_pool [N]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+from benchmarks.common import ensure_env
+
+ensure_env()
+
+import httpx  # noqa: E402
+
+import app  # noqa: E402
+from benchmarks.bench_compile import make_schema  # noqa: E402
+from dcl_parser import parse_law_text  # noqa: E402
+
+
+def make_lines(n: int) -> bytes:
+    rng = random.Random(20)
+    lines = []
+    for i in range(n):
+        record = {
+            "manufacturer": rng.choice(["ACME", ""]),
+            "country": rng.choice(["BE", "NL"]),
+            "weight": rng.randrange(0, 80),
+            "category": rng.choice(["toys", "food"]),
+        }
+        lines.append(json.dumps(record))
+        if i % 997 == 0:
+            lines.append("")  # lege lijnen krijgen geen index
+        if i % 1999 == 0:
+            lines.append("not json")
+    return ("\n".join(lines) + "\n").encode()
+
+
+async def run(client: httpx.AsyncClient, header: bytes, body: bytes, workers: int, proofs: bool):
+    if workers != app.BATCH_POOL_WORKERS:
+        app.shutdown_batch_pool()
+        app.BATCH_POOL_WORKERS = workers
+
+    async def content():
+        yield header
+        for i in range(0, len(body), 64 * 1024):
+            yield body[i : i + 64 * 1024]
+
+    t0 = time.perf_counter()
+    r = await client.post(
+        "/clearance/check-batch", params={"proofs": str(proofs).lower()}, content=content()
+    )
+    r.raise_for_status()
+    return time.perf_counter() - t0, r.content
+
+
+async def check(client: httpx.AsyncClient, body: bytes) -> None:
+    entry = app.schema_registry.register(parse_law_text("max w inf\nequals x nan\nmin w -inf\n"))
+    header = json.dumps({"schema_ref": entry.hash}).encode() + b"\n"
+    special = b'{"w":5}\n{"x":1}\n{"w":1e999}\n' * 5_000
+    _, expected = await run(client, header, special, 1, proofs=True)
+    _, out = await run(client, header, special, 2, proofs=True)
+    assert out == expected, "inf/nan schema differs in the process pool"
+
+    header = json.dumps({"schema_ref": app.schema_registry.register(make_schema(50)).hash})
+    header = header.encode() + b"\n"
+    _, expected = await run(client, header, body, 1, proofs=True)
+    outs = await asyncio.gather(*(run(client, header, body, 2, proofs=True) for _ in range(3)))
+    assert all(out == expected for _, out in outs), "concurrent batches differ"
+    assert len(app.batch_pool._processes) <= 2
+
+
+async def main(n: int) -> None:
+    app.BATCH_POOL_MIN_RECORDS = 0
+    entry = app.schema_registry.register(make_schema(50))
+    header = json.dumps({"schema_ref": entry.hash}).encode() + b"\n"
+    body = make_lines(n)
+    transport = httpx.ASGITransport(app=app.app)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+        await check(client, make_lines(30_000))
+        print("differential check: ok")
+        print(f"records: {n}, rules: 50, cores: {os.cpu_count()}")
+        print(f"{'processes':>9} {'records/s':>12} {'proofs rec/s':>13} {'speedup':>8}")
+        _, expected = await run(client, header, body, 1, proofs=True)
+        base = None
+        for workers in (1, 2, 4, 8):
+            t, _ = await run(client, header, body, workers, proofs=False)
+            t_proofs, out = await run(client, header, body, workers, proofs=True)
+            assert out == expected, f"output differs with {workers} processes"
+            base = base or t_proofs
+            print(
+                f"{workers:>9} {n / t:>12,.0f} {n / t_proofs:>13,.0f} {base / t_proofs:7.2f}x"
+            )
+    app.shutdown_batch_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000))
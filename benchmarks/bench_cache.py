@@ -0,0 +1,67 @@
+"""
+Benchmark: herhaalde /clearance/check met en zonder de caches, met het
+schema via `schema_ref` en inline.
+
+- `cold`          : caches leeg (volledige evaluatie + hash; inline ook
+                    compileren)
+- `hot`           : zelfde schema + data, resultaat uit `result_cache`
+                    (enkel data-digest + proof hash)
+- `deterministic` : zelfde check met `"deterministic": true`, response
+                    rechtstreeks uit `proof_cache`
+
+Inline kost een hit ook de sleutel van het schema (`schema_key()`), maar
+geen compilatie of canonieke schema-JSON. De endpoint-functie wordt
+rechtstreeks aangeroepen (zonder HTTP, dus zonder validatie van de body).
+
+    python -m benchmarks.bench_cache
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from benchmarks.common import best_of, ensure_env, fmt_time
+
+ensure_env()
+
+import app  # noqa: E402
+from benchmarks.bench_compile import DATA, make_schema  # noqa: E402
+
+
+def main() -> None:
+    loop = asyncio.new_event_loop()
+    run = loop.run_until_complete
+
+    print(
+        f"{'rules':>7} {'schema':>7} {'cold':>12} {'hot':>12} {'determ.':>12} {'speedup':>8}"
+    )
+    for n in (10, 100, 1_000, 10_000):
+        schema = make_schema(n)
+        ref = app.schema_registry.register(schema).hash
+        sources = {"ref": {"schema_ref": ref}, "inline": {"schema": schema}}
+        for name, src in sources.items():
+            req = app.ClearanceRequest(data=DATA, **src)
+            det = app.ClearanceRequest(data=DATA, deterministic=True, **src)
+
+            def cold():
+                app.result_cache.clear()
+                app.proof_cache.clear()
+                app.inline_schemas.clear()
+                run(app.clearance_check(req))
+
+            number = max(1, 20_000 // n)
+            t_cold = best_of(cold, number=number)
+            run(app.clearance_check(det))
+            t_hot = best_of(lambda: run(app.clearance_check(req)), number=number)
+            t_det = best_of(lambda: run(app.clearance_check(det)), number=number)
+            print(
+                f"{n:>7} {name:>7} {fmt_time(t_cold):>12} {fmt_time(t_hot):>12} "
+                f"{fmt_time(t_det):>12} {t_cold / t_hot:7.1f}x"
+            )
+    print("result cache:", app.result_cache.stats())
+    print("proof cache :", app.proof_cache.stats())
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: proof hash over grote payloads.
+
+- `one-shot`  : json.dumps(sort_keys) -> encode -> sha256 (zoals vroeger)
+- `streaming` : `proof_hash()` via `canonical_hash.hash_canonical()`
+
+Tijd zonder tracemalloc, piekgeheugen (bovenop het payload zelf) apart met
+tracemalloc. Beide geven dezelfde digest.
+
+    python -m benchmarks.bench_canonical_hash
+"""
+
+from __future__ import annotations
+
+import random
+import tracemalloc
+from typing import Any, Callable, Dict
+
+from benchmarks.common import best_of, fmt_time
+from proofs import canonical_json, proof_hash, small_proof_hash
+
+
+def make_payload(target_mb: float) -> Dict[str, Any]:
+    """Data-dict van ongeveer `target_mb` MB canonieke JSON."""
+    rnd = random.Random(42)
+    n = int(target_mb * 1_000_000 / 125)
+    data = {
+        f"record_{i:07d}": {
+            "name": f"product {i} – é",
+            "weight": rnd.random() * 100,
+            "count": i,
+            "tags": ["electronics", "toys"],
+            "ok": i % 3 == 0,
+        }
+        for i in range(n)
+    }
+    return {"law_title": "bench", "data_checked": data, "overall_passed": True}
+
+
+def peak_bytes(fn: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    print(
+        f"{'MB':>6} {'one-shot':>12} {'streaming':>12} "
+        f"{'peak one-shot':>14} {'peak streaming':>15}"
+    )
+    for mb in (1, 10, 40):
+        payload = make_payload(mb)
+        size = len(canonical_json(payload)) / 1e6
+        assert proof_hash(payload) == small_proof_hash(payload)
+
+        t_old = best_of(lambda: small_proof_hash(payload), repeat=3)
+        t_new = best_of(lambda: proof_hash(payload), repeat=3)
+        m_old = peak_bytes(lambda: small_proof_hash(payload))
+        m_new = peak_bytes(lambda: proof_hash(payload))
+        print(
+            f"{size:6.1f} {fmt_time(t_old):>12} {fmt_time(t_new):>12} "
+            f"{m_old / 1e6:11.1f} MB {m_new / 1e6:12.2f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
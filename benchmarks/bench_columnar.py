@@ -0,0 +1,88 @@
+"""
+Benchmark: `evaluate()` per record vs. `evaluate_columnar()` over kolommen.
+
+`evaluate()` wordt op een steekproef gemeten en lineair geëxtrapoleerd naar
+het volledige aantal rijen (1M rijen duurt anders minuten).
+
+    python -m benchmarks.bench_columnar [ROWS]
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+
+from benchmarks.common import ensure_env
+
+ensure_env()
+
+import numpy as np  # noqa: E402
+
+from app import evaluate  # noqa: E402
+from benchmarks.bench_compile import make_schema  # noqa: E402
+from columnar import ColumnBatch, evaluate_columnar  # noqa: E402
+from dcl_compiler import compile_schema  # noqa: E402
+
+SAMPLE = 50_000
+
+
+def make_records(n: int):
+    rnd = random.Random(0)
+    cats = ["electronics", "furniture", "toys", "food"]
+    return [
+        {
+            "manufacturer": rnd.choice(["ACME", "", None, "Globex"]),
+            "country": rnd.choice(["BE", "NL"]),
+            "weight": rnd.uniform(0, 80),
+            "category": rnd.choice(cats),
+        }
+        for _ in range(n)
+    ]
+
+
+def main(rows: int) -> None:
+    schema = make_schema(5)
+    compiled = compile_schema(schema)
+    records = make_records(rows)
+
+    sample = records[:SAMPLE]
+    t0 = time.perf_counter()
+    for r in sample:
+        evaluate(schema, r)
+    t_loop = (time.perf_counter() - t0) * rows / len(sample)
+
+    t0 = time.perf_counter()
+    batch = ColumnBatch.from_records(records)
+    t_build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    res_obj = evaluate_columnar(compiled, batch)
+    t_obj = time.perf_counter() - t0
+
+    typed = ColumnBatch.from_columns(
+        {
+            "manufacturer": [r["manufacturer"] for r in records],
+            "country": [r["country"] for r in records],
+            "weight": np.array([r["weight"] for r in records]),
+            "category": [r["category"] for r in records],
+        }
+    )
+    t0 = time.perf_counter()
+    res_typed = evaluate_columnar(compiled, typed)
+    t_typed = time.perf_counter() - t0
+
+    assert (res_obj.passed == res_typed.passed).all()
+    for i in range(0, rows, max(1, rows // 1000)):
+        expected = [x.passed for x in evaluate(schema, records[i])[0]]
+        assert list(res_obj.passed[:, i]) == expected
+
+    print(f"rows: {rows}, rules: {len(schema.rules)}")
+    print(f"evaluate() loop (extrapolated) : {t_loop:8.2f} s")
+    print(f"columnar, from_records         : {t_build + t_obj:8.2f} s "
+          f"(build {t_build:.2f} s + eval {t_obj:.2f} s)  {t_loop / (t_build + t_obj):6.1f}x")
+    print(f"columnar, eval only            : {t_obj:8.2f} s  {t_loop / t_obj:6.1f}x")
+    print(f"columnar, typed columns        : {t_typed:8.2f} s  {t_loop / t_typed:6.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
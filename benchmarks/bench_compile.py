@@ -0,0 +1,74 @@
+"""
+Benchmark: `evaluate()` (interpreter) vs. de gecompileerde evaluatie, voor
+één check met een inline schema. Alle varianten geven ClearanceResult-
+modellen terug (zelfde uitvoer als de interpreter).
+
+- `compile+eval` : eerste check met een schema: `compile_schema().evaluate()`
+- `cached`       : herhaalde check met hetzelfde inline schema:
+                   `schema_key()` + hit in `inline_schemas` + `evaluate()`
+- `compile`      : enkel `compile_schema()`
+
+`first` en `cached` zijn de speedups t.o.v. de interpreter. `api` is het pad
+van /clearance/check bij een herhaald schema: `cached`, maar met
+`evaluate_dicts()` (gewone dicts i.p.v. ClearanceResult-modellen).
+
+    python -m benchmarks.bench_compile
+"""
+
+from __future__ import annotations
+
+from benchmarks.common import best_of, ensure_env, fmt_time
+
+ensure_env()
+
+import app  # noqa: E402
+from app import evaluate  # noqa: E402
+from dcl_compiler import compile_schema  # noqa: E402
+from models_dcl import DCLRule, DCLSchema  # noqa: E402
+
+
+def make_schema(n_rules: int) -> DCLSchema:
+    kinds = [
+        ("required", "manufacturer", None),
+        ("equals", "country", "BE"),
+        ("max", "weight", 50),
+        ("min", "weight", 1),
+        ("in", "category", ["electronics", "furniture", "toys"]),
+    ]
+    rules = []
+    for i in range(n_rules):
+        typ, field, value = kinds[i % len(kinds)]
+        rules.append(DCLRule(id=f"r{i + 1}", type=typ, field=field, value=value))
+    return DCLSchema(law_title="bench", rules=rules, source_text="")
+
+
+DATA = {"manufacturer": "ACME", "country": "BE", "weight": 42, "category": "toys"}
+
+
+def main() -> None:
+    print(
+        f"{'rules':>7} {'interpreter':>12} {'compile+eval':>13} {'cached':>12} "
+        f"{'compile':>12} {'first':>7} {'cached':>7} {'api':>12} {'speedup':>7}"
+    )
+    for n in (10, 100, 10_000):
+        schema = make_schema(n)
+        expected = evaluate(schema, DATA)
+        assert compile_schema(schema).evaluate(DATA) == expected
+        assert app.compile_inline(schema).evaluate(DATA) == expected
+
+        number = max(1, 20_000 // n)
+        t_interp = best_of(lambda: evaluate(schema, DATA), number=number)
+        t_first = best_of(lambda: compile_schema(schema).evaluate(DATA), number=number)
+        t_cached = best_of(lambda: app.compile_inline(schema).evaluate(DATA), number=number)
+        t_compile = best_of(lambda: compile_schema(schema), number=number)
+        t_api = best_of(lambda: app.compile_inline(schema).evaluate_dicts(DATA), number=number)
+        print(
+            f"{n:>7} {fmt_time(t_interp):>12} {fmt_time(t_first):>13} "
+            f"{fmt_time(t_cached):>12} {fmt_time(t_compile):>12} "
+            f"{t_interp / t_first:6.2f}x {t_interp / t_cached:6.2f}x "
+            f"{fmt_time(t_api):>12} {t_interp / t_api:6.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: latency van /dcl/parse en /clearance/check terwijl er inserts lopen.
+
+Drie scenario's op dezelfde event loop:
+
+- idle        : geen andere load
+- async inserts : gelijktijdige POST /usecases/submit (async DB-laag)
+- sync inserts  : dezelfde inserts via de sync `SessionLocal`, zoals de
+                  endpoints vroeger deden; die blokkeren de event loop
+
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_concurrency
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+
+from benchmarks.common import ensure_env
+
+ensure_env()
+
+import httpx  # noqa: E402
+
+from app import app  # noqa: E402
+from database import SessionLocal  # noqa: E402
+from models_usecase import UseCase  # noqa: E402
+
+LAW = "require manufacturer\nrequire category\nin category [electronics, furniture]\nmax weight 50\n"
+DATA = {"manufacturer": "ACME", "category": "electronics", "weight": 42}
+FORM = {
+    "system_name": "bench",
+    "purpose": "p",
+    "context": "c",
+    "data_used": "d",
+    "safeguards": "s",
+}
+PROBES = 300
+WRITERS = 8
+
+
+async def probe(client: httpx.AsyncClient, latencies: list) -> None:
+    for _ in range(PROBES):
+        t0 = time.perf_counter()
+        r = await client.post("/dcl/parse", json={"law_text": LAW})
+        await client.post("/clearance/check", json={"schema": r.json(), "data": DATA})
+        latencies.append(time.perf_counter() - t0)
+        await asyncio.sleep(0)
+
+
+async def async_writer(client: httpx.AsyncClient, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        (await client.post("/usecases/submit", data=FORM)).raise_for_status()
+
+
+async def sync_writer(stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        db = SessionLocal()
+        db.add(UseCase(**FORM, extra_details="", record_hash="x"))
+        db.commit()
+        db.close()
+        await asyncio.sleep(0)
+
+
+async def scenario(client: httpx.AsyncClient, writers) -> list:
+    stop = asyncio.Event()
+    tasks = [asyncio.create_task(w(stop)) for w in writers]
+    latencies: list = []
+    await probe(client, latencies)
+    stop.set()
+    await asyncio.gather(*tasks)
+    return latencies
+
+
+def report(name: str, lat: list) -> None:
+    lat = sorted(lat)
+    p50 = statistics.median(lat) * 1e3
+    p99 = lat[int(len(lat) * 0.99) - 1] * 1e3
+    print(f"{name:<15} p50 {p50:7.2f} ms   p99 {p99:7.2f} ms")
+
+
+async def main() -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        report("idle", await scenario(client, []))
+        report(
+            "async inserts",
+            await scenario(client, [lambda s: async_writer(client, s)] * WRITERS),
+        )
+        report("sync inserts", await scenario(client, [sync_writer] * WRITERS))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
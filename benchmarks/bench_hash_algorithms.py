@@ -0,0 +1,50 @@
+"""
+Benchmark: doorvoer van de proof-hashalgoritmen.
+
+- ruwe digest over bytes van verschillende groottes (MB/s)
+- `proof_hash()` end-to-end (canonieke JSON + digest) over een payload
+  van ~10 MB
+
+    python -m benchmarks.bench_hash_algorithms
+"""
+
+from __future__ import annotations
+
+import os
+
+from benchmarks.bench_canonical_hash import make_payload
+from benchmarks.common import best_of, fmt_time
+from proofs import HASH_ALGORITHMS, canonical_json, new_hasher, proof_hash
+
+
+def digest(algorithm: str, data: bytes) -> str:
+    h = new_hasher(algorithm)
+    h.update(data)
+    return h.hexdigest()
+
+
+def main() -> None:
+    algorithms = list(HASH_ALGORITHMS)
+    sizes = (1 << 10, 64 << 10, 1 << 20, 16 << 20)
+
+    print("raw digest throughput (MB/s)")
+    print(f"{'size':>10} " + " ".join(f"{a:>12}" for a in algorithms))
+    for size in sizes:
+        data = os.urandom(size)
+        number = max(1, (64 << 20) // size // 4)
+        row = []
+        for a in algorithms:
+            t = best_of(lambda: digest(a, data), number=number)
+            row.append(f"{size / t / 1e6:12.0f}")
+        print(f"{size:>10} " + " ".join(row))
+
+    payload = make_payload(10)
+    mb = len(canonical_json(payload)) / 1e6
+    print(f"\nproof_hash() over {mb:.1f} MB canonical JSON")
+    for a in algorithms:
+        t = best_of(lambda: proof_hash(payload, a), repeat=3)
+        print(f"{a:>12} {fmt_time(t):>12} {mb / t:8.0f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: proof-ledger.
+
+1. /clearance/check zonder ledger, met ledger (write-behind) en met een
+   synchrone commit per check (ter vergelijking)
+2. integriteitscontrole (/ledger/verify) van de hele keten, enkel de keten
+   en met herberekening van elke proof hash
+
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_ledger [N] [CONCURRENCY]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+
+from benchmarks.common import ensure_env
+
+ensure_env()
+
+import httpx  # noqa: E402
+
+import app as app_module  # noqa: E402
+from benchmarks.bench_compile import DATA, make_schema  # noqa: E402
+
+
+async def run(client: httpx.AsyncClient, body: dict, n: int, concurrency: int) -> float:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with sem:
+            data = {**DATA, "weight": i % 60}
+            r = await client.post("/clearance/check", json={**body, "data": data})
+            r.raise_for_status()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(n)))
+    return n / (time.perf_counter() - t0)
+
+
+async def main(n: int, concurrency: int) -> None:
+    ref = app_module.schema_registry.register(make_schema(20)).hash
+    transport = httpx.ASGITransport(app=app_module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        base = await run(client, {"schema_ref": ref, "persist": False}, n, concurrency)
+        ledger = await run(client, {"schema_ref": ref, "persist": True}, n, concurrency)
+        await app_module.ledger_writer.stop()
+
+        # synchroon: elke proof meteen in zijn eigen transactie (achter een
+        # lock, anders botsen de gelijktijdige writers op dezelfde staart)
+        persist_proof = app_module.persist_proof
+        lock = asyncio.Lock()
+
+        async def sync_persist(law_title, proof_hash, hash_algorithm, body):
+            async with lock:
+                await app_module.append_ledger_entries(
+                    [
+                        {
+                            "law_title": law_title,
+                            "proof_hash": proof_hash,
+                            "hash_algorithm": hash_algorithm,
+                            "payload": body.decode("utf-8"),
+                        }
+                    ]
+                )
+
+        app_module.persist_proof = sync_persist
+        sync = await run(client, {"schema_ref": ref, "persist": True}, n, concurrency)
+        app_module.persist_proof = persist_proof
+
+        print(f"checks: {n}, concurrency: {concurrency}")
+        print(f"no ledger          : {base:8.0f} checks/s")
+        print(f"ledger write-behind: {ledger:8.0f} checks/s")
+        print(f"ledger sync commit : {sync:8.0f} checks/s")
+
+        for payloads in (False, True):
+            t0 = time.perf_counter()
+            r = (await client.get(f"/ledger/verify?payloads={str(payloads).lower()}")).json()
+            dt = time.perf_counter() - t0
+            print(
+                f"verify (payloads={payloads!s:5}): {r['entries']} entries in {dt * 1e3:.0f} ms, "
+                f"valid={r['valid']}"
+            )
+    app_module.shutdown_ledger_pool()
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    asyncio.run(main(n, concurrency))
@@ -0,0 +1,103 @@
+"""
+Benchmark: één record tegen duizenden wetten.
+
+- `scan`    : elke wet afzonderlijk met `compile_schema().evaluate_dicts()`
+- `library` : `LawLibrary.check()` (veld-index + gedeelde predicaten)
+
+De wetten trekken hun regels uit een gedeelde pool van predicaten over
+FIELDS velden; een record vult er maar een deel van in. Voor elke
+toepasselijke wet wordt gecontroleerd dat het resultaat gelijk is aan dat
+van `evaluate()`.
+
+    python -m benchmarks.bench_library
+"""
+
+from __future__ import annotations
+
+import random
+
+from benchmarks.common import best_of, ensure_env, fmt_time
+
+ensure_env()
+
+from app import evaluate  # noqa: E402
+from dcl_compiler import compile_schema  # noqa: E402
+from law_library import LawLibrary  # noqa: E402
+from models_dcl import DCLRule, DCLSchema  # noqa: E402
+from schema_registry import schema_digest  # noqa: E402
+
+FIELDS = 500
+POOL = 3_000
+RULES_PER_LAW = (3, 15)
+RECORD_FIELDS = 25
+
+
+def make_pool(rng: random.Random) -> list:
+    pool = []
+    for _ in range(POOL):
+        field = f"f{rng.randrange(FIELDS)}"
+        typ = rng.choice(("required", "equals", "max", "min", "in"))
+        value = {
+            "required": None,
+            "equals": rng.choice(("BE", "NL", "FR")),
+            "max": rng.randrange(10, 100),
+            "min": rng.randrange(0, 10),
+            "in": ["BE", "NL", "DE"],
+        }[typ]
+        pool.append((typ, field, value))
+    return pool
+
+
+def make_laws(n: int, rng: random.Random) -> list:
+    pool = make_pool(rng)
+    laws = []
+    for i in range(n):
+        picks = rng.sample(pool, rng.randint(*RULES_PER_LAW))
+        rules = [
+            DCLRule(id=f"r{j + 1}", type=typ, field=field, value=value)
+            for j, (typ, field, value) in enumerate(picks)
+        ]
+        laws.append(DCLSchema(law_title=f"law {i}", rules=rules, source_text=""))
+    return laws
+
+
+def make_record(rng: random.Random) -> dict:
+    record = {}
+    for f in rng.sample(range(FIELDS), RECORD_FIELDS):
+        record[f"f{f}"] = rng.choice(("BE", "NL", 5, 42, 120, None))
+    return record
+
+
+def main() -> None:
+    rng = random.Random(17)
+    print(
+        f"{'laws':>7} {'applic.':>8} {'preds':>7} {'scan':>12} {'library':>12} {'speedup':>8}"
+    )
+    for n in (100, 1_000, 5_000):
+        laws = make_laws(n, rng)
+        compiled = [compile_schema(s) for s in laws]
+        library = LawLibrary()
+        for s in laws:
+            library.add(schema_digest(s), s)
+        record = make_record(rng)
+
+        # zelfde uitkomst als evaluate() voor elke toepasselijke wet
+        by_hash = {law.hash: law.schema for law in library}
+        out, evaluated = library.check(record, details=True)
+        for entry in out:
+            results, overall = evaluate(by_hash[entry["schema_hash"]], record)
+            assert entry["results"] == [r.model_dump() for r in results]
+            assert entry["overall_passed"] == overall
+            assert entry["failed"] == [r.rule_id for r in results if not r.passed]
+
+        number = max(1, 2_000 // n)
+        t_scan = best_of(lambda: [c.evaluate_dicts(record) for c in compiled], number=number)
+        t_lib = best_of(lambda: library.check(record), number=number)
+        print(
+            f"{n:>7} {len(out):>8} {evaluated:>7} {fmt_time(t_scan):>12} "
+            f"{fmt_time(t_lib):>12} {t_scan / t_lib:7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark: alle schema's evalueren met `PredicateNetwork` vs. per schema.
+
+- `per schema` : `compile_schema().evaluate_dicts()` voor elk schema apart
+- `network`    : `PredicateNetwork.evaluate_dicts()` (elk uniek predicaat
+                 één keer per record, via index/bisect per veld)
+- `failed`     : idem zonder details (`failed_rule_ids()`), per schema vs.
+                 netwerk
+
+Met ClearanceResult-modellen (`evaluate()`) domineert het aanmaken van de
+modellen en is de winst klein; de API gebruikt de dicts.
+
+Eerst wordt voor een reeks records met randgevallen (NaN, True vs. 1,
+getallen als string, lijsten, lege strings, ontbrekende velden)
+gecontroleerd dat het netwerk per schema exact `evaluate()` teruggeeft.
+
+    python -m benchmarks.bench_network
+"""
+
+from __future__ import annotations
+
+import random
+
+from benchmarks.common import best_of, ensure_env, fmt_time
+
+ensure_env()
+
+from app import evaluate  # noqa: E402
+from dcl_compiler import compile_schema  # noqa: E402
+from models_dcl import DCLRule, DCLSchema  # noqa: E402
+from predicate_network import PredicateNetwork  # noqa: E402
+
+FIELDS = 40
+VALUES = ["BE", "NL", "", None, 0, 1, True, False, 1.0, 7, 42, 99.5, "42", "x", float("nan")]
+OPTIONS = [["BE", "NL"], [1, True, "1"], [], [["BE"], "NL"], [None, ""], [42, 7.0]]
+
+
+def make_rule(rng: random.Random, i: int) -> DCLRule:
+    field = f"f{rng.randrange(FIELDS)}"
+    typ = rng.choice(("required", "equals", "max", "min", "in", "regex"))
+    value = {
+        "required": None,
+        "equals": rng.choice(VALUES[:-1] + [["BE"], {"a": 1}]),
+        "max": rng.choice((10, 50, 50.0, "50", "abc", 1e309)),
+        "min": rng.choice((0, 5, 42, "7", None)),
+        "in": rng.choice(OPTIONS + ["BE"]),
+        "regex": ".*",
+    }[typ]
+    return DCLRule(id=f"r{i + 1}", type=typ, field=field, value=value)
+
+
+def make_schemas(n: int, rng: random.Random) -> list:
+    # kleine pool: veel gedeelde regels tussen de schema's
+    pool = [make_rule(rng, 0) for _ in range(n // 2 + 20)]
+    schemas = []
+    for i in range(n):
+        rules = [
+            DCLRule(id=f"r{j + 1}", type=r.type, field=r.field, value=r.value)
+            for j, r in enumerate(rng.sample(pool, rng.randint(3, 15)))
+        ]
+        schemas.append(DCLSchema(law_title=f"law {i}", rules=rules, source_text=""))
+    return schemas
+
+
+def make_record(rng: random.Random) -> dict:
+    record = {}
+    for f in rng.sample(range(FIELDS), FIELDS // 2):
+        record[f"f{f}"] = rng.choice(VALUES + [["BE"], {"a": 1}, "1e3", -1e309])
+    return record
+
+
+def check_equal(network: PredicateNetwork, schemas: list, rng: random.Random) -> None:
+    for _ in range(200):
+        record = make_record(rng)
+        out = network.evaluate(record)
+        for i, schema in enumerate(schemas):
+            results, overall = evaluate(schema, record)
+            got, got_overall = out[str(i)]
+            assert got == results and got_overall == overall
+
+
+def main() -> None:
+    rng = random.Random(18)
+    print(
+        f"{'schemas':>8} {'preds':>7} {'per schema':>12} {'network':>12} {'speedup':>8} "
+        f"{'failed':>8}"
+    )
+    for n in (10, 100, 1_000, 5_000):
+        schemas = make_schemas(n, rng)
+        network = PredicateNetwork()
+        for i, s in enumerate(schemas):
+            network.add(str(i), s)
+        if n <= 1_000:
+            check_equal(network, schemas, rng)
+
+        compiled = [compile_schema(s) for s in schemas]
+        record = make_record(rng)
+        number = max(1, 1_000 // n)
+        t_each = best_of(lambda: [c.evaluate_dicts(record) for c in compiled], number=number)
+        t_net = best_of(lambda: network.evaluate_dicts(record), number=number)
+        t_each_failed = best_of(
+            lambda: [c.failed_rule_ids(record) for c in compiled], number=number
+        )
+        t_net_failed = best_of(lambda: network.failed_rule_ids(record), number=number)
+        print(
+            f"{n:>8} {network.predicate_count:>7} {fmt_time(t_each):>12} "
+            f"{fmt_time(t_net):>12} {t_each / t_net:7.1f}x {t_each_failed / t_net_failed:7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: /dcl/parse over de parse-pool met 1, 2, 4 en 8 processen.
+
+Eerst een differentiële controle: willekeurige teksten (alle lijngrenzen
+van `str.splitlines()`), in stukken van enkele tekens geknipt, moeten via
+`line_chunks()` / `chunk_rules()` / `rules_from_chunks()` exact
+`parse_rules()` geven. Daarna `parse_law_text_pooled()` op 100k en 1M
+regellijnen (de drempel PARSE_POOL_MIN_CHARS staat hier op 0); elke run
+wordt vergeleken met de gewone parse. De schaling hangt uiteraard af van
+het aantal cores; de stap naar DCLRule's (unpickelen + valideren) gebeurt
+in het webproces en blijft ook met veel cores over.
+
+    python -m benchmarks.bench_parallel_parse
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import time
+
+from benchmarks.common import ensure_env
+
+ensure_env()
+
+import app  # noqa: E402
+from benchmarks.bench_parse import EDGE_CASES, SEPARATORS, make_law_text, same  # noqa: E402
+from dcl_parser import (  # noqa: E402
+    chunk_rules,
+    line_chunks,
+    parse_law_text,
+    parse_rules,
+    rules_from_chunks,
+)
+
+
+def check_chunks() -> None:
+    rng = random.Random(25)
+    for _ in range(2_000):
+        lines = rng.choices(EDGE_CASES, k=rng.randrange(1, 20))
+        text = "".join(line + rng.choice(SEPARATORS) for line in lines)
+        chunks = line_chunks(text, rng.randrange(1, 40))
+        assert "".join(chunk for chunk, _ in chunks) == text
+        rules = rules_from_chunks([chunk_rules(chunk, first) for chunk, first in chunks])
+        assert same(rules, parse_rules(text)), repr(text)
+
+
+async def main() -> None:
+    check_chunks()
+    print("differential check: ok")
+
+    app.PARSE_POOL_MIN_CHARS = 0
+    print(f"cores: {os.cpu_count()}, chunk: {app.PARSE_POOL_CHUNK_CHARS:,} chars")
+    print(f"{'rules':>9} {'processes':>9} {'time':>9} {'rules/s':>10} {'speedup':>8}")
+    for n in (100_000, 1_000_000):
+        text = make_law_text(n)
+        t0 = time.perf_counter()
+        expected = parse_law_text(text).rules
+        base = time.perf_counter() - t0
+        print(f"{n:>9} {'inline':>9} {base:8.2f}s {n / base:>10,.0f} {1:7.2f}x")
+
+        for workers in (2, 4, 8):
+            app.PARSE_POOL_WORKERS = workers
+            app.shutdown_parse_pool()
+            # processen opstarten buiten de meting
+            loop = asyncio.get_running_loop()
+            pool = app._parse_pool()
+            await asyncio.gather(
+                *(loop.run_in_executor(pool, chunk_rules, "require a", 1) for _ in range(workers))
+            )
+            t0 = time.perf_counter()
+            schema = await app.parse_law_text_pooled(text)
+            t = time.perf_counter() - t0
+            assert same(schema.rules, expected), f"rules differ with {workers} processes"
+            print(f"{n:>9} {workers:>9} {t:8.2f}s {n / t:>10,.0f} {base / t:7.2f}x")
+        del expected
+    app.shutdown_parse_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,149 @@
+"""
+Benchmark: `dcl_parser.parse_rules()` vs. de referentie (`parse_rule_line()`
+per lijn van `law_text.splitlines()`).
+
+Eerst een differentiële controle op randgevallen (hoofdletters, commentaar,
+"\\r\\n", "\\x0b", "\\u2028", lege en halve `in`-lijsten, ...); daarna
+synthetische wetteksten van 1k, 100k en 1M regellijnen. Naast de tijd ook
+de piek van het tijdelijke geheugen (tracemalloc) per regel.
+
+    python -m benchmarks.bench_parse
+"""
+
+from __future__ import annotations
+
+import random
+import time
+import tracemalloc
+from typing import List
+
+from benchmarks.common import best_of, ensure_env, fmt_time
+
+ensure_env()
+
+from app import parse_rule_line  # noqa: E402
+from dcl_parser import iter_line_blocks, parse_rules  # noqa: E402
+from models_dcl import DCLRule  # noqa: E402
+
+EDGE_CASES = [
+    "require manufacturer",
+    "  REQUIRE   manufacturer  extra ",
+    "Require",
+    "#require hidden",
+    "# comment",
+    "equals country BE",
+    "equals title  The   Law  of 'x' ",
+    "equals flag TRUE",
+    "equals quoted 'BE'",
+    "equals half 'BE",
+    "Equals x",
+    "max weight 50",
+    "max weight 50.5 kg",
+    "MIN weight -1e3",
+    "min weight abc",
+    "max w 1_000",
+    "in category [electronics, furniture, toys]",
+    "in category [ 1, 'a', , true, 2.5 ]",
+    "in category a b c",
+    "in category []",
+    "in category ]x[",
+    "in category [a, [b], c] trailing",
+    "in",
+    "unknown field value",
+    "",
+    "   ",
+]
+SEPARATORS = ["\n", "\r\n", "\r", "\x0b", "\x0c", "\x1c", "\x85", " "]
+
+
+def reference(text: str) -> List[DCLRule]:
+    rules: List[DCLRule] = []
+    for i, line in enumerate(text.splitlines(), start=1):
+        r = parse_rule_line(line, i)
+        if r:
+            rules.append(r)
+    return rules
+
+
+def same(a: List[DCLRule], b: List[DCLRule]) -> bool:
+    return len(a) == len(b) and all(
+        x == y and x.model_fields_set == y.model_fields_set
+        and [type(v) for v in (x.value if isinstance(x.value, list) else [x.value])]
+        == [type(v) for v in (y.value if isinstance(y.value, list) else [y.value])]
+        for x, y in zip(a, b)
+    )
+
+
+def check_edge_cases() -> None:
+    rng = random.Random(22)
+    for _ in range(2_000):
+        lines = rng.choices(EDGE_CASES, k=rng.randrange(1, 20))
+        text = "".join(line + rng.choice(SEPARATORS) for line in lines)
+        text = text[: rng.randrange(len(text) + 1)]
+        assert same(parse_rules(text), reference(text)), repr(text)
+        for size in (1, 7, 64):
+            assert [x for b in iter_line_blocks(text, size) for x in b] == text.splitlines()
+
+
+def make_law_text(n_rules: int) -> str:
+    rng = random.Random(n_rules)
+    fields = [f"field_{i}" for i in range(200)]
+    lines = []
+    for i in range(n_rules):
+        f = rng.choice(fields)
+        kind = i % 5
+        if kind == 0:
+            lines.append(f"require {f}")
+        elif kind == 1:
+            lines.append(f"equals {f} {rng.choice(['BE', 'NL', 'true', 'ACME Corp'])}")
+        elif kind == 2:
+            lines.append(f"max {f} {rng.randrange(1000)}")
+        elif kind == 3:
+            lines.append(f"min {f} {rng.randrange(100) / 4}")
+        else:
+            lines.append(f"in {f} [electronics, furniture, {rng.randrange(50)}]")
+        if i % 10 == 0:
+            lines.append("# toelichting")
+        if i % 7 == 0:
+            lines.append("")
+    return "\n".join(lines)
+
+
+def peak_bytes(fn) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    check_edge_cases()
+    print("differential check: ok")
+
+    print(
+        f"{'rules':>9} {'reference':>12} {'parser':>12} {'rules/s':>12} {'speedup':>8}"
+        f" {'peak B/rule ref':>16} {'parser':>7}"
+    )
+    for n in (1_000, 100_000, 1_000_000):
+        text = make_law_text(n)
+        t0 = time.perf_counter()
+        expected = reference(text)
+        once = time.perf_counter() - t0
+        assert same(parse_rules(text), expected)
+        del expected
+
+        repeat = 5 if once < 1 else 2
+        t_ref = best_of(lambda: reference(text), repeat=repeat)
+        t_new = best_of(lambda: parse_rules(text), repeat=repeat)
+        p_ref = peak_bytes(lambda: reference(text)) / n
+        p_new = peak_bytes(lambda: parse_rules(text)) / n
+        print(
+            f"{n:>9} {fmt_time(t_ref):>12} {fmt_time(t_new):>12} {n / t_new:>12,.0f}"
+            f" {t_ref / t_new:7.2f}x {p_ref:>16.0f} {p_new:>7.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
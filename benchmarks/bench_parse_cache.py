@@ -0,0 +1,65 @@
+"""
+Benchmark: /dcl/parse met en zonder de parse-cache.
+
+- `cold` : cache leeg (volledige parse)
+- `hot`  : zelfde law_text, schema uit `parse_cache` (enkel digest + kopie)
+
+De endpoint-functie wordt rechtstreeks aangeroepen (zonder HTTP).
+
+    python -m benchmarks.bench_parse_cache
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from fastapi import Response
+
+from benchmarks.common import best_of, ensure_env, fmt_time
+
+ensure_env()
+
+import app  # noqa: E402
+
+LINES = [
+    "require manufacturer",
+    "equals country BE",
+    "max weight 50",
+    "min weight 1",
+    "in category [electronics, furniture, toys]",
+    "# commentaar",
+    "",
+]
+
+
+def make_law_text(n_lines: int) -> str:
+    return "\n".join(LINES[i % len(LINES)] for i in range(n_lines))
+
+
+def main() -> None:
+    loop = asyncio.new_event_loop()
+    run = loop.run_until_complete
+
+    print(f"{'lines':>7} {'cold':>12} {'hot':>12} {'speedup':>8}")
+    for n in (10, 100, 1_000, 10_000):
+        req = app.ParseRequest(law_text=make_law_text(n), law_title="bench")
+
+        def cold():
+            app.parse_cache.clear()
+            run(app.dcl_parse(req, Response()))
+
+        hot_schema = run(app.dcl_parse(req, Response()))
+        again = run(app.dcl_parse(req, Response()))
+        assert again.rules == hot_schema.rules and again.law_title == "bench"
+
+        number = max(1, 20_000 // n)
+        t_cold = best_of(cold, number=number)
+        run(app.dcl_parse(req, Response()))
+        t_hot = best_of(lambda: run(app.dcl_parse(req, Response())), number=number)
+        print(f"{n:>7} {fmt_time(t_cold):>12} {fmt_time(t_hot):>12} {t_cold / t_hot:7.1f}x")
+    print("parse cache:", app.parse_cache.stats())
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Benchmark: /dcl/parse/stream (chunked upload, NDJSON uit) vs. /dcl/parse
+met de hele tekst in één JSON-body.
+
+Eerst een differentiële controle: teksten met alle lijngrenzen van
+`str.splitlines()` en multibyte-tekens, in willekeurige stukken geknipt
+(ook midden in een "\\r\\n" of een UTF-8-teken), moeten dezelfde regels
+geven als `parse_rules()` op de hele tekst. Daarna doorvoer en piek van het
+geheugen (tracemalloc) voor een grote wet, via httpx in-process.
+
+    python -m benchmarks.bench_parse_stream [N]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from benchmarks.common import ensure_env
+
+ensure_env()
+
+import httpx  # noqa: E402
+
+import app  # noqa: E402
+from benchmarks.bench_parse import EDGE_CASES, SEPARATORS, make_law_text  # noqa: E402
+from dcl_parser import parse_rules  # noqa: E402
+
+CHUNK = 64 * 1024
+
+
+def random_text(rng: random.Random) -> str:
+    lines = rng.choices(EDGE_CASES + ["equals land België", "in c [é, ü, 😀]"], k=rng.randrange(30))
+    return "".join(line + rng.choice(SEPARATORS + [" ", "\r\n"]) for line in lines)
+
+
+async def stream_parse(client: httpx.AsyncClient, body: bytes, cuts) -> tuple:
+    async def content():
+        prev = 0
+        for cut in cuts:
+            yield body[prev:cut]
+            prev = cut
+        yield body[prev:]
+
+    rules, trailer = [], None
+    async with client.stream("POST", "/dcl/parse/stream", content=content()) as r:
+        r.raise_for_status()
+        async for line in r.aiter_lines():
+            obj = json.loads(line)
+            if "id" in obj:
+                rules.append(obj)
+            else:
+                trailer = obj
+    return rules, trailer
+
+
+async def check(client: httpx.AsyncClient) -> None:
+    rng = random.Random(24)
+    for _ in range(300):
+        text = random_text(rng)
+        body = text.encode("utf-8")
+        cuts = sorted(rng.sample(range(len(body) + 1), min(len(body), rng.randrange(6))))
+        rules, trailer = await stream_parse(client, body, cuts)
+        assert rules == [r.model_dump(mode="json") for r in parse_rules(text)], repr(text)
+        assert trailer["lines"] == len(text.splitlines())
+        assert trailer["law_text_digest"] == app.law_text_digest(text)
+
+    rules, trailer = await stream_parse(client, b"require a\n\xff\n", [])
+    assert trailer == {"error": "law text is not valid UTF-8"}
+
+
+async def asgi_post(path: str, content_type: bytes, chunks) -> int:
+    """
+    POST rechtstreeks naar de ASGI-app; het antwoord wordt enkel geteld
+    (aantal regels), niet bewaard. httpx' ASGITransport buffert het hele
+    antwoord en zou de meting vertekenen.
+    """
+    chunks = iter(chunks)
+    rules = 0
+    tail = b""
+
+    async def receive():
+        chunk = next(chunks, None)
+        if chunk is None:
+            return {"type": "http.request", "body": b"", "more_body": False}
+        return {"type": "http.request", "body": chunk, "more_body": True}
+
+    async def send(message):
+        nonlocal rules, tail
+        if message["type"] == "http.response.body":
+            body = tail + message.get("body", b"")
+            rules += body.count(b'"id":"r')
+            tail = body[-8:]
+            rules -= tail.count(b'"id":"r')
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [(b"content-type", content_type)],
+        "server": ("bench", 80),
+        "client": ("bench", 1),
+    }
+    await app.app(scope, receive, send)
+    return rules + tail.count(b'"id":"r')
+
+
+async def main(n: int) -> None:
+    transport = httpx.ASGITransport(app=app.app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+        await check(client)
+    print("differential check: ok")
+
+    text = make_law_text(n)
+    body = text.encode("utf-8")
+    json_body = json.dumps({"law_text": text}).encode("utf-8")
+    print(f"law text: {n:,} rules, {len(body) / 1e6:.1f} MB")
+    print(f"{'endpoint':>18} {'time':>9} {'rules/s':>10} {'peak MB':>8}")
+
+    def chunks(data: bytes):
+        return (data[i : i + CHUNK] for i in range(0, len(data), CHUNK))
+
+    runs = {
+        "/dcl/parse": lambda: asgi_post("/dcl/parse", b"application/json", chunks(json_body)),
+        "/dcl/parse/stream": lambda: asgi_post(
+            "/dcl/parse/stream", b"text/plain; charset=utf-8", chunks(body)
+        ),
+    }
+    for name, run in runs.items():
+        app.parse_cache.clear()
+        t0 = time.perf_counter()
+        assert await run() == n
+        t = time.perf_counter() - t0
+
+        app.parse_cache.clear()
+        tracemalloc.start()
+        await run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{name:>18} {t:8.2f}s {n / t:>10,.0f} {peak / 1e6:8.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000))
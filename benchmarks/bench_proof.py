@@ -0,0 +1,89 @@
+"""
+Benchmark: opbouw van de /clearance/check-response.
+
+- `old`  : schema via model_dump_json + json.loads, proof_hash over het dict,
+           daarna ProofLog bouwen en door response_model valideren en
+           opnieuw serialiseren (zoals FastAPI dat doet)
+- `fast` : `proof_log_bytes()`, één serialisatie voor hash én body, met de
+           canonieke schema-JSON gecachet op het gecompileerde schema
+
+De evaluatie zelf zit in beide metingen niet mee.
+
+    python -m benchmarks.bench_proof
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+
+from benchmarks.common import best_of, ensure_env, fmt_time
+
+ensure_env()
+
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from benchmarks.bench_compile import DATA, make_schema  # noqa: E402
+from dcl_compiler import compile_schema  # noqa: E402
+from models_dcl import ProofLog  # noqa: E402
+from proofs import canonical_json, proof_log_bytes, small_proof_hash  # noqa: E402
+
+NOW = datetime.now(timezone.utc).isoformat()
+
+
+def old_path(schema, results, overall) -> bytes:
+    payload = {
+        "law_title": schema.law_title,
+        "schema": json.loads(schema.model_dump_json()),
+        "data_checked": DATA,
+        "results": results,
+        "overall_passed": overall,
+        "generated_at": NOW,
+    }
+    h = small_proof_hash(payload)
+    log = ProofLog(
+        law_title=schema.law_title,
+        schema=schema,
+        data_checked=DATA,
+        results=results,
+        overall_passed=overall,
+        generated_at=NOW,
+        proof_hash=h,
+    )
+    # response_model: dump, opnieuw valideren, serialiseren
+    validated = ProofLog.model_validate(log.model_dump())
+    return JSONResponse(validated.model_dump(mode="json")).body
+
+
+def fast_path(schema, compiled, results, overall) -> bytes:
+    body, _ = proof_log_bytes(
+        law_title=schema.law_title,
+        schema_json=compiled.schema_json,
+        data_json=canonical_json(DATA),
+        results_json=canonical_json(results),
+        overall_passed=overall,
+        generated_at=NOW,
+    )
+    return body
+
+
+def main() -> None:
+    print(f"{'rules':>7} {'old':>12} {'fast':>12} {'speedup':>8}")
+    for n in (10, 100, 1_000, 10_000):
+        schema = make_schema(n)
+        compiled = compile_schema(schema)
+        results, overall = compiled.evaluate_dicts(DATA)
+
+        # zelfde hash en zelfde inhoud
+        old = json.loads(old_path(schema, results, overall))
+        fast = json.loads(fast_path(schema, compiled, results, overall))
+        assert old == fast, "responses differ"
+
+        number = max(1, 20_000 // n)
+        t_old = best_of(lambda: old_path(schema, results, overall), number=number)
+        t_fast = best_of(lambda: fast_path(schema, compiled, results, overall), number=number)
+        print(f"{n:>7} {fmt_time(t_old):>12} {fmt_time(t_fast):>12} {t_old / t_fast:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark: compliance in de database (`dcl_sql.check_in_db`) vs. rijen
+ophalen en in Python evalueren, op SQLite met een JSON-kolom.
+
+De differentiële controle tegen `evaluate()` (JSON-kolom en getypeerde
+kolommen, met randgevallen) staat in tests/test_dcl_sql.py:
+
+    python -m pytest tests
+    python -m benchmarks.bench_sql
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from sqlalchemy import create_engine, insert, select
+
+from benchmarks.common import ensure_env, fmt_time
+
+ensure_env()
+
+from dcl_compiler import compile_schema  # noqa: E402
+from dcl_sql import JsonSource, check_in_db  # noqa: E402
+from tests.test_dcl_sql import make_record, make_schema, metadata, records  # noqa: E402
+
+
+def main() -> None:
+    rng = random.Random(19)
+    schema = make_schema(rng, 20)
+    compiled = compile_schema(schema)
+    print(f"{'rows':>9} {'python':>12} {'in db':>12} {'speedup':>8}")
+    for n in (10_000, 100_000, 500_000):
+        engine = create_engine("sqlite://")
+        metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(
+                insert(records), [{"id": i, "data": make_record(rng)} for i in range(1, n + 1)]
+            )
+
+            t0 = time.perf_counter()
+            failed = [0] * len(schema.rules)
+            for row in conn.execute(select(records.c.id, records.c.data)).yield_per(10_000):
+                rows, _ = compiled.evaluate_dicts(row.data)
+                for i, r in enumerate(rows):
+                    failed[i] += not r["passed"]
+            t_py = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            got = check_in_db(conn, schema, JsonSource(records, "data"))
+            t_db = time.perf_counter() - t0
+            assert [r["failed"] for r in got["rules"]] == failed
+        print(f"{n:>9} {fmt_time(t_py):>12} {fmt_time(t_db):>12} {t_py / t_db:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
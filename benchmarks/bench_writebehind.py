@@ -0,0 +1,62 @@
+"""
+Benchmark: /usecases/submit direct (INSERT + commit + refresh per call) vs.
+write-behind (multi-row INSERT per batch).
+
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_writebehind [N] [CONCURRENCY]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+
+from benchmarks.common import ensure_env
+
+ensure_env()
+
+import httpx  # noqa: E402
+
+import app as app_module  # noqa: E402
+from write_behind import WriteBehindQueue  # noqa: E402
+
+FORM = {
+    "system_name": "bench",
+    "purpose": "p",
+    "context": "c",
+    "data_used": "d",
+    "safeguards": "s",
+}
+
+
+async def run(client: httpx.AsyncClient, n: int, concurrency: int) -> float:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with sem:
+            (await client.post("/usecases/submit", data=FORM)).raise_for_status()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n)))
+    return n / (time.perf_counter() - t0)
+
+
+async def main(n: int, concurrency: int) -> None:
+    transport = httpx.ASGITransport(app=app_module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        app_module.usecase_writer = None
+        direct = await run(client, n, concurrency)
+
+        writer = WriteBehindQueue(app_module.insert_usecases, max_batch=100, max_delay=0.01)
+        app_module.usecase_writer = writer
+        batched = await run(client, n, concurrency)
+        await writer.stop()
+
+    print(f"submits: {n}, concurrency: {concurrency}")
+    print(f"direct       : {direct:8.0f} submits/s")
+    print(f"write-behind : {batched:8.0f} submits/s  ({batched / direct:.1f}x)")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    asyncio.run(main(*(args + [3000, 64][len(args):])))
@@ -0,0 +1,42 @@
+"""
+Gedeelde helpers voor de benchmarks.
+
+Draaien vanuit de root van de repo, bv.:
+
+    python -m benchmarks.bench_compile
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+from typing import Callable
+
+
+def ensure_env() -> None:
+    """
+    `app.py` heeft een DATABASE_URL nodig; standaard een SQLite-bestand in de
+    temp-map (in-memory SQLite wordt niet gedeeld tussen sync en async engine).
+    """
+    path = os.path.join(tempfile.gettempdir(), "law_to_code_bench.db")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{path}")
+
+
+def best_of(fn: Callable[[], object], number: int = 1, repeat: int = 5) -> float:
+    """Beste gemiddelde tijd (seconden) per aanroep over `repeat` metingen."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - t0) / number)
+    return best
+
+
+def fmt_time(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:8.1f} us"
+    if seconds < 1:
+        return f"{seconds * 1e3:8.2f} ms"
+    return f"{seconds:8.2f} s "
@@ -0,0 +1,217 @@
+"""
+Streaming hash over canonieke JSON.
+
+`hash_canonical(h, obj)` voedt `h` (een hashlib-object) met exact dezelfde
+bytes als `json.dumps(obj, sort_keys=True, separators=(",", ":")).encode()`,
+maar in stukken van ~CHUNK_SIZE bytes i.p.v. één grote string. Het
+piekgeheugen hangt dus niet af van de grootte van het payload.
+
+Aanpak: de walker gaat door dicts en lijsten en bundelt opeenvolgende
+elementen tot hun geschatte grootte CHUNK_SIZE bereikt; zo'n bundel gaat in
+één keer door de C-encoder van `json`. Te grote elementen worden verder
+opengelegd, lange strings in stukken ge-escaped. Types die de C-encoder
+anders zou behandelen (subclasses, niet-str sleutels) volgen de regels van
+de pure-Python encoder van `json`.
+"""
+
+from __future__ import annotations
+
+import json
+from json.encoder import encode_basestring_ascii as _enc_str
+from typing import Any, Dict, List
+
+CHUNK_SIZE = 64 * 1024
+
+_dumps = json.JSONEncoder(sort_keys=True, separators=(",", ":")).encode
+_float_repr = float.__repr__
+_int_repr = int.__repr__
+_INF = float("inf")
+_SCALARS = {int, float, bool, type(None)}
+
+
+def _float_str(o: float) -> str:
+    if o != o:
+        return "NaN"
+    if o == _INF:
+        return "Infinity"
+    if o == -_INF:
+        return "-Infinity"
+    return _float_repr(o)
+
+
+def _key_str(k: Any) -> str:
+    """Sleutelconversie zoals `json` ze doet."""
+    if isinstance(k, str):
+        return k
+    if isinstance(k, float):
+        return _float_str(k)
+    if k is True:
+        return "true"
+    if k is False:
+        return "false"
+    if k is None:
+        return "null"
+    if isinstance(k, int):
+        return _int_repr(k)
+    raise TypeError(f"keys must be str, int, float, bool or None, not {k.__class__.__name__}")
+
+
+def _fits(v: Any, budget: int) -> int:
+    """
+    Trekt de (ruwe) geschatte JSON-grootte van `v` af van `budget`; stopt
+    zodra het negatief wordt. Enkel exacte JSON-types; al de rest geeft -1
+    zodat de walker het afhandelt.
+    """
+    cls = v.__class__
+    if cls is str:
+        return budget - len(v)
+    if cls in _SCALARS:
+        return budget - 8
+    if cls is dict:
+        budget -= len(v)
+        for k, x in v.items():
+            if budget < 0:
+                return budget
+            if k.__class__ is not str:
+                return -1
+            c = x.__class__
+            if c is str:
+                budget -= len(k) + len(x)
+            elif c in _SCALARS:
+                budget -= len(k) + 8
+            else:
+                budget = _fits(x, budget - len(k))
+        return budget
+    if cls is list or cls is tuple:
+        budget -= len(v)
+        for x in v:
+            if budget < 0:
+                return budget
+            c = x.__class__
+            if c is str:
+                budget -= len(x)
+            elif c in _SCALARS:
+                budget -= 8
+            else:
+                budget = _fits(x, budget)
+        return budget
+    return -1
+
+
+class _CanonicalWriter:
+    def __init__(self, h: Any, chunk_size: int):
+        self.h = h
+        self.chunk_size = chunk_size
+        self._parts: List[str] = []
+        self._size = 0
+
+    def flush(self) -> None:
+        if self._parts:
+            # ensure_ascii: de uitvoer is altijd ASCII
+            self.h.update("".join(self._parts).encode("ascii"))
+            self._parts = []
+            self._size = 0
+
+    def _emit(self, s: str) -> None:
+        self._parts.append(s)
+        self._size += len(s)
+        if self._size >= self.chunk_size:
+            self.flush()
+
+    def encode(self, o: Any) -> None:
+        if isinstance(o, str):
+            if len(o) > self.chunk_size:
+                self._long_str(o)
+            else:
+                self._emit(_enc_str(o))
+        elif o is None:
+            self._emit("null")
+        elif o is True:
+            self._emit("true")
+        elif o is False:
+            self._emit("false")
+        elif isinstance(o, int):
+            self._emit(_int_repr(o))
+        elif isinstance(o, float):
+            self._emit(_float_str(o))
+        elif isinstance(o, (list, tuple)):
+            self._list(o)
+        elif isinstance(o, dict):
+            self._dict(o)
+        else:
+            raise TypeError(f"Object of type {o.__class__.__name__} is not JSON serializable")
+
+    def _long_str(self, o: str) -> None:
+        # escapen per teken, dus in stukken knippen verandert niets
+        self._emit('"')
+        n = self.chunk_size
+        for i in range(0, len(o), n):
+            self._emit(_enc_str(o[i : i + n])[1:-1])
+        self._emit('"')
+
+    def _list(self, o: Any) -> None:
+        n = len(o)
+        if not n:
+            self._emit("[]")
+            return
+        self._emit("[")
+        i = 0
+        while i < n:
+            sep = "," if i else ""
+            budget, j = self.chunk_size, i
+            while j < n:
+                budget = _fits(o[j], budget)
+                if budget < 0:
+                    break
+                j += 1
+            if j > i:
+                self._emit(sep + _dumps(list(o[i:j]))[1:-1])
+                i = j
+            else:
+                if sep:
+                    self._emit(sep)
+                self.encode(o[i])
+                i += 1
+        self._emit("]")
+
+    def _dict(self, o: Dict[Any, Any]) -> None:
+        if not o:
+            self._emit("{}")
+            return
+        # enkel de sleutels sorteren (zelfde volgorde als sorted(o.items()))
+        keys = sorted(o)
+        n = len(keys)
+        self._emit("{")
+        i = 0
+        while i < n:
+            sep = "," if i else ""
+            budget, j = self.chunk_size, i
+            while j < n:
+                k = keys[j]
+                if k.__class__ is not str:
+                    break
+                budget = _fits(o[k], budget - len(k))
+                if budget < 0:
+                    break
+                j += 1
+            if j > i:
+                self._emit(sep + _dumps({k: o[k] for k in keys[i:j]})[1:-1])
+                i = j
+            else:
+                k = keys[i]
+                self._emit(sep + _enc_str(_key_str(k)) + ":")
+                self.encode(o[k])
+                i += 1
+        self._emit("}")
+
+
+def hash_canonical(h: Any, obj: Any, chunk_size: int = CHUNK_SIZE) -> Any:
+    """Voedt `h` met de canonieke JSON van `obj`; geeft `h` terug."""
+    if _fits(obj, chunk_size) >= 0:
+        # klein payload: in één keer
+        h.update(_dumps(obj).encode("ascii"))
+        return h
+    writer = _CanonicalWriter(h, chunk_size)
+    writer.encode(obj)
+    writer.flush()
+    return h
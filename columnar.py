@@ -0,0 +1,263 @@
+"""
+Kolomgebaseerde (gevectoriseerde) CLEARANCE voor grote hoeveelheden records.
+
+In plaats van `evaluate()` per dict te draaien, wordt elke regel één
+NumPy-masker over een kolom:
+
+  required -> waarde niet None en niet ""
+  equals   -> kolom == waarde
+  max/min  -> float(kolom) <= / >= drempel (niet-numeriek = False)
+  in       -> kolom in opties
+
+De semantiek is die van `evaluate()` in app.py (via `dcl_compiler`), ook voor
+randgevallen zoals numerieke strings ("12") of bools bij max/min.
+
+Gebruik:
+
+    batch = ColumnBatch.from_records(records)
+    result = evaluate_columnar(compile_schema(schema), batch)
+    result.passed    # bool-matrix (regels x records)
+    result.overall   # bool-vector per record
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from dcl_compiler import CompiledRule, CompiledSchema
+
+_NUMERIC_KINDS = "biuf"
+
+
+def _float_or_nan(v: Any) -> float:
+    try:
+        return float(v)
+    except Exception:
+        return np.nan
+
+
+def _is_plain_scalar(v: Any) -> bool:
+    return v is None or isinstance(v, (str, int, float, bool))
+
+
+# -------------------------------------------------
+# KOLOMMEN
+# -------------------------------------------------
+class ColumnBatch:
+    """
+    Een set records als kolommen.
+
+    Object-kolommen gebruiken None voor een ontbrekend veld (zoals
+    `data.get()`). Numerieke kolommen kunnen een `missing`-masker meekrijgen.
+    Afgeleide kolommen (float-versie, None-masker) worden per veld gecachet,
+    zodat meerdere regels op hetzelfde veld ze delen.
+    """
+
+    def __init__(
+        self,
+        columns: Mapping[str, np.ndarray],
+        n_rows: int,
+        missing: Optional[Mapping[str, np.ndarray]] = None,
+    ):
+        self.n_rows = n_rows
+        self._columns = dict(columns)
+        self._missing: Dict[str, np.ndarray] = dict(missing or {})
+        self._numeric: Dict[str, np.ndarray] = {}
+
+        for name, col in self._columns.items():
+            if len(col) != n_rows:
+                raise ValueError(f"Column '{name}' has {len(col)} rows, expected {n_rows}")
+
+    @classmethod
+    def from_records(
+        cls, records: Sequence[Mapping[str, Any]], fields: Optional[Iterable[str]] = None
+    ) -> "ColumnBatch":
+        if fields is None:
+            fields = {k for r in records for k in r}
+        n = len(records)
+        columns = {
+            f: np.fromiter((r.get(f) for r in records), dtype=object, count=n)
+            for f in fields
+        }
+        return cls(columns, n)
+
+    @classmethod
+    def from_columns(
+        cls,
+        columns: Mapping[str, Sequence[Any]],
+        missing: Optional[Mapping[str, Sequence[bool]]] = None,
+    ) -> "ColumnBatch":
+        arrays = {}
+        for name, col in columns.items():
+            arr = np.asarray(col)
+            if arr.dtype.kind not in _NUMERIC_KINDS:
+                arr = np.asarray(col, dtype=object)
+            arrays[name] = arr
+        n = len(next(iter(arrays.values()))) if arrays else 0
+        masks = {k: np.asarray(v, dtype=bool) for k, v in (missing or {}).items()}
+        return cls(arrays, n, masks)
+
+    def values(self, field: str) -> np.ndarray:
+        col = self._columns.get(field)
+        if col is None:
+            col = np.full(self.n_rows, None, dtype=object)
+            self._columns[field] = col
+        return col
+
+    def is_numeric(self, field: str) -> bool:
+        return self.values(field).dtype.kind in _NUMERIC_KINDS
+
+    def missing(self, field: str) -> np.ndarray:
+        """True waar `data.get(field)` None zou zijn."""
+        mask = self._missing.get(field)
+        if mask is None:
+            col = self.values(field)
+            if col.dtype.kind in _NUMERIC_KINDS:
+                mask = np.zeros(self.n_rows, dtype=bool)
+            else:
+                mask = np.asarray(col == None, dtype=bool)  # noqa: E711 (elementwise)
+            self._missing[field] = mask
+        return mask
+
+    def numeric(self, field: str) -> np.ndarray:
+        """`float(waarde)` per record; NaN waar dat faalt of het veld ontbreekt."""
+        num = self._numeric.get(field)
+        if num is None:
+            col = self.values(field)
+            if col.dtype.kind in _NUMERIC_KINDS:
+                num = col.astype(np.float64)
+                num[self.missing(field)] = np.nan
+            else:
+                try:
+                    num = col.astype(np.float64)
+                except (TypeError, ValueError, OverflowError):
+                    # OverflowError: int te groot voor een float (10**400)
+                    num = np.fromiter(
+                        map(_float_or_nan, col), dtype=np.float64, count=self.n_rows
+                    )
+            self._numeric[field] = num
+        return num
+
+
+# -------------------------------------------------
+# REGEL -> MASKER
+# -------------------------------------------------
+def _mask_required(rule: CompiledRule, batch: ColumnBatch) -> np.ndarray:
+    present = ~batch.missing(rule.field)
+    if batch.is_numeric(rule.field):
+        return present
+    return present & np.asarray(batch.values(rule.field) != "", dtype=bool)
+
+
+def _mask_equals(rule: CompiledRule, batch: ColumnBatch) -> np.ndarray:
+    expected = rule.value
+    missing = batch.missing(rule.field)
+    col = batch.values(rule.field)
+
+    if batch.is_numeric(rule.field):
+        if expected is None:
+            return missing.copy()
+        if _big_int(expected):
+            # geen omzetting naar float64: per waarde, zoals `evaluate()`
+            hit = np.fromiter((v == expected for v in col.tolist()), dtype=bool, count=len(col))
+            return hit & ~missing
+        if isinstance(expected, (int, float, bool)):
+            return (col == expected) & ~missing
+        return np.zeros(batch.n_rows, dtype=bool)
+
+    if _is_plain_scalar(expected):
+        return np.asarray(col == expected, dtype=bool)
+    # lijst/dict als waarde: NumPy zou gaan broadcasten, dus per element
+    return np.fromiter((v == expected for v in col), dtype=bool, count=batch.n_rows)
+
+
+def _mask_max(rule: CompiledRule, batch: ColumnBatch) -> np.ndarray:
+    if rule.threshold is None:
+        return np.zeros(batch.n_rows, dtype=bool)
+    return batch.numeric(rule.field) <= rule.threshold
+
+
+def _mask_min(rule: CompiledRule, batch: ColumnBatch) -> np.ndarray:
+    if rule.threshold is None:
+        return np.zeros(batch.n_rows, dtype=bool)
+    return batch.numeric(rule.field) >= rule.threshold
+
+
+# Gehele getallen boven 2**53 passen niet exact in een float64
+_EXACT_INT = 2**53
+
+
+def _big_int(v: Any) -> bool:
+    return isinstance(v, int) and not isinstance(v, bool) and abs(v) > _EXACT_INT
+
+
+def _isin_exact(col: np.ndarray, options: Sequence[Any]) -> bool:
+    """
+    Of `np.isin()` exact vergelijkt. Met gemengde int/float-opties zet NumPy
+    alles om naar float64, en dan valt 10**18 + 1 samen met 10**18.
+    """
+    if any(map(_big_int, options)):
+        return False
+    if col.dtype.kind in "iu" and len(col):
+        return -_EXACT_INT <= int(col.min()) and int(col.max()) <= _EXACT_INT
+    return True
+
+
+def _mask_in(rule: CompiledRule, batch: ColumnBatch) -> np.ndarray:
+    col = batch.values(rule.field)
+    if not batch.is_numeric(rule.field):
+        # object-kolom: dezelfde check als de gecompileerde evaluator
+        return np.fromiter(map(rule.check, col), dtype=bool, count=batch.n_rows)
+
+    missing = batch.missing(rule.field)
+    if rule.options is not None and _isin_exact(col, rule.options):
+        numeric_opts = [o for o in rule.options if isinstance(o, (int, float, bool))]
+        hit = np.isin(col, numeric_opts) if numeric_opts else np.zeros(batch.n_rows, dtype=bool)
+    else:
+        # .tolist(): NumPy-scalars vergelijken niet goed met lijst-opties
+        hit = np.fromiter(map(rule.check, col.tolist()), dtype=bool, count=batch.n_rows)
+    # een ontbrekend veld is None; dat slaagt enkel als None een optie is
+    return np.where(missing, rule.check(None), hit)
+
+
+def _mask_never(rule: CompiledRule, batch: ColumnBatch) -> np.ndarray:
+    return np.zeros(batch.n_rows, dtype=bool)
+
+
+MASK_BUILDERS = {
+    "required": _mask_required,
+    "equals": _mask_equals,
+    "max": _mask_max,
+    "min": _mask_min,
+    "in": _mask_in,
+}
+
+
+# -------------------------------------------------
+# RESULTAAT
+# -------------------------------------------------
+class ColumnarResult:
+    __slots__ = ("rule_ids", "passed", "overall")
+
+    def __init__(self, rule_ids: List[str], passed: np.ndarray, overall: np.ndarray):
+        self.rule_ids = rule_ids
+        self.passed = passed  # shape (n_rules, n_rows)
+        self.overall = overall  # shape (n_rows,)
+
+    def failed_rule_ids(self, row: int) -> List[str]:
+        return [self.rule_ids[i] for i in np.flatnonzero(~self.passed[:, row])]
+
+    def pass_counts(self) -> Dict[str, int]:
+        counts = self.passed.sum(axis=1)
+        return {rid: int(c) for rid, c in zip(self.rule_ids, counts)}
+
+
+def evaluate_columnar(compiled: CompiledSchema, batch: ColumnBatch) -> ColumnarResult:
+    passed = np.empty((len(compiled.rules), batch.n_rows), dtype=bool)
+    for i, rule in enumerate(compiled.rules):
+        passed[i] = MASK_BUILDERS.get(rule.type, _mask_never)(rule, batch)
+
+    overall = passed.all(axis=0) if len(compiled.rules) else np.ones(batch.n_rows, dtype=bool)
+    return ColumnarResult([r.id for r in compiled.rules], passed, overall)
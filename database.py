@@ -1,5 +1,6 @@
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 # Haalt de DATABASE_URL uit de environment (Render)
@@ -8,10 +9,35 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL is not set")
 
+# Pool-instellingen (genegeerd voor SQLite)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+
+
+def to_async_url(url: str) -> str:
+    """Zelfde database, maar met een async driver (asyncpg / aiosqlite)."""
+    scheme, sep, rest = url.partition("://")
+    base = scheme.split("+", 1)[0]
+    if base in ("postgres", "postgresql"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    if base == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    return url
+
+
+def _pool_kwargs(url: str) -> dict:
+    if url.startswith("sqlite"):
+        return {}
+    return {"pool_size": DB_POOL_SIZE, "max_overflow": DB_MAX_OVERFLOW}
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
 # Maak de engine naar PostgreSQL (Render-db law-to-code-db)
 engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,
+    **_pool_kwargs(DATABASE_URL),
 )
 
 # Session-fabriek
@@ -21,5 +47,26 @@ SessionLocal = sessionmaker(
     bind=engine,
 )
 
+# Async engine + sessies voor de endpoints, zodat DB-calls de event loop
+# niet blokkeren
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    **_pool_kwargs(ASYNC_DATABASE_URL),
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+async def get_async_db():
+    """FastAPI-dependency voor een async DB-sessie."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 # Basisclass voor alle tabellen
 Base = declarative_base()
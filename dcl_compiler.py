@@ -0,0 +1,317 @@
+"""
+DCL-compiler: zet een DCLSchema één keer om naar een herbruikbare evaluator.
+
+`evaluate()` in app.py interpreteert elke regel bij elke check opnieuw.
+`compile_schema()` doet dat werk vooraf:
+
+- max/min drempels worden één keer naar float gecast
+- `in`-opties worden een frozenset
+- de dispatch op `rule.type` wordt per regel al opgelost
+
+`CompiledSchema.evaluate()` geeft exact dezelfde resultaten (incl. `details`)
+als `evaluate()` in app.py.
+
+Compileren kost meer dan één keer interpreteren; het loont enkel als een
+gecompileerd schema hergebruikt wordt (registry, of `schema_key()` als
+sleutel voor inline schema's).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import pickle
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+
+from models_dcl import ClearanceResult, DCLRule, DCLSchema
+from proofs import canonical_json
+
+
+Check = Callable[[Any], bool]
+Describe = Callable[[Any, bool], str]
+
+_RESULTS = TypeAdapter(List[ClearanceResult])
+
+
+class CompiledRule:
+    """Eén regel met voorberekende check- en details-functie."""
+
+    __slots__ = ("id", "type", "field", "value", "threshold", "options", "check", "describe")
+
+    def __init__(
+        self,
+        rule: DCLRule,
+        check: Check,
+        describe: Describe,
+        threshold: Optional[float] = None,
+        options: Optional[frozenset] = None,
+    ):
+        self.id = rule.id
+        self.type = rule.type
+        self.field = rule.field
+        self.value = rule.value
+        self.threshold = threshold
+        self.options = options
+        self.check = check
+        self.describe = describe
+
+    def with_id(self, rule_id: str) -> "CompiledRule":
+        """Zelfde regel onder een andere id (bv. na een edit die lijnen verschuift)."""
+        copy = CompiledRule.__new__(CompiledRule)
+        copy.id = rule_id
+        copy.type = self.type
+        copy.field = self.field
+        copy.value = self.value
+        copy.threshold = self.threshold
+        copy.options = self.options
+        copy.check = self.check
+        copy.describe = self.describe
+        return copy
+
+
+def _never(value: Any) -> bool:
+    return False
+
+
+def to_float(value: Any) -> Optional[float]:
+    """`float(value)`, of None als dat faalt (zoals de drempel van max/min)."""
+    try:
+        return float(value)
+    except Exception:
+        return None
+
+
+# -------------------------------------------------
+# REGEL-COMPILERS (één per regeltype)
+# -------------------------------------------------
+# `data.get(field)` is None als het veld ontbreekt, dus
+# "field in data and data[field] not in (None, '')" is gelijk aan
+# "data.get(field) not in (None, '')".
+def _compile_required(rule: DCLRule) -> CompiledRule:
+    prefix = f"Field '{rule.field}' is required; present="
+
+    def check(v: Any) -> bool:
+        return v not in (None, "")
+
+    def describe(v: Any, passed: bool) -> str:
+        return f"{prefix}{passed}"
+
+    return CompiledRule(rule, check, describe)
+
+
+def _compile_equals(rule: DCLRule) -> CompiledRule:
+    expected = rule.value
+    prefix = f"Field '{rule.field}' must equal {expected!r}; actual="
+
+    def check(v: Any) -> bool:
+        return v == expected
+
+    def describe(v: Any, passed: bool) -> str:
+        return f"{prefix}{v!r}"
+
+    return CompiledRule(rule, check, describe)
+
+
+def _compile_max(rule: DCLRule) -> CompiledRule:
+    threshold = to_float(rule.value)
+    prefix = f"Field '{rule.field}' must be <= {rule.value}; actual="
+
+    def check(v: Any) -> bool:
+        try:
+            return float(v) <= threshold
+        except Exception:
+            return False
+
+    def describe(v: Any, passed: bool) -> str:
+        return f"{prefix}{v}"
+
+    return CompiledRule(
+        rule, check if threshold is not None else _never, describe, threshold=threshold
+    )
+
+
+def _compile_min(rule: DCLRule) -> CompiledRule:
+    threshold = to_float(rule.value)
+    prefix = f"Field '{rule.field}' must be >= {rule.value}; actual="
+
+    def check(v: Any) -> bool:
+        try:
+            return float(v) >= threshold
+        except Exception:
+            return False
+
+    def describe(v: Any, passed: bool) -> str:
+        return f"{prefix}{v}"
+
+    return CompiledRule(
+        rule, check if threshold is not None else _never, describe, threshold=threshold
+    )
+
+
+def _compile_in(rule: DCLRule) -> CompiledRule:
+    options = rule.value if isinstance(rule.value, list) else []
+    prefix = f"Field '{rule.field}' must be in {options}; actual="
+    as_tuple = tuple(options)
+
+    try:
+        as_set: Optional[frozenset] = frozenset(options)
+    except TypeError:
+        # niet-hashbare opties (bv. geneste lijsten): lineair zoeken zoals vroeger
+        as_set = None
+
+    if as_set is not None:
+
+        def check(v: Any) -> bool:
+            try:
+                return v in as_set
+            except TypeError:
+                return v in as_tuple
+
+    else:
+
+        def check(v: Any) -> bool:
+            return v in as_tuple
+
+    def describe(v: Any, passed: bool) -> str:
+        return f"{prefix}{v}"
+
+    return CompiledRule(rule, check, describe, options=as_set)
+
+
+def _compile_unknown(rule: DCLRule) -> CompiledRule:
+    details = f"Unknown rule type: {rule.type}"
+
+    def describe(v: Any, passed: bool) -> str:
+        return details
+
+    return CompiledRule(rule, _never, describe)
+
+
+RULE_COMPILERS: Dict[str, Callable[[DCLRule], CompiledRule]] = {
+    "required": _compile_required,
+    "equals": _compile_equals,
+    "max": _compile_max,
+    "min": _compile_min,
+    "in": _compile_in,
+}
+
+
+def compile_rule(rule: DCLRule) -> CompiledRule:
+    return RULE_COMPILERS.get(rule.type, _compile_unknown)(rule)
+
+
+# -------------------------------------------------
+# GECOMPILEERD SCHEMA
+# -------------------------------------------------
+class CompiledSchema:
+    """Herbruikbare evaluator voor één DCLSchema."""
+
+    __slots__ = ("schema", "rules", "type_counts", "_schema_json", "_key")
+
+    def __init__(
+        self,
+        schema: DCLSchema,
+        rules: Optional[Tuple[CompiledRule, ...]] = None,
+        type_counts: Optional[Counter] = None,
+    ):
+        self.schema = schema
+        self.rules: Tuple[CompiledRule, ...] = (
+            rules if rules is not None else tuple(compile_rule(r) for r in schema.rules)
+        )
+        if type_counts is None:
+            type_counts = Counter(r.type for r in self.rules)
+        # (regeltype, aantal) voor de metrics, één keer per schema geteld
+        self.type_counts: Tuple[Tuple[str, int], ...] = tuple(
+            (t, n) for t, n in type_counts.items() if n > 0
+        )
+        self._schema_json: Optional[str] = None
+        self._key: Optional[str] = None
+
+    @property
+    def schema_json(self) -> str:
+        """Canonieke JSON van het schema (voor proofs), één keer per schema berekend."""
+        if self._schema_json is None:
+            self._schema_json = canonical_json(self.schema.model_dump(mode="json"))
+        return self._schema_json
+
+    @property
+    def key(self) -> str:
+        """`schema_key()` van het schema (sleutel van de caches per schema)."""
+        if self._key is None:
+            self._key = schema_key(self.schema)
+        return self._key
+
+    def evaluate(self, data: Dict[str, Any]) -> Tuple[List[ClearanceResult], bool]:
+        """Zelfde uitkomst als `evaluate(schema, data)` in app.py."""
+        rows, overall = self.evaluate_dicts(data)
+        # één validatie voor alle rijen (in pydantic-core) i.p.v. één per regel
+        return _RESULTS.validate_python(rows), overall
+
+    def evaluate_dicts(self, data: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Als `evaluate()`, maar met gewone dicts i.p.v. ClearanceResult-modellen.
+        Dat spaart per regel een pydantic-object uit (de duurste stap).
+        """
+        rows: List[Dict[str, Any]] = []
+        overall = True
+        get = data.get
+
+        for rule in self.rules:
+            field_value = get(rule.field)
+            passed = rule.check(field_value)
+            rows.append(
+                {
+                    "rule_id": rule.id,
+                    "field": rule.field,
+                    "passed": passed,
+                    "details": rule.describe(field_value, passed),
+                }
+            )
+            if not passed:
+                overall = False
+
+        return rows, overall
+
+    def failed_rule_ids(self, data: Dict[str, Any]) -> List[str]:
+        """Snelle variant zonder details: enkel de ids van gefaalde regels."""
+        get = data.get
+        return [rule.id for rule in self.rules if not rule.check(get(rule.field))]
+
+
+def compile_schema(schema: DCLSchema) -> CompiledSchema:
+    return CompiledSchema(schema)
+
+
+def schema_key(schema: DCLSchema) -> str:
+    """
+    Digest van het hele schema (ook `generated_at`), als cachesleutel voor
+    een gecompileerd schema, zonder te compileren of canonieke JSON te maken.
+    Via pickle i.p.v. JSON: inf/nan blijven verschillend van null en 1 van
+    1.0 of true, dus een gelijke sleutel geeft een gelijke evaluatie.
+    """
+    rules = [(r.id, r.type, r.field, r.value) for r in schema.rules]
+    content = (schema.law_title, schema.source_text, schema.generated_at, rules)
+    return hashlib.sha256(pickle.dumps(content, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+
+
+def recompile(
+    compiled: CompiledSchema, schema: DCLSchema, start: int, stop: int, count: int
+) -> CompiledSchema:
+    """
+    `compile_schema(schema)` voor een schema dat uit `compiled.schema` ontstaat
+    door `rules[start:stop]` te vervangen door `count` nieuwe regels (de
+    regels erna eventueel met een andere id). Enkel de nieuwe regels worden
+    gecompileerd; de rest wordt hergebruikt.
+    """
+    old, new = compiled.rules, schema.rules
+    tail = old[stop:]
+    # alle regels erna verschuiven samen: de eerste id zegt genoeg
+    if tail and tail[0].id != new[start + count].id:
+        tail = tuple(c.with_id(r.id) for c, r in zip(tail, new[start + count :]))
+    added = tuple(compile_rule(r) for r in new[start : start + count])
+    type_counts = Counter(dict(compiled.type_counts))
+    type_counts.subtract(r.type for r in old[start:stop])
+    type_counts.update(r.type for r in added)
+    return CompiledSchema(schema, old[:start] + added + tail, type_counts)
@@ -0,0 +1,393 @@
+"""
+DCL-parser: law-text -> DCLRule's in één doorgang.
+
+`parse_rule_line()` in app.py is de referentie (één lijn per keer, met
+`strip`/`split`/`lower` en een `find`/`rfind` voor `in`-regels).
+`parse_rules()` geeft exact dezelfde regels, maar:
+
+- de tekst wordt per blok van ~BLOCK_SIZE tekens in lijnen gesplitst (zelfde
+  lijngrenzen als `str.splitlines()`), niet in één keer
+- per lijn één `split()`; het keyword gaat via de tabel KEYWORDS (`lower()`
+  enkel als het keyword niet letterlijk in de tabel staat); commentaar,
+  lege lijnen en onbekende keywords vallen weg op die lookup
+- `auto_cast()` wordt per parse één keer per unieke waarde aangeroepen
+- de regels van een blok worden in één keer gevalideerd (TypeAdapter), en de
+  cyclische GC staat uit zolang de parse loopt
+"""
+
+from __future__ import annotations
+
+import gc
+import pickle
+from bisect import bisect_left
+from difflib import SequenceMatcher
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from pydantic import TypeAdapter
+
+from models_dcl import DCLRule, DCLSchema
+
+BLOCK_SIZE = 16 * 1024
+# `StreamParser` vergeet de auto_cast-cache boven dit aantal waarden
+STREAM_MAX_CASTS = 10_000
+
+
+def auto_cast(txt: str) -> Any:
+    t = txt.strip()
+
+    if t.lower() in {"true", "false"}:
+        return t.lower() == "true"
+
+    try:
+        return int(t)
+    except ValueError:
+        pass
+
+    try:
+        return float(t)
+    except ValueError:
+        pass
+
+    if (t.startswith("'") and t.endswith("'")) or (
+        t.startswith('"') and t.endswith('"')
+    ):
+        return t[1:-1]
+
+    return t
+
+
+# -------------------------------------------------
+# LIJNEN
+# -------------------------------------------------
+# Lijngrenzen van `str.splitlines()`
+_LINE_BREAKS = frozenset("\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029")
+
+
+def iter_line_blocks(text: str, block_size: int = BLOCK_SIZE) -> Iterator[List[str]]:
+    """
+    `text.splitlines()`, per blok. Een blok eindigt net na een "\\n" (altijd
+    een lijngrens, ook in "\\r\\n"), dus de lijnen zijn exact die van
+    `splitlines()` en het geheugen is begrensd tot één blok.
+    """
+    for start, end in _block_bounds(text, block_size):
+        yield text[start:end].splitlines() if start or end < len(text) else text.splitlines()
+
+
+def _block_bounds(text: str, block_size: int) -> Iterator[Tuple[int, int]]:
+    """(begin, einde) van blokken van ~`block_size` tekens, telkens net na een "\\n"."""
+    pos, n = 0, len(text)
+    while pos < n:
+        cut = text.find("\n", pos + block_size)
+        end = n if cut < 0 else cut + 1
+        yield pos, end
+        pos = end
+
+
+# -------------------------------------------------
+# PARSER
+# -------------------------------------------------
+# Soort waarde per keyword
+_NONE, _TOKEN, _REST, _LIST = range(4)
+
+# keyword -> (regeltype, minimum aantal tokens, soort waarde)
+KEYWORDS: Dict[str, Tuple[str, int, int]] = {
+    "require": ("required", 2, _NONE),
+    "equals": ("equals", 3, _REST),
+    "max": ("max", 3, _TOKEN),
+    "min": ("min", 3, _TOKEN),
+    "in": ("in", 3, _LIST),
+}
+
+_MISSING = object()
+_RULES = TypeAdapter(List[DCLRule])
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """
+    Cyclische GC uit tijdens het parsen: elke DCLRule telt als nieuw object
+    voor de GC, waardoor die bij een grote tekst voortdurend (en steeds
+    langer) loopt, terwijl de parser zelf geen cycli maakt.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _block_rules(
+    lines: List[str], idx: int, casts: Dict[str, Any], out: List[Dict[str, Any]]
+) -> int:
+    """Regels van één blok lijnen als dicts in `out`; geeft het laatste lijnnummer terug."""
+    append = out.append
+    keywords = KEYWORDS.get
+    cached = casts.get
+
+    for line in lines:
+        idx += 1
+        parts = line.split()
+        if len(parts) < 2:
+            continue
+        # commentaar ("#...") en onbekende keywords staan niet in de tabel
+        entry = keywords(parts[0]) or keywords(parts[0].lower())
+        if entry is None:
+            continue
+        rule_type, min_parts, kind = entry
+        if len(parts) < min_parts:
+            continue
+
+        if kind == _NONE:
+            append({"id": f"r{idx}", "type": rule_type, "field": parts[1]})
+            continue
+
+        if kind == _LIST:
+            if "[" in line and "]" in line:
+                # alles tussen [ ], zoals parse_rule_line()
+                bracket = line[line.find("[") : line.rfind("]") + 1]
+                value = []
+                for token in bracket.strip("[]").split(","):
+                    token = token.strip()
+                    if token:
+                        item = cached(token, _MISSING)
+                        if item is _MISSING:
+                            item = casts[token] = auto_cast(token)
+                        value.append(item)
+            else:
+                value = parts[2:]
+        else:
+            token = parts[2] if kind == _TOKEN or len(parts) == 3 else " ".join(parts[2:])
+            value = cached(token, _MISSING)
+            if value is _MISSING:
+                value = casts[token] = auto_cast(token)
+        append({"id": f"r{idx}", "type": rule_type, "field": parts[1], "value": value})
+
+    return idx
+
+
+def parse_rules(text: str, first_line: int = 1) -> List[DCLRule]:
+    """Alle regels uit `text`; de eerste lijn krijgt nummer `first_line` (id `r<nr>`)."""
+    rules: List[DCLRule] = []
+    # auto_cast per unieke waarde (de resultaten zijn immutable)
+    casts: Dict[str, Any] = {}
+    idx = first_line - 1
+    with gc_paused():
+        for lines in iter_line_blocks(text):
+            raw: List[Dict[str, Any]] = []
+            idx = _block_rules(lines, idx, casts, raw)
+            # één validatie per blok (in pydantic-core) i.p.v. DCLRule(...) per regel
+            rules.extend(_RULES.validate_python(raw))
+    return rules
+
+
+# -------------------------------------------------
+# PARALLEL
+# -------------------------------------------------
+def line_chunks(text: str, chunk_size: int) -> List[Tuple[str, int]]:
+    """
+    `text` in stukken van ~`chunk_size` tekens, elk afgesneden net na een
+    "\n", met het nummer van hun eerste lijn. `parse_rules()` per stuk (met
+    dat nummer als `first_line`) geeft samen exact `parse_rules(text)`.
+    """
+    chunks = []
+    first_line = 1
+    for start, end in _block_bounds(text, chunk_size):
+        chunk = text[start:end]
+        chunks.append((chunk, first_line))
+        first_line += len(chunk.splitlines())
+    return chunks
+
+
+def chunk_rules(text: str, first_line: int) -> bytes:
+    """
+    Regels van één stuk, als gepickelde dicts (voor een worker in een
+    procespool). Het webproces maakt er met `rules_from_chunks()` DCLRule's van.
+    """
+    raw: List[Dict[str, Any]] = []
+    casts: Dict[str, Any] = {}
+    idx = first_line - 1
+    with gc_paused():
+        for lines in iter_line_blocks(text):
+            idx = _block_rules(lines, idx, casts, raw)
+    return pickle.dumps(raw, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def rules_from_chunks(blobs: List[bytes]) -> List[DCLRule]:
+    """DCLRule's uit de `chunk_rules()` van alle stukken, in volgorde."""
+    rules: List[DCLRule] = []
+    # zelf unpickelen, met de GC uit (zoals in parse_rules()): in de
+    # resultaat-thread van de pool kost de GC meer dan het unpickelen zelf
+    with gc_paused():
+        for blob in blobs:
+            rules.extend(_RULES.validate_python(pickle.loads(blob)))
+    return rules
+
+
+class StreamParser:
+    """
+    Parser voor tekst die in stukken binnenkomt: `feed()` geeft de regels van
+    de lijnen die compleet zijn, `close()` die van de laatste lijn. Lijnen en
+    ids zijn exact die van `parse_rules()` op de hele tekst; in het geheugen
+    blijft enkel de onvolledige laatste lijn.
+    """
+
+    def __init__(self, first_line: int = 1):
+        self.line = first_line - 1
+        self._casts: Dict[str, Any] = {}
+        # de onvolledige laatste lijn, in stukken: pas samengevoegd als ze af is
+        self._pending: List[str] = []
+
+    def feed(self, text: str) -> List[DCLRule]:
+        if not text:
+            return []
+        # enkel het nieuwe stuk doorzoeken; de halve lijn bevat geen lijngrens
+        cut = max(map(text.rfind, _LINE_BREAKS)) + 1
+        pending = self._pending
+        if not cut and not (pending and pending[-1][-1] == "\r"):
+            # nog steeds een halve lijn: wacht op de rest
+            pending.append(text)
+            return []
+        pending.append(text[:cut])
+        lines = "".join(pending).splitlines()
+        if cut < len(text):
+            self._pending = [text[cut:]]
+        elif text[-1] == "\r":
+            # "\r" + "\n" uit het volgende stuk is één lijngrens
+            self._pending = [lines.pop() + "\r"]
+        else:
+            self._pending = []
+        return self._parse(lines)
+
+    def close(self) -> List[DCLRule]:
+        lines = "".join(self._pending).splitlines()
+        self._pending = []
+        return self._parse(lines)
+
+    def _parse(self, lines: List[str]) -> List[DCLRule]:
+        if not lines:
+            return []
+        if len(self._casts) > STREAM_MAX_CASTS:
+            self._casts.clear()
+        raw: List[Dict[str, Any]] = []
+        with gc_paused():
+            self.line = _block_rules(lines, self.line, self._casts, raw)
+            return _RULES.validate_python(raw)
+
+
+def parse_law_text(law_text: str, law_title: Optional[str] = None) -> DCLSchema:
+    return DCLSchema(
+        law_title=law_title or "Law Snippet",
+        rules=parse_rules(law_text),
+        source_text=law_text,
+    )
+
+
+# -------------------------------------------------
+# INCREMENTEEL
+# -------------------------------------------------
+class Splice(NamedTuple):
+    """
+    `rules[start:stop]` van het oude schema zijn vervangen door `count` nieuwe
+    regels. De regels erna schoven `shift` lijnen op (vanaf oude lijn
+    `shift_from`) en kregen een id volgens hun nieuwe lijn.
+    """
+
+    start: int
+    stop: int
+    count: int
+    shift: int
+    shift_from: int
+
+
+def _line_no(rule: DCLRule) -> int:
+    try:
+        return int(rule.id[1:])
+    except ValueError:
+        raise ValueError(f"Rule id {rule.id!r} is not a parsed line id") from None
+
+
+def _shifted(rules: List[DCLRule], shift: int) -> List[DCLRule]:
+    raw = []
+    for rule in rules:
+        values = rule.__dict__
+        # zelfde fields_set als het origineel (een `require` heeft geen value)
+        moved = {name: values[name] for name in rule.model_fields_set}
+        moved["id"] = f"r{_line_no(rule) + shift}"
+        raw.append(moved)
+    return _RULES.validate_python(raw)
+
+
+def reparse(
+    schema: DCLSchema, start: int, end: int, text: str, law_title: Optional[str] = None
+) -> Tuple[DCLSchema, Splice]:
+    """
+    Vervangt de lijnen `start`..`end - 1` (vanaf 1) van `schema.source_text`
+    door de lijnen van `text` (`start == end`: invoegen vóór lijn `start`).
+
+    Enkel het gewijzigde stuk wordt opnieuw geparst, samen met de lijn ervoor
+    en erna (een "\\r" + "\\n" over de grens wordt zo één lijn). De andere
+    regels blijven dezelfde objecten; na een edit die het aantal lijnen
+    verandert krijgen de regels erna een verschoven id. Het resultaat is
+    gelijk aan `parse_rules()` op de nieuwe tekst, als `schema` zelf door de
+    parser gemaakt is.
+    """
+    lines = schema.source_text.splitlines(keepends=True)
+    n = len(lines)
+    if not 1 <= start <= end <= n + 1:
+        raise ValueError(f"Line range must satisfy 1 <= start <= end <= {n + 1}")
+
+    new = text.splitlines(keepends=True)
+    # de nieuwe lijnen blijven aparte lijnen, ook aan het einde van de tekst
+    if new and end <= n and new[-1][-1] not in _LINE_BREAKS:
+        new[-1] += "\n"
+    lo, hi = max(start - 2, 0), min(end, n)
+    before = lines[lo : start - 1]
+    if new and before and before[-1][-1] not in _LINE_BREAKS:
+        before[-1] += "\n"
+    window = "".join(before + new + lines[end - 1 : hi])
+    source = "".join(lines[:lo]) + window + "".join(lines[hi:])
+
+    rules = schema.rules
+    i0 = bisect_left(rules, lo + 1, key=_line_no)
+    i1 = bisect_left(rules, hi + 1, key=_line_no)
+    shift = len(window.splitlines()) - (hi - lo)
+    with gc_paused():
+        added = parse_rules(window, first_line=lo + 1)
+        tail = _shifted(rules[i1:], shift) if shift else rules[i1:]
+
+    edited = DCLSchema(
+        law_title=law_title or schema.law_title,
+        rules=rules[:i0] + added + tail,
+        source_text=source,
+    )
+    return edited, Splice(i0, i1, len(added), shift, hi + 1)
+
+
+def _content(rule: DCLRule) -> Tuple[str, str, str]:
+    # repr: 1, 1.0 en True blijven verschillend, nan is gelijk aan zichzelf
+    return rule.type, rule.field, repr(rule.value)
+
+
+def splice_changes(
+    old: DCLSchema, new: DCLSchema, splice: Splice
+) -> Tuple[List[DCLRule], List[DCLRule]]:
+    """
+    (verdwenen regels van `old`, nieuwe regels van `new`) door de edit.
+    Vergeleken op type, veld en waarde, niet op id: de mee geparste buren en
+    regels die enkel een verschoven id kregen, tellen niet als gewijzigd.
+    """
+    removed = old.rules[splice.start : splice.stop]
+    added = new.rules[splice.start : splice.start + splice.count]
+    matcher = SequenceMatcher(
+        None, [_content(r) for r in removed], [_content(r) for r in added], autojunk=False
+    )
+    out_removed: List[DCLRule] = []
+    out_added: List[DCLRule] = []
+    for tag, i0, i1, j0, j1 in matcher.get_opcodes():
+        if tag != "equal":
+            out_removed += removed[i0:i1]
+            out_added += added[j0:j1]
+    return out_removed, out_added
@@ -0,0 +1,405 @@
+"""
+DCL-regels als SQL: compliance checken in de database i.p.v. in Python.
+
+`compile_rules()` zet de regels van een DCLSchema om naar SQL-predicaten
+(SQLAlchemy-expressies) over records die al in een tabel staan:
+
+- `JsonSource`  : één JSON-kolom per record (JSONB op PostgreSQL, JSON-tekst
+                  op SQLite)
+- `ColumnSource`: getypeerde kolommen, één per veld
+
+`check_in_db()` voert ze uit: één aggregatiequery voor de pass/fail-tellers
+van alle regels, plus per gefaalde regel de ids van (maximaal
+`failing_limit`) gefaalde rijen.
+
+De predicaten volgen `evaluate()` in app.py, ook in de randgevallen:
+True/False tellen als 1/0 bij `equals`/`in`, `max`/`min` aanvaarden getallen
+als string (zoals `float()`), een ontbrekend veld is None. Bekende
+verschillen:
+- PostgreSQL: getallen als string enkel in ASCII-notatie (met `_` tussen
+  cijfers, `inf`/`infinity`) en met een exponent van max. 4 cijfers;
+  vergelijkingen gebeuren exact in `numeric`, niet na afronding naar float.
+- getallen buiten het bereik van een double (bv. 1e400) worden in Python
+  inf of een fout, in de database een gewoon (groot) getal.
+Regels zonder exacte vertaling (bv. `equals` met een lijst) geven
+`UnsupportedRule`.
+"""
+
+from __future__ import annotations
+
+import math
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import (
+    ColumnElement,
+    Numeric,
+    Table,
+    and_,
+    case,
+    cast,
+    false,
+    func,
+    literal,
+    not_,
+    or_,
+    select,
+    true,
+)
+from sqlalchemy.engine import Connection
+
+from dcl_compiler import to_float
+from models_dcl import DCLRule, DCLSchema
+
+
+class UnsupportedRule(ValueError):
+    """Regel zonder exacte SQL-vertaling."""
+
+
+# -------------------------------------------------
+# BRONNEN
+# -------------------------------------------------
+def _table(t: Any) -> Table:
+    # ORM-class of Table
+    return getattr(t, "__table__", t)
+
+
+def _id_column(table: Table, id_column: Optional[str]):
+    if id_column is not None:
+        return table.c[id_column]
+    pk = list(table.primary_key.columns)
+    if len(pk) != 1:
+        raise ValueError("Table needs a single-column primary key or an explicit id_column")
+    return pk[0]
+
+
+class JsonSource:
+    """Records als JSON-object in de kolom `data_column`."""
+
+    def __init__(self, table: Any, data_column: str, id_column: Optional[str] = None):
+        self.table = _table(table)
+        self.data = self.table.c[data_column]
+        self.id = _id_column(self.table, id_column)
+
+
+class ColumnSource:
+    """
+    Records als getypeerde kolommen. `columns` mapt veld -> kolomnaam;
+    velden zonder kolom (en NULL) gelden als ontbrekend.
+    """
+
+    def __init__(
+        self, table: Any, columns: Optional[Dict[str, str]] = None, id_column: Optional[str] = None
+    ):
+        self.table = _table(table)
+        self.columns = columns
+        self.id = _id_column(self.table, id_column)
+
+    def column(self, field: str):
+        name = field if self.columns is None else self.columns.get(field)
+        if name is None:
+            return None
+        return self.table.c.get(name)
+
+
+# -------------------------------------------------
+# WAARDEN PER DIALECT
+# -------------------------------------------------
+# Python's float()-syntax (zonder unicode-cijfers/-spaties), voor PostgreSQL
+_WS = " \t\n\r\x0b\x0c"
+_DIGITS = r"[0-9](_?[0-9])*"
+_DECIMAL_RE = (
+    rf"^[{_WS}]*[+-]?({_DIGITS}(\.({_DIGITS})?)?|\.{_DIGITS})([eE][+-]?[0-9](_?[0-9]){{0,3}})?"
+    rf"[{_WS}]*$"
+)
+_POS_INF_RE = rf"^[{_WS}]*\+?inf(inity)?[{_WS}]*$"
+_NEG_INF_RE = rf"^[{_WS}]*-inf(inity)?[{_WS}]*$"
+
+# op -> Python-vergelijking (voor de statische gevallen)
+_OPS = {"max": lambda x, t: x <= t, "min": lambda x, t: x >= t}
+
+
+def _sqlite_float(value: Any) -> Optional[float]:
+    """`float()` zoals in evaluate(); None als het niet lukt of NaN is."""
+    try:
+        f = float(value)
+    except Exception:
+        return None
+    return None if f != f else f
+
+
+class _Value:
+    """
+    Eén veld van een record als SQL. Elk attribuut is een SQL-expressie
+    (of `false()` als het voor deze bron onmogelijk is):
+
+    - `missing`: ontbreekt of is null
+    - `is_string` / `text`, `is_number` / `number`, `is_true`, `is_false`
+    """
+
+    missing: ColumnElement
+    is_string: ColumnElement = false()
+    is_number: ColumnElement = false()
+    is_true: ColumnElement = false()
+    is_false: ColumnElement = false()
+    text: Any = None
+    number: Any = None
+
+    def __init__(self, dialect: str):
+        self.dialect = dialect
+
+    def compare_number(self, op: str, t: float) -> ColumnElement:
+        """`is_number` en float(waarde) <= / >= t."""
+        if self.number is None:
+            return false()
+        if self.dialect == "postgresql":
+            if math.isinf(t):
+                # numeric kent geen oneindig (in deze versies): elk getal
+                # is kleiner dan +inf en groter dan -inf
+                passes = _OPS[op](0.0, t)
+                return self.is_number if passes else false()
+            bound = literal(Decimal(repr(t)), Numeric())
+            cmp = self.number <= bound if op == "max" else self.number >= bound
+        else:
+            cmp = self.number <= t if op == "max" else self.number >= t
+        return and_(self.is_number, cmp)
+
+    def compare_string(self, op: str, t: float) -> ColumnElement:
+        """`is_string` en float(tekst) <= / >= t."""
+        if self.text is None:
+            return false()
+        if self.dialect == "sqlite":
+            f = func.dcl_float(self.text)
+            return and_(self.is_string, f <= t if op == "max" else f >= t)
+        if self.dialect != "postgresql":
+            raise UnsupportedRule(f"numeric strings are not supported on {self.dialect}")
+        parts = []
+        if _OPS[op](math.inf, t):
+            parts.append(self.text.regexp_match(_POS_INF_RE, flags="i"))
+        if _OPS[op](-math.inf, t):
+            parts.append(self.text.regexp_match(_NEG_INF_RE, flags="i"))
+        if not math.isinf(t):
+            number = cast(func.replace(func.btrim(self.text, _WS), "_", ""), Numeric)
+            bound = literal(Decimal(repr(t)), Numeric())
+            # CASE: de cast enkel uitvoeren als de tekst een getal is
+            parts.append(
+                case(
+                    (
+                        self.text.regexp_match(_DECIMAL_RE),
+                        number <= bound if op == "max" else number >= bound,
+                    ),
+                    else_=false(),
+                )
+            )
+        elif _OPS[op](0.0, t):
+            parts.append(self.text.regexp_match(_DECIMAL_RE))
+        return and_(self.is_string, or_(false(), *parts))
+
+
+class _JsonValue(_Value):
+    def __init__(self, source: JsonSource, field: str, dialect: str):
+        super().__init__(dialect)
+        col = source.data
+        if dialect == "sqlite":
+            if '"' in field:
+                raise UnsupportedRule(f"Field name not supported in a JSON path: {field!r}")
+            path = f'$."{field}"'
+            kind = func.json_type(col, path)
+            value = func.json_extract(col, path)
+            self.missing = or_(kind.is_(None), kind == "null")
+            self.is_string = kind == "text"
+            self.is_number = kind.in_(("integer", "real"))
+            self.is_true = kind == "true"
+            self.is_false = kind == "false"
+            self.text = value
+            self.number = value
+        elif dialect == "postgresql":
+            node = col.op("->")(field)
+            text = col.op("->>")(field)
+            kind = func.jsonb_typeof(node)
+            self.missing = or_(kind.is_(None), kind == "null")
+            self.is_string = kind == "string"
+            self.is_number = kind == "number"
+            self.is_true = and_(kind == "boolean", text == "true")
+            self.is_false = and_(kind == "boolean", text == "false")
+            self.text = text
+            # enkel gebruikt als is_number: cast in een CASE
+            self.number = case((kind == "number", cast(text, Numeric)))
+        else:
+            raise UnsupportedRule(f"JSON sources are not supported on {dialect}")
+
+
+class _ColumnValue(_Value):
+    def __init__(self, source: ColumnSource, field: str, dialect: str):
+        super().__init__(dialect)
+        col = source.column(field)
+        if col is None:
+            self.missing = true()
+            return
+        self.missing = col.is_(None)
+        try:
+            py_type = col.type.python_type
+        except NotImplementedError:
+            raise UnsupportedRule(f"Column type of {col.name!r} is not supported")
+        if py_type is bool:
+            self.is_true = col.is_(True)
+            self.is_false = col.is_(False)
+        elif py_type is str:
+            self.is_string = col.is_not(None)
+            self.text = col
+        elif py_type in (int, float, Decimal):
+            self.is_number = col.is_not(None)
+            self.number = col
+        else:
+            raise UnsupportedRule(f"Column type of {col.name!r} is not supported")
+
+
+def _value(source: Any, field: str, dialect: str) -> _Value:
+    if isinstance(source, JsonSource):
+        return _JsonValue(source, field, dialect)
+    return _ColumnValue(source, field, dialect)
+
+
+# -------------------------------------------------
+# REGELS -> SQL
+# -------------------------------------------------
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def _equals_any(v: _Value, options: List[Any], rule: DCLRule) -> ColumnElement:
+    """`waarde in options` (== zoals Python: True == 1, 1 == 1.0)."""
+    strings: List[str] = []
+    numbers: List[Any] = []
+    parts: List[ColumnElement] = []
+    for o in options:
+        if o.__class__ not in _SCALARS:
+            raise UnsupportedRule(f"Rule {rule.id}: non-scalar value {o!r}")
+        if o is None:
+            parts.append(v.missing)
+        elif isinstance(o, str):
+            strings.append(o)
+        elif isinstance(o, float) and math.isnan(o):
+            continue  # NaN is aan niets gelijk
+        elif isinstance(o, float) and math.isinf(o):
+            raise UnsupportedRule(f"Rule {rule.id}: infinite value")
+        else:
+            # bool of getal; True/False zijn ook 1/0
+            numbers.append(int(o) if isinstance(o, bool) else o)
+            if o == 1:
+                parts.append(v.is_true)
+            elif o == 0:
+                parts.append(v.is_false)
+    if strings and v.text is not None:
+        parts.append(and_(v.is_string, v.text.in_(sorted(set(strings)))))
+    if numbers and v.number is not None:
+        if v.dialect == "postgresql":
+            numbers = [literal(Decimal(repr(n)), Numeric()) for n in numbers]
+        parts.append(and_(v.is_number, v.number.in_(numbers)))
+    return or_(false(), *parts)
+
+
+def compile_rule(rule: DCLRule, source: Any, dialect: str) -> ColumnElement:
+    """SQL-predicaat dat waar is als de regel slaagt (nooit NULL als ze faalt)."""
+    v = _value(source, rule.field, dialect)
+
+    if rule.type == "required":
+        if v.text is None:
+            return not_(v.missing)
+        return and_(not_(v.missing), or_(not_(v.is_string), v.text != ""))
+
+    if rule.type == "equals":
+        return _equals_any(v, [rule.value], rule)
+
+    if rule.type == "in":
+        options = rule.value if isinstance(rule.value, list) else []
+        return _equals_any(v, options, rule)
+
+    if rule.type in ("max", "min"):
+        t = to_float(rule.value)
+        if t is None or t != t:
+            return false()
+        op = rule.type
+        parts = [v.compare_number(op, t)]
+        if _OPS[op](1.0, t):
+            parts.append(v.is_true)
+        if _OPS[op](0.0, t):
+            parts.append(v.is_false)
+        parts.append(v.compare_string(op, t))
+        return or_(false(), *parts)
+
+    # onbekend regeltype: faalt altijd (zoals evaluate())
+    return false()
+
+
+class SqlRule:
+    __slots__ = ("rule_id", "field", "passed")
+
+    def __init__(self, rule_id: str, field: str, passed: ColumnElement):
+        self.rule_id = rule_id
+        self.field = field
+        self.passed = passed
+
+
+def compile_rules(schema: DCLSchema, source: Any, dialect: str) -> List[SqlRule]:
+    return [SqlRule(r.id, r.field, compile_rule(r, source, dialect)) for r in schema.rules]
+
+
+# -------------------------------------------------
+# UITVOEREN
+# -------------------------------------------------
+def install_sqlite_functions(conn: Connection) -> None:
+    """Registreert `dcl_float()` op de SQLite-verbinding."""
+    conn.connection.dbapi_connection.create_function(
+        "dcl_float", 1, _sqlite_float, deterministic=True
+    )
+
+
+def check_in_db(
+    conn: Connection,
+    schema: DCLSchema,
+    source: Any,
+    where: Optional[ColumnElement] = None,
+    failing_limit: int = 100,
+) -> Dict[str, Any]:
+    """
+    Checkt alle rijen van `source` (optioneel gefilterd met `where`) in de
+    database. Geeft {rows, passed_all, rules: [{rule_id, field, passed,
+    failed, failing_ids}]} terug; `failing_ids` zijn de kleinste
+    `failing_limit` ids.
+    """
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        install_sqlite_functions(conn)
+    rules = compile_rules(schema, source, dialect)
+    flags = [case((r.passed, 1), else_=0) for r in rules]
+    all_passed = and_(true(), *(r.passed for r in rules))
+
+    query = select(
+        func.count(),
+        func.sum(case((all_passed, 1), else_=0)),
+        *(func.sum(f) for f in flags),
+    ).select_from(source.table)
+    if where is not None:
+        query = query.where(where)
+    total, passed_all, *passed = conn.execute(query).one()
+
+    out = []
+    for rule, flag, n_passed in zip(rules, flags, passed):
+        n_passed = int(n_passed or 0)
+        failing_ids: List[Any] = []
+        if n_passed < total and failing_limit > 0:
+            ids = select(source.id).where(flag == 0)
+            if where is not None:
+                ids = ids.where(where)
+            ids = ids.order_by(source.id).limit(failing_limit)
+            failing_ids = list(conn.execute(ids).scalars())
+        out.append(
+            {
+                "rule_id": rule.rule_id,
+                "field": rule.field,
+                "passed": n_passed,
+                "failed": total - n_passed,
+                "failing_ids": failing_ids,
+            }
+        )
+    return {"rows": total, "passed_all": int(passed_all or 0), "rules": out}
@@ -0,0 +1,132 @@
+"""
+Wettenbibliotheek: één record checken tegen alle geregistreerde wetten.
+
+- Inverted index veld -> wetten: voor een record komen enkel de wetten in
+  aanmerking waarvan minstens één veld in de record voorkomt ("van
+  toepassing"). Wetten zonder raakvlak worden niet geëvalueerd.
+- Gedeelde predicaten: de regels van alle wetten zitten in één
+  `PredicateNetwork`; regels met hetzelfde (type, veld, waarde) worden
+  per record maar één keer geëvalueerd, bv. `require manufacturer` in 400
+  wetten.
+
+Per toepasselijke wet is de uitkomst exact die van `evaluate(schema, data)`
+(incl. `details`, indien gevraagd).
+"""
+
+from __future__ import annotations
+
+from itertools import count
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from models_dcl import DCLSchema
+from predicate_network import PredicateNetwork
+
+
+class LibraryLaw:
+    __slots__ = ("hash", "schema", "seq", "fields")
+
+    def __init__(self, schema_hash: str, schema: DCLSchema, seq: int):
+        self.hash = schema_hash
+        self.schema = schema
+        # volgorde van toevoegen (stabiele volgorde in de antwoorden)
+        self.seq = seq
+        self.fields = frozenset(r.field for r in schema.rules)
+
+
+class LawLibrary:
+    def __init__(self) -> None:
+        self._laws: Dict[str, LibraryLaw] = {}
+        self._by_field: Dict[str, Set[str]] = {}
+        self._network = PredicateNetwork()
+        self._seq = count()
+
+    # ---------- beheer ----------
+    def add(self, schema_hash: str, schema: DCLSchema) -> LibraryLaw:
+        """Voegt een wet toe (of geeft de bestaande terug bij dezelfde hash)."""
+        law = self._laws.get(schema_hash)
+        if law is not None:
+            return law
+        law = LibraryLaw(schema_hash, schema, next(self._seq))
+        self._laws[schema_hash] = law
+        self._network.add(schema_hash, schema)
+        for field in law.fields:
+            self._by_field.setdefault(field, set()).add(schema_hash)
+        return law
+
+    def remove(self, schema_hash: str) -> bool:
+        law = self._laws.pop(schema_hash, None)
+        if law is None:
+            return False
+        for field in law.fields:
+            hashes = self._by_field[field]
+            hashes.discard(schema_hash)
+            if not hashes:
+                del self._by_field[field]
+        self._network.remove(schema_hash)
+        return True
+
+    def get(self, schema_hash: str) -> Optional[LibraryLaw]:
+        return self._laws.get(schema_hash)
+
+    def __iter__(self) -> Iterator[LibraryLaw]:
+        return iter(sorted(self._laws.values(), key=lambda law: law.seq))
+
+    def __len__(self) -> int:
+        return len(self._laws)
+
+    @property
+    def predicate_count(self) -> int:
+        return self._network.predicate_count
+
+    # ---------- checken ----------
+    def applicable(self, data: Dict[str, Any]) -> List[LibraryLaw]:
+        """Wetten met minstens één veld in `data`, in volgorde van toevoegen."""
+        by_field = self._by_field
+        hashes: Set[str] = set()
+        for key in data:
+            found = by_field.get(key)
+            if found:
+                hashes |= found
+        laws = self._laws
+        return sorted((laws[h] for h in hashes), key=lambda law: law.seq)
+
+    def check(
+        self, data: Dict[str, Any], details: bool = False, all_laws: bool = False
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Checkt `data` tegen alle toepasselijke wetten (met `all_laws` tegen
+        alle wetten). Geeft per wet {schema_hash, law_title, overall_passed,
+        failed[, results]} terug, plus het aantal geëvalueerde (unieke)
+        predicaten.
+        """
+        laws = list(self) if all_laws else self.applicable(data)
+        keys = [law.hash for law in laws]
+        out: List[Dict[str, Any]] = []
+
+        if details:
+            rows, evaluated = self._network.evaluate_dicts(data, keys)
+            for law in laws:
+                results, overall = rows[law.hash]
+                out.append(
+                    {
+                        "schema_hash": law.hash,
+                        "law_title": law.schema.law_title,
+                        "overall_passed": overall,
+                        "failed": [r["rule_id"] for r in results if not r["passed"]],
+                        "results": results,
+                    }
+                )
+        else:
+            failed_ids, evaluated = self._network.failed_rule_ids(data, keys)
+            for law in laws:
+                failed = failed_ids[law.hash]
+                out.append(
+                    {
+                        "schema_hash": law.hash,
+                        "law_title": law.schema.law_title,
+                        "overall_passed": not failed,
+                        "failed": failed,
+                    }
+                )
+
+        return out, evaluated
@@ -0,0 +1,76 @@
+"""
+Hash-keten voor de proof-ledger.
+
+    entry_hash = SHA-256("<prev_hash>:<hash_algorithm>:<proof_hash>")
+
+De eerste entry heeft GENESIS_HASH als prev_hash. De proof hash dekt het
+payload zelf, dus de keten dekt (transitief) elke opgeslagen ProofLog.
+
+`verify_chunk()` controleert een aaneengesloten stuk van de keten en is
+zelfstandig (geen DB, geen app), zodat stukken parallel in een procespool
+gecontroleerd kunnen worden; de naden tussen de stukken controleert de
+aanroeper met de teruggegeven randen.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from proofs import verify_proof_log
+
+GENESIS_HASH = "0" * 64
+
+
+def chain_hash(prev_hash: str, hash_algorithm: str, proof_hash: str) -> str:
+    material = f"{prev_hash}:{hash_algorithm}:{proof_hash}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def chain_rows(tail: str, items: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Rijen voor `items` (law_title, proof_hash, hash_algorithm, payload) na `tail`."""
+    rows = []
+    prev = tail
+    for item in items:
+        entry_hash = chain_hash(prev, item["hash_algorithm"], item["proof_hash"])
+        rows.append({**item, "prev_hash": prev, "entry_hash": entry_hash})
+        prev = entry_hash
+    return rows
+
+
+class ChunkResult(NamedTuple):
+    # eerste id waar het misloopt (None = stuk in orde)
+    first_invalid_id: Optional[int]
+    # eerste id, prev_hash van de eerste rij en entry_hash van de laatste
+    # (voor de naden tussen de stukken)
+    first_id: Optional[int]
+    first_prev: Optional[str]
+    last_entry: Optional[str]
+    count: int
+
+
+# (id, prev_hash, hash_algorithm, proof_hash, entry_hash, payload)
+Row = Tuple[int, str, str, str, str, Optional[str]]
+
+
+def verify_chunk(rows: Sequence[Row], check_payloads: bool = False) -> ChunkResult:
+    prev: Optional[str] = None
+    for row_id, prev_hash, algorithm, proof_hash, entry_hash, payload in rows:
+        if prev is not None and prev_hash != prev:
+            return ChunkResult(row_id, None, None, None, len(rows))
+        if chain_hash(prev_hash, algorithm, proof_hash) != entry_hash:
+            return ChunkResult(row_id, None, None, None, len(rows))
+        if check_payloads:
+            try:
+                log = json.loads(payload or "")
+                valid = log.get("proof_hash") == proof_hash and verify_proof_log(log)
+            except (ValueError, AttributeError):
+                valid = False
+            if not valid:
+                return ChunkResult(row_id, None, None, None, len(rows))
+        prev = entry_hash
+
+    if not rows:
+        return ChunkResult(None, None, None, None, 0)
+    return ChunkResult(None, rows[0][0], rows[0][1], rows[-1][4], len(rows))
@@ -0,0 +1,133 @@
+"""
+Eenvoudige begrensde LRU-cache (OrderedDict), gedeeld door de registries en
+caches in deze app.
+
+Optioneel ook:
+- `ttl`: items verlopen na zoveel seconden
+- `max_bytes` + `sizeof`: begrenzing op (geschatte) grootte i.p.v. enkel aantal
+- tellers voor hits, misses, evictions en expirations (zie `stats()`)
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Houdt maximaal `maxsize` items bij; het minst recent gebruikte gaat eerst.
+
+    `on_evict(key, value)` wordt aangeroepen voor items die eruit vallen
+    (plaatsgebrek of verlopen), niet bij `pop()` of `clear()`.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        on_evict: Optional[Callable[[K, V], Any]] = None,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[V], int]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        if max_bytes is not None and sizeof is None:
+            raise ValueError("max_bytes requires sizeof")
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.clock = clock
+        self._data: "OrderedDict[K, V]" = OrderedDict()
+        # enkel gevuld als ttl / sizeof gebruikt worden
+        self._expires: Dict[K, float] = {}
+        self._sizes: Dict[K, int] = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        if self.ttl is not None and self._expires[key] <= self.clock():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            if self.on_evict is not None:
+                self.on_evict(key, value)
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        size = 0
+        if self.sizeof is not None:
+            size = self.sizeof(value)
+            if self.max_bytes is not None and size > self.max_bytes:
+                # past nooit; bestaande waarde is dan ook niet meer geldig
+                self.pop(key)
+                return
+        if key in self._data:
+            self._remove(key)
+
+        self._data[key] = value
+        if self.ttl is not None:
+            self._expires[key] = self.clock() + self.ttl
+        if self.sizeof is not None:
+            self._sizes[key] = size
+            self.bytes += size
+
+        while len(self._data) > self.maxsize or (
+            self.max_bytes is not None and self.bytes > self.max_bytes
+        ):
+            old_key = next(iter(self._data))
+            old_value = self._remove(old_key)
+            self.evictions += 1
+            if self.on_evict is not None:
+                self.on_evict(old_key, old_value)
+
+    def _remove(self, key: K) -> V:
+        value = self._data.pop(key)
+        self._expires.pop(key, None)
+        self.bytes -= self._sizes.pop(key, 0)
+        return value
+
+    def pop(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        if key not in self._data:
+            return default
+        return self._remove(key)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._expires.clear()
+        self._sizes.clear()
+        self.bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._data),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,157 @@
+"""
+Merkle-bomen voor batch-proofs (RFC 6962 / RFC 9162 stijl).
+
+Elke record in een batch krijgt een eigen proof hash. Die hashes zijn de
+bladeren van één Merkle-boom; de root bewijst de hele batch, en een
+inclusion path van O(log n) hashes bewijst één record.
+
+- bladhash : SHA-256(0x00 || proof_hash)
+- knoop    : SHA-256(0x01 || links || rechts)
+
+`MerkleBuilder` bouwt de boom incrementeel terwijl resultaten gestreamd
+worden: in het geheugen staat enkel de "frontier" (max. log2(n) volle
+deelbomen). Afgewerkte knopen gaan per niveau naar een tijdelijk bestand,
+zodat inclusion paths achteraf opgevraagd kunnen worden.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import tempfile
+from typing import IO, List, Optional, Sequence, Tuple
+
+HASH_SIZE = 32
+EMPTY_ROOT = hashlib.sha256(b"").digest()
+
+# per niveau in het geheugen tot deze grootte, daarna naar schijf
+SPOOL_BYTES = 1 << 20
+
+
+def leaf_hash(proof_hash: bytes) -> bytes:
+    return hashlib.sha256(b"\x00" + proof_hash).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def _largest_power_of_two_below(n: int) -> int:
+    """Grootste macht van 2 strikt kleiner dan n (n >= 2)."""
+    return 1 << ((n - 1).bit_length() - 1)
+
+
+class MerkleBuilder:
+    def __init__(self) -> None:
+        self.size = 0
+        # (niveau, hash) van de volle deelbomen, van groot naar klein
+        self._frontier: List[Tuple[int, bytes]] = []
+        # niveau 0 bewaart de proof hashes zelf, hogere niveaus de knopen
+        self._levels: List[IO[bytes]] = []
+
+    # ---------- opbouwen ----------
+    def _store(self, level: int, digest: bytes) -> None:
+        if level == len(self._levels):
+            self._levels.append(tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES))
+        f = self._levels[level]
+        f.seek(0, 2)
+        f.write(digest)
+
+    def append(self, proof_hash: bytes) -> int:
+        """Voegt een record toe; geeft zijn index in de boom terug."""
+        if len(proof_hash) != HASH_SIZE:
+            raise ValueError(f"proof hash must be {HASH_SIZE} bytes")
+
+        index = self.size
+        self._store(0, proof_hash)
+        level, digest = 0, leaf_hash(proof_hash)
+
+        while self._frontier and self._frontier[-1][0] == level:
+            _, left = self._frontier.pop()
+            level, digest = level + 1, node_hash(left, digest)
+            self._store(level, digest)
+
+        self._frontier.append((level, digest))
+        self.size += 1
+        return index
+
+    def root(self) -> bytes:
+        if not self._frontier:
+            return EMPTY_ROOT
+        digest = self._frontier[-1][1]
+        for _, left in reversed(self._frontier[:-1]):
+            digest = node_hash(left, digest)
+        return digest
+
+    # ---------- opvragen ----------
+    def _read(self, level: int, index: int) -> bytes:
+        f = self._levels[level]
+        f.seek(index * HASH_SIZE)
+        return f.read(HASH_SIZE)
+
+    def proof_hash_at(self, index: int) -> bytes:
+        return self._read(0, index)
+
+    def _subtree(self, start: int, end: int) -> bytes:
+        """Hash van de (deel)boom over bladeren [start, end)."""
+        width = end - start
+        if width & (width - 1) == 0 and start % width == 0:
+            level = width.bit_length() - 1
+            if level == 0:
+                return leaf_hash(self._read(0, start))
+            return self._read(level, start >> level)
+        k = _largest_power_of_two_below(width)
+        return node_hash(self._subtree(start, start + k), self._subtree(start + k, end))
+
+    def inclusion_path(self, index: int) -> List[bytes]:
+        """Audit path (RFC 6962 PATH), van blad naar root."""
+        if not 0 <= index < self.size:
+            raise IndexError("leaf index out of range")
+
+        path: List[bytes] = []
+        start, end = 0, self.size
+        # van de root naar het blad afdalen, daarna omkeren
+        while end - start > 1:
+            k = _largest_power_of_two_below(end - start)
+            if index < start + k:
+                path.append(self._subtree(start + k, end))
+                end = start + k
+            else:
+                path.append(self._subtree(start, start + k))
+                start = start + k
+        path.reverse()
+        return path
+
+    def close(self) -> None:
+        for f in self._levels:
+            f.close()
+        self._levels = []
+
+
+def verify_inclusion(
+    proof_hash: bytes, index: int, tree_size: int, path: Sequence[bytes], root: bytes
+) -> bool:
+    """Controleert een inclusion proof in O(log n) (RFC 9162, 2.1.3.2)."""
+    if not 0 <= index < tree_size:
+        return False
+
+    fn, sn = index, tree_size - 1
+    r = leaf_hash(proof_hash)
+    for p in path:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            r = node_hash(p, r)
+            while not fn & 1 and fn != 0:
+                fn >>= 1
+                sn >>= 1
+        else:
+            r = node_hash(r, p)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and r == root
+
+
+def close_builder(root: str, builder: Optional[MerkleBuilder]) -> None:
+    """`on_evict`-callback voor een LRU met afgewerkte batches."""
+    if builder is not None:
+        builder.close()
@@ -0,0 +1,224 @@
+"""
+Minimale Prometheus-metrics (tekstformaat 0.0.4) zonder externe dependency.
+
+- `Counter`, `Histogram` en `Gauge`/`CallbackCounter` (met callback) met labels
+- `MetricsMiddleware`: latency-histogram per route (pure ASGI, dus ook
+  geschikt voor streaming responses)
+- `REGISTRY.render()` geeft de tekst voor GET /metrics
+
+Alles draait op de event loop van één worker; observaties zijn een paar
+dict-lookups en een bisect, klein genoeg om in productie aan te laten.
+"""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _fmt_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(v: str) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_float(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v))
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> Iterable[str]:
+        for labels, v in sorted(self._values.items()):
+            yield f"{self.name}{_fmt_labels(self.labelnames, labels)} {_fmt_float(v)}"
+
+
+class _Timer:
+    __slots__ = ("hist", "labels", "t0")
+
+    def __init__(self, hist: "Histogram", labels: Tuple[str, ...]):
+        self.hist = hist
+        self.labels = labels
+
+    def __enter__(self) -> "_Timer":
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.hist.observe(time.perf_counter() - self.t0, *self.labels)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label-combinatie: [tellers per bucket (+Inf laatst), som]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def time(self, *labels: str) -> _Timer:
+        """`with hist.time("label"): ...` meet de duur van het blok."""
+        return _Timer(self, labels)
+
+    def samples(self) -> Iterable[str]:
+        bounds = self.buckets + (float("inf"),)
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, c in zip(bounds, counts):
+                cumulative += c
+                le = f'le="{_fmt_float(bound)}"'
+                yield f"{self.name}_bucket{_fmt_labels(self.labelnames, labels, le)} {cumulative}"
+            lbl = _fmt_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{lbl} {_fmt_float(total)}"
+            yield f"{self.name}_count{lbl} {cumulative}"
+
+
+class Gauge(_Metric):
+    """Gauge waarvan de waarden pas bij het scrapen opgehaald worden."""
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str],
+        collect: Callable[[], Iterable[Tuple[Tuple[str, ...], float]]],
+    ):
+        super().__init__(name, help, labelnames)
+        self.collect = collect
+
+    def samples(self) -> Iterable[str]:
+        for labels, v in self.collect():
+            yield f"{self.name}{_fmt_labels(self.labelnames, labels)} {_fmt_float(v)}"
+
+
+class CallbackCounter(Gauge):
+    """Teller die elders bijgehouden wordt (bv. cache-hits), uitgelezen bij het scrapen."""
+
+    type = "counter"
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for m in self._metrics:
+            lines.extend(m.header())
+            lines.extend(m.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+REQUEST_LATENCY: Histogram = REGISTRY.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency per route",
+        ("method", "route", "status"),
+    )
+)
+STAGE_LATENCY: Histogram = REGISTRY.register(
+    Histogram(
+        "clearance_stage_duration_seconds",
+        "Duration per processing stage (validate, parse, evaluate, hash, library, db)",
+        ("stage",),
+    )
+)
+RULE_EVALUATIONS: Counter = REGISTRY.register(
+    Counter(
+        "clearance_rule_evaluations_total",
+        "Number of evaluated rules per rule type",
+        ("type",),
+    )
+)
+
+
+def count_rule_evaluations(type_counts: Iterable[Tuple[str, int]], records: int = 1) -> None:
+    for rule_type, n in type_counts:
+        RULE_EVALUATIONS.inc(rule_type, amount=n * records)
+
+
+class MetricsMiddleware:
+    """Meet de latency per route (template, bv. /dcl/schemas/{schema_hash})."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            REQUEST_LATENCY.observe(time.perf_counter() - t0, scope["method"], path, status)
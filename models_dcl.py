@@ -0,0 +1,67 @@
+"""
+Pydantic-modellen voor DCL-schema's en CLEARANCE-resultaten.
+
+Staan in een aparte module zodat ook de compiler en andere helpers ze
+kunnen gebruiken zonder `app.py` (en dus de database) te importeren.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+# -------------------------------------------------
+# DCL-MODELLEN
+# -------------------------------------------------
+class DCLRule(BaseModel):
+    id: str
+    type: str  # required | equals | max | min | in
+    field: str
+    value: Optional[Any] = None
+
+
+class DCLSchema(BaseModel):
+    law_title: str = "Untitled Law Snippet"
+    rules: List[DCLRule]
+    source_text: str
+    generated_at: str = Field(
+        default_factory=lambda: datetime.now(timezone.utc).isoformat()
+    )
+
+
+# -------------------------------------------------
+# CLEARANCE-MODELLEN
+# -------------------------------------------------
+class ClearanceResult(BaseModel):
+    rule_id: str
+    field: str
+    passed: bool
+    details: str
+
+
+class ProofLog(BaseModel):
+    law_title: str
+    schema: DCLSchema
+    data_checked: Dict[str, Any]
+    results: List[ClearanceResult]
+    overall_passed: bool
+    # ontbreekt bij een deterministische proof zonder expliciet tijdstip
+    generated_at: Optional[str] = Field(
+        default_factory=lambda: datetime.now(timezone.utc).isoformat()
+    )
+    # niet mee gehasht; ontbreekt bij oudere proofs (= sha256)
+    hash_algorithm: str = "sha256"
+    proof_hash: str
+
+
+class InclusionProof(BaseModel):
+    """Bewijs dat één batch-record (proof_hash) in een Merkle-root zit."""
+
+    proof_hash: str
+    index: int
+    tree_size: int
+    path: List[str]
+    root: str
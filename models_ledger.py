@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from datetime import datetime
+from database import Base
+
+
+class LedgerEntry(Base):
+    """
+    Append-only ledger met proofs van /clearance/check. Elke entry verwijst
+    via `prev_hash` naar de `entry_hash` van de vorige (zie `ledger.py`).
+    """
+
+    __tablename__ = "proof_ledger"
+
+    id = Column(Integer, primary_key=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    law_title = Column(String(255))
+    proof_hash = Column(String(64), index=True)
+    hash_algorithm = Column(String(32))
+    # uniek: twee writers die op dezelfde staart willen verderbouwen botsen,
+    # in plaats van de keten stilletjes te vertakken
+    prev_hash = Column(String(64), unique=True, nullable=False)
+    entry_hash = Column(String(64), unique=True, nullable=False)
+    # canonieke ProofLog-JSON, zoals teruggestuurd
+    payload = Column(Text)
+
+
+# lijst per wet (keyset op id)
+Index("ix_proof_ledger_law_title_id", LedgerEntry.law_title, LedgerEntry.id)
@@ -1,7 +1,12 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, func
 from datetime import datetime
 from database import Base
 
+# context is Text; PostgreSQL kan geen willekeurig lange waarden in een
+# btree-index steken, dus enkel een prefix indexeren
+CONTEXT_INDEX_PREFIX = 200
+
+
 class UseCase(Base):
     __tablename__ = "usecases"
 
@@ -14,3 +19,20 @@ class UseCase(Base):
     safeguards = Column(Text)
     extra_details = Column(Text)
     record_hash = Column(String(255), index=True)
+
+
+# Indexen voor keyset-paginatie op (created_at, id) en de filters van
+# /admin/usecases
+Index("ix_usecases_created_at_id", UseCase.created_at, UseCase.id)
+Index(
+    "ix_usecases_system_name_created_at_id",
+    UseCase.system_name,
+    UseCase.created_at,
+    UseCase.id,
+)
+Index(
+    "ix_usecases_context_prefix_created_at_id",
+    func.substr(UseCase.context, 1, CONTEXT_INDEX_PREFIX),
+    UseCase.created_at,
+    UseCase.id,
+)
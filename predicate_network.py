@@ -0,0 +1,340 @@
+"""
+Gedeeld predicatennetwerk (Rete-stijl) over meerdere DCL-schema's.
+
+Veel wetten delen identieke regels (zelfde type, veld en waarde). Het
+netwerk compileert elke unieke regel één keer tot een predicaat en
+evalueert het per record maar één keer:
+
+- alfa-knopen per veld: alle predicaten op één veld worden samen
+  geëvalueerd met één waarde uit de record. `equals`/`in` gaan via een
+  hash-index (waarde -> predicaten die slagen), `max`/`min` via bisect
+  over de gesorteerde drempels; wat niet te indexeren valt (bv. lijsten
+  als waarde) wordt gewoon per predicaat gecheckt.
+- fan-out: het resultaat van elk predicaat wordt gedeeld door elk schema
+  en elke regel die het gebruikt.
+
+Per schema is de uitkomst exact die van `evaluate(schema, data)` in app.py
+(zelfde ClearanceResult-lijst, zelfde volgorde en `details`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import pickle
+from bisect import bisect_left, bisect_right
+from itertools import count
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from dcl_compiler import CompiledRule, compile_rule
+from models_dcl import ClearanceResult, DCLSchema
+
+# (type, veld, digest van de gepickelde waarde)
+PredicateKey = Tuple[str, str, str]
+
+# Waarden waarvoor een dict-lookup exact hetzelfde geeft als `==`
+_INDEXABLE = {str, int, float, bool, type(None)}
+
+
+def predicate_key(rule: Any) -> PredicateKey:
+    # pickle i.p.v. canonieke JSON: de volgorde van dict-sleutels (zichtbaar
+    # in `details`) en de types (1, 1.0, True) blijven onderscheiden
+    try:
+        blob = pickle.dumps(rule.value, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        # niet te pickelen: nooit delen
+        return rule.type, rule.field, f"#{id(rule)}"
+    return rule.type, rule.field, hashlib.sha256(blob).hexdigest()
+
+
+def _indexable(value: Any) -> bool:
+    # NaN is niet gelijk aan zichzelf en hoort dus niet in een index
+    return value.__class__ in _INDEXABLE and value == value
+
+
+class Predicate:
+    __slots__ = ("id", "key", "rule", "refs")
+
+    def __init__(self, pid: int, key: PredicateKey, rule: CompiledRule):
+        self.id = pid
+        self.key = key
+        self.rule = rule
+        self.refs = 0
+
+
+class _FieldNode:
+    """Alfa-knoop: alle predicaten op één veld."""
+
+    __slots__ = (
+        "predicates",
+        "_dirty",
+        "required",
+        "eq_index",
+        "in_index",
+        "linear",
+        "scalar_linear",
+        "max_ts",
+        "max_ids",
+        "min_ts",
+        "min_ids",
+    )
+
+    def __init__(self) -> None:
+        self.predicates: Dict[int, Predicate] = {}
+        self._dirty = True
+
+    def add(self, pred: Predicate) -> None:
+        self.predicates[pred.id] = pred
+        self._dirty = True
+
+    def discard(self, pred: Predicate) -> None:
+        del self.predicates[pred.id]
+        self._dirty = True
+
+    def _build(self) -> None:
+        required: List[int] = []
+        eq_index: Dict[Any, List[int]] = {}
+        in_index: Dict[Any, List[int]] = {}
+        # equals/in: `linear` voor niet-scalaire recordwaarden (alles),
+        # `scalar_linear` voor wat niet in een index past
+        linear: List[Predicate] = []
+        scalar_linear: List[Predicate] = []
+        maxes: List[Tuple[float, int]] = []
+        mins: List[Tuple[float, int]] = []
+
+        for pred in self.predicates.values():
+            rule = pred.rule
+            if rule.type == "required":
+                required.append(pred.id)
+            elif rule.type == "equals":
+                linear.append(pred)
+                if _indexable(rule.value):
+                    eq_index.setdefault(rule.value, []).append(pred.id)
+                else:
+                    scalar_linear.append(pred)
+            elif rule.type == "in":
+                linear.append(pred)
+                options = rule.value if isinstance(rule.value, list) else []
+                if all(_indexable(o) for o in options):
+                    for o in options:
+                        ids = in_index.setdefault(o, [])
+                        # gelijke opties (bv. 1 en True) maar één keer
+                        if not ids or ids[-1] != pred.id:
+                            ids.append(pred.id)
+                else:
+                    scalar_linear.append(pred)
+            elif rule.type in ("max", "min"):
+                t = rule.threshold
+                # geen (of NaN) drempel: slaagt nooit
+                if t is not None and t == t:
+                    (maxes if rule.type == "max" else mins).append((t, pred.id))
+            # onbekende types slagen nooit
+
+        maxes.sort()
+        mins.sort()
+        self.required = required
+        self.eq_index = eq_index
+        self.in_index = in_index
+        self.linear = linear
+        self.scalar_linear = scalar_linear
+        self.max_ts = [t for t, _ in maxes]
+        self.max_ids = [pid for _, pid in maxes]
+        self.min_ts = [t for t, _ in mins]
+        self.min_ids = [pid for _, pid in mins]
+        self._dirty = False
+
+    def activate(self, v: Any, passed: Set[int]) -> None:
+        """Voegt de ids van de predicaten die slagen voor waarde `v` toe aan `passed`."""
+        if self._dirty:
+            self._build()
+
+        if self.required and v not in (None, ""):
+            passed.update(self.required)
+
+        if v.__class__ in _INDEXABLE:
+            hit = self.eq_index.get(v)
+            if hit:
+                passed.update(hit)
+            hit = self.in_index.get(v)
+            if hit:
+                passed.update(hit)
+            linear = self.scalar_linear
+        else:
+            linear = self.linear
+        for pred in linear:
+            if pred.rule.check(v):
+                passed.add(pred.id)
+
+        if self.max_ts or self.min_ts:
+            try:
+                x = float(v)
+            except Exception:
+                return
+            if x != x:
+                return
+            if self.max_ts:
+                passed.update(self.max_ids[bisect_left(self.max_ts, x) :])
+            if self.min_ts:
+                passed.update(self.min_ids[: bisect_right(self.min_ts, x)])
+
+
+class _SchemaNode:
+    """Beta-kant: de regels van één schema, in schemavolgorde."""
+
+    __slots__ = ("schema", "rules", "fields")
+
+    def __init__(self, schema: DCLSchema, rules: Tuple[Tuple[str, Predicate], ...]):
+        self.schema = schema
+        # (rule_id, predicaat)
+        self.rules = rules
+        self.fields = frozenset(pred.rule.field for _, pred in rules)
+
+
+class Activation:
+    """Resultaat van de alfa-knopen voor één record."""
+
+    __slots__ = ("data", "passed", "evaluated", "_details")
+
+    def __init__(self, data: Dict[str, Any], passed: Set[int], evaluated: int):
+        self.data = data
+        self.passed = passed
+        # aantal unieke predicaten dat geëvalueerd werd
+        self.evaluated = evaluated
+        self._details: Dict[int, str] = {}
+
+    def details(self, pred: Predicate) -> str:
+        text = self._details.get(pred.id)
+        if text is None:
+            rule = pred.rule
+            text = rule.describe(self.data.get(rule.field), pred.id in self.passed)
+            self._details[pred.id] = text
+        return text
+
+
+class PredicateNetwork:
+    def __init__(self) -> None:
+        self._schemas: Dict[str, _SchemaNode] = {}
+        self._predicates: Dict[PredicateKey, Predicate] = {}
+        self._fields: Dict[str, _FieldNode] = {}
+        self._ids = count()
+
+    # ---------- beheer ----------
+    def _predicate(self, rule: Any) -> Predicate:
+        key = predicate_key(rule)
+        pred = self._predicates.get(key)
+        if pred is None:
+            pred = self._predicates[key] = Predicate(next(self._ids), key, compile_rule(rule))
+            self._fields.setdefault(rule.field, _FieldNode()).add(pred)
+        pred.refs += 1
+        return pred
+
+    def add(self, key: str, schema: DCLSchema) -> None:
+        """Voegt een schema toe onder `key`; een bestaande key wordt overgeslagen."""
+        if key in self._schemas:
+            return
+        rules = tuple((r.id, self._predicate(r)) for r in schema.rules)
+        self._schemas[key] = _SchemaNode(schema, rules)
+
+    def remove(self, key: str) -> bool:
+        node = self._schemas.pop(key, None)
+        if node is None:
+            return False
+        for _, pred in node.rules:
+            pred.refs -= 1
+            if not pred.refs:
+                del self._predicates[pred.key]
+                field = pred.rule.field
+                self._fields[field].discard(pred)
+                if not self._fields[field].predicates:
+                    del self._fields[field]
+        return True
+
+    def fields(self, key: str) -> frozenset:
+        return self._schemas[key].fields
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._schemas
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._schemas)
+
+    def __len__(self) -> int:
+        return len(self._schemas)
+
+    @property
+    def predicate_count(self) -> int:
+        return len(self._predicates)
+
+    # ---------- evalueren ----------
+    def activate(self, data: Dict[str, Any], fields: Optional[Iterable[str]] = None) -> Activation:
+        """Evalueert alle predicaten op `fields` (standaard: alle velden) één keer."""
+        nodes = self._fields
+        get = data.get
+        passed: Set[int] = set()
+        evaluated = 0
+        for field in nodes if fields is None else fields:
+            node = nodes.get(field)
+            if node is not None:
+                node.activate(get(field), passed)
+                evaluated += len(node.predicates)
+        return Activation(data, passed, evaluated)
+
+    def _activate_for(
+        self, data: Dict[str, Any], keys: Optional[Iterable[str]]
+    ) -> Tuple[List[Tuple[str, _SchemaNode]], Activation]:
+        if keys is None:
+            nodes = list(self._schemas.items())
+            return nodes, self.activate(data)
+        nodes = [(k, self._schemas[k]) for k in keys]
+        fields: Set[str] = set()
+        for _, node in nodes:
+            fields |= node.fields
+        return nodes, self.activate(data, fields)
+
+    def failed_rule_ids(
+        self, data: Dict[str, Any], keys: Optional[Iterable[str]] = None
+    ) -> Tuple[Dict[str, List[str]], int]:
+        """Per schema de ids van de gefaalde regels, plus het aantal geëvalueerde predicaten."""
+        nodes, act = self._activate_for(data, keys)
+        passed = act.passed
+        out = {
+            key: [rule_id for rule_id, pred in node.rules if pred.id not in passed]
+            for key, node in nodes
+        }
+        return out, act.evaluated
+
+    def evaluate_dicts(
+        self, data: Dict[str, Any], keys: Optional[Iterable[str]] = None
+    ) -> Tuple[Dict[str, Tuple[List[Dict[str, Any]], bool]], int]:
+        """Als `CompiledSchema.evaluate_dicts()`, voor alle (of de gegeven) schema's."""
+        nodes, act = self._activate_for(data, keys)
+        passed_ids = act.passed
+        details = act.details
+        out: Dict[str, Tuple[List[Dict[str, Any]], bool]] = {}
+        for key, node in nodes:
+            rows: List[Dict[str, Any]] = []
+            overall = True
+            for rule_id, pred in node.rules:
+                passed = pred.id in passed_ids
+                rows.append(
+                    {
+                        "rule_id": rule_id,
+                        "field": pred.rule.field,
+                        "passed": passed,
+                        "details": details(pred),
+                    }
+                )
+                if not passed:
+                    overall = False
+            out[key] = (rows, overall)
+        return out, act.evaluated
+
+    def evaluate(
+        self, data: Dict[str, Any], keys: Optional[Iterable[str]] = None
+    ) -> Dict[str, Tuple[List[ClearanceResult], bool]]:
+        """Per schema exact `evaluate(schema, data)` uit app.py."""
+        rows, _ = self.evaluate_dicts(data, keys)
+        validate = ClearanceResult.model_validate
+        return {
+            key: ([validate(r) for r in results], overall)
+            for key, (results, overall) in rows.items()
+        }
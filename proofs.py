@@ -0,0 +1,116 @@
+"""
+Proof hashes over canonieke JSON.
+
+Canoniek = `json.dumps(payload, sort_keys=True, separators=(",", ":"))`,
+UTF-8 gecodeerd; de proof hash is een digest daarvan (standaard SHA-256,
+zie HASH_ALGORITHMS). `proof_hash()` hasht die bytes gestreamd (zie
+`canonical_hash.py`), zonder de string op te bouwen.
+
+`proof_log_bytes()` bouwt de canonieke bytes van een ProofLog-payload in één
+keer uit de stukken (de sleutels staan al in gesorteerde volgorde) en geeft
+die zelfde bytes terug als HTTP-body, met enkel `proof_hash` erachter
+geplakt. Zo wordt het payload maar één keer geserialiseerd.
+
+Zonder `generated_at` is een proof deterministisch: dezelfde schema + data
+geven altijd dezelfde hash, en de response kan gecachet worden.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from canonical_hash import hash_canonical
+
+_dumps = json.JSONEncoder(sort_keys=True, separators=(",", ":")).encode
+
+# Ondersteunde proof-hashalgoritmen (allemaal 32 bytes, dus ook bruikbaar als
+# Merkle-blad). Proofs zonder `hash_algorithm` zijn van vóór dit veld: sha256.
+HASH_ALGORITHMS: Dict[str, Callable[[], Any]] = {
+    "sha256": hashlib.sha256,
+    "blake2b-256": lambda: hashlib.blake2b(digest_size=32),
+    "sha3-256": hashlib.sha3_256,
+}
+DEFAULT_HASH_ALGORITHM = "sha256"
+
+# velden van een ProofLog die zelf niet in de hash zitten
+UNHASHED_FIELDS = ("proof_hash", "hash_algorithm")
+
+
+def new_hasher(algorithm: str = DEFAULT_HASH_ALGORITHM) -> Any:
+    try:
+        return HASH_ALGORITHMS[algorithm]()
+    except KeyError:
+        raise ValueError(f"Unknown hash algorithm: {algorithm}") from None
+
+
+def canonical_json(obj: Any) -> str:
+    return _dumps(obj)
+
+
+def proof_hash(payload: Dict[str, Any], algorithm: str = DEFAULT_HASH_ALGORITHM) -> str:
+    """Hash over de canonieke JSON, gestreamd (geheugen onafhankelijk van de grootte)."""
+    return hash_canonical(new_hasher(algorithm), payload).hexdigest()
+
+
+def small_proof_hash(payload: Dict[str, Any], algorithm: str = DEFAULT_HASH_ALGORITHM) -> str:
+    """
+    Zelfde hash als `proof_hash()`, in één keer geserialiseerd. Sneller voor
+    payloads waarvan de grootte al begrensd is (bv. één NDJSON-lijn).
+    """
+    h = new_hasher(algorithm)
+    h.update(canonical_json(payload).encode("utf-8"))
+    return h.hexdigest()
+
+
+def proof_log_bytes(
+    law_title: str,
+    schema_json: str,
+    data_json: str,
+    results_json: str,
+    overall_passed: bool,
+    generated_at: Optional[str],
+    hash_algorithm: str = DEFAULT_HASH_ALGORITHM,
+) -> Tuple[bytes, str]:
+    """
+    Canonieke ProofLog-payload -> (response-body, proof hash).
+
+    `schema_json`, `data_json` en `results_json` zijn al canonieke JSON (zie
+    `CompiledSchema.schema_json`), zodat gecachete stukken hergebruikt
+    worden. Zonder `generated_at` (deterministische proof) ontbreekt die
+    sleutel. De gehashte bytes zijn identiek aan `canonical_json()` van het
+    overeenkomstige dict; de body voegt er `hash_algorithm` en `proof_hash`
+    aan toe.
+    """
+    canonical = (
+        '{"data_checked":' + data_json
+        + (',"generated_at":' + _dumps(generated_at) if generated_at is not None else "")
+        + ',"law_title":' + _dumps(law_title)
+        + ',"overall_passed":' + ("true" if overall_passed else "false")
+        + ',"results":' + results_json
+        + ',"schema":' + schema_json
+        + "}"
+    ).encode("utf-8")
+    hasher = new_hasher(hash_algorithm)
+    hasher.update(canonical)
+    h = hasher.hexdigest()
+    body = (
+        canonical[:-1]
+        + f',"hash_algorithm":"{hash_algorithm}","proof_hash":"{h}"}}'.encode("ascii")
+    )
+    return body, h
+
+
+def verify_proof_log(log: Dict[str, Any]) -> bool:
+    """
+    Herberekent de hash van een (JSON-gedecodeerde) ProofLog met het
+    algoritme dat erin staat; zonder `hash_algorithm` is dat sha256.
+    """
+    expected = log.get("proof_hash")
+    if not isinstance(expected, str):
+        return False
+    algorithm = log.get("hash_algorithm", "sha256")
+    payload = {k: v for k, v in log.items() if k not in UNHASHED_FIELDS}
+    return hmac.compare_digest(proof_hash(payload, algorithm), expected)
@@ -0,0 +1,64 @@
+"""
+Caches voor herhaalde clearance-checks.
+
+Sleutels zijn (schema_key, subkey): `schema_key` is de digest van het hele
+schema (`dcl_compiler.schema_key()`, te berekenen zonder te compileren),
+`subkey` bv. de digest van de canonieke data. Alle items van één schema kunnen in één keer
+geïnvalideerd worden, bv. wanneer een geregistreerd schema vervangen wordt.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Generic, Hashable, Optional, Set, Tuple, TypeVar
+
+from lru import LRUCache
+
+V = TypeVar("V")
+Key = Tuple[str, Hashable]
+
+
+class SchemaScopedCache(Generic[V]):
+    def __init__(
+        self,
+        maxsize: int,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[V], int]] = None,
+        ttl: Optional[float] = None,
+    ):
+        self._lru: LRUCache[Key, V] = LRUCache(
+            maxsize, on_evict=self._forget, ttl=ttl, max_bytes=max_bytes, sizeof=sizeof
+        )
+        self._by_schema: Dict[str, Set[Hashable]] = {}
+
+    def _forget(self, key: Key, value: V) -> None:
+        schema_key, subkey = key
+        subkeys = self._by_schema.get(schema_key)
+        if subkeys is not None:
+            subkeys.discard(subkey)
+            if not subkeys:
+                del self._by_schema[schema_key]
+
+    def get(self, schema_key: str, subkey: Hashable) -> Optional[V]:
+        return self._lru.get((schema_key, subkey))
+
+    def put(self, schema_key: str, subkey: Hashable, value: V) -> None:
+        self._lru.put((schema_key, subkey), value)
+        if (schema_key, subkey) in self._lru:
+            self._by_schema.setdefault(schema_key, set()).add(subkey)
+
+    def invalidate(self, schema_key: str) -> int:
+        """Verwijdert alle items van één schema; geeft het aantal terug."""
+        subkeys = self._by_schema.pop(schema_key, ())
+        for subkey in subkeys:
+            self._lru.pop((schema_key, subkey))
+        return len(subkeys)
+
+    def clear(self) -> None:
+        self._lru.clear()
+        self._by_schema.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return self._lru.stats()
+
+    def __len__(self) -> int:
+        return len(self._lru)
@@ -0,0 +1,161 @@
+"""
+Content-addressed registry voor DCL-schema's.
+
+Een schema wordt geregistreerd onder een stabiele hash van zijn inhoud
+(`law_title`, `rules`, `source_text`; `generated_at` telt niet mee).
+Clearance-requests kunnen daarna met `schema_ref` naar die hash verwijzen,
+zodat parse, validatie en compilatie maar één keer per schema gebeuren.
+
+De registry is een begrensde LRU: een schema dat eruit valt moet opnieuw
+geregistreerd worden. Listeners (`on_remove`) horen wanneer een schema
+verdwijnt (LRU, `remove()` of vervangen via `register(..., replaces=...)`),
+zodat caches per schema geïnvalideerd kunnen worden.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Callable, List, Optional
+
+from pydantic import TypeAdapter
+
+from dcl_compiler import CompiledSchema, compile_schema, recompile
+from lru import LRUCache
+from models_dcl import DCLRule, DCLSchema
+
+HASHED_FIELDS = {"law_title", "rules", "source_text"}
+_RULES = TypeAdapter(List[DCLRule])
+# wat json.dumps() met een str doet
+_json_str = json.encoder.encode_basestring_ascii
+
+
+def schema_digest(schema: DCLSchema, rule_json: Optional[List[str]] = None) -> str:
+    """
+    SHA-256 van de canonieke JSON van HASHED_FIELDS. Met `rule_json` (de
+    canonieke JSON per regel, zie `rules_json()`) worden de regels niet
+    opnieuw geserialiseerd; de uitkomst is dezelfde.
+    """
+    if rule_json is None:
+        content = schema.model_dump(mode="json", include=HASHED_FIELDS)
+        canonical = json.dumps(content, sort_keys=True, separators=(",", ":"))
+    else:
+        # zelfde bytes als json.dumps(content, sort_keys=True, ...) hierboven
+        canonical = (
+            f'{{"law_title":{json.dumps(schema.law_title)},'
+            f'"rules":[{",".join(rule_json)}],'
+            f'"source_text":{json.dumps(schema.source_text)}}}'
+        )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def rules_json(rules: List[DCLRule]) -> List[str]:
+    """Canonieke JSON per regel, zoals ze in `schema_digest()` voorkomt."""
+    return [
+        json.dumps(r, sort_keys=True, separators=(",", ":"))
+        for r in _RULES.dump_python(rules, mode="json")
+    ]
+
+
+def _with_id(fragment: str, field: str, rule_id: str) -> str:
+    """Canonieke JSON van een regel met een andere id (de sleutels staan gesorteerd)."""
+    head = f'{{"field":{_json_str(field)},"id":'
+    rest = fragment.index(',"type":', len(head))
+    return f"{head}{_json_str(rule_id)}{fragment[rest:]}"
+
+
+class RegisteredSchema:
+    __slots__ = ("hash", "schema", "compiled", "_rule_json")
+
+    def __init__(
+        self,
+        schema_hash: str,
+        schema: DCLSchema,
+        compiled: CompiledSchema,
+        rule_json: Optional[List[str]] = None,
+    ):
+        self.hash = schema_hash
+        self.schema = schema
+        self.compiled = compiled
+        self._rule_json = rule_json
+
+    @property
+    def rule_json(self) -> List[str]:
+        """`rules_json()` van het schema; pas berekend bij de eerste edit."""
+        if self._rule_json is None:
+            self._rule_json = rules_json(self.schema.rules)
+        return self._rule_json
+
+
+class SchemaRegistry:
+    def __init__(self, maxsize: int = 1024):
+        self._entries: LRUCache[str, RegisteredSchema] = LRUCache(
+            maxsize, on_evict=lambda _, entry: self._notify(entry)
+        )
+        self._listeners: List[Callable[[RegisteredSchema], None]] = []
+
+    def on_remove(self, listener: Callable[[RegisteredSchema], None]) -> None:
+        self._listeners.append(listener)
+
+    def _notify(self, entry: RegisteredSchema) -> None:
+        for listener in self._listeners:
+            listener(entry)
+
+    def register(self, schema: DCLSchema, replaces: Optional[str] = None) -> RegisteredSchema:
+        """
+        Registreert (en compileert) het schema; bestaande hash wordt hergebruikt.
+        Met `replaces` wordt een vorige versie meteen verwijderd.
+        """
+        schema_hash = schema_digest(schema)
+        entry = self._entries.get(schema_hash)
+        if entry is None:
+            entry = RegisteredSchema(schema_hash, schema, compile_schema(schema))
+            self._entries.put(schema_hash, entry)
+        if replaces is not None and replaces != schema_hash:
+            self.remove(replaces)
+        return entry
+
+    def register_splice(
+        self,
+        base: RegisteredSchema,
+        schema: DCLSchema,
+        start: int,
+        stop: int,
+        count: int,
+        replaces: Optional[str] = None,
+    ) -> RegisteredSchema:
+        """
+        `register()` voor een schema dat uit `base.schema` ontstaat door
+        `rules[start:stop]` te vervangen door `count` nieuwe regels (de regels
+        erna eventueel met een andere id, zie `dcl_parser.reparse()`). Enkel
+        de nieuwe of hernummerde regels worden geserialiseerd en gecompileerd.
+        """
+        new_rules = schema.rules
+        tail = base.rule_json[stop:]
+        if tail and new_rules[start + count].id != base.schema.rules[stop].id:
+            moved = zip(tail, base.schema.rules[stop:], new_rules[start + count :])
+            tail = [_with_id(fragment, old.field, new.id) for fragment, old, new in moved]
+        rule_json = base.rule_json[:start] + rules_json(new_rules[start : start + count]) + tail
+
+        schema_hash = schema_digest(schema, rule_json)
+        entry = self._entries.get(schema_hash)
+        if entry is None:
+            compiled = recompile(base.compiled, schema, start, stop, count)
+            entry = RegisteredSchema(schema_hash, schema, compiled, rule_json)
+            self._entries.put(schema_hash, entry)
+        if replaces is not None and replaces != schema_hash:
+            self.remove(replaces)
+        return entry
+
+    def get(self, schema_hash: str) -> Optional[RegisteredSchema]:
+        return self._entries.get(schema_hash)
+
+    def remove(self, schema_hash: str) -> bool:
+        entry = self._entries.pop(schema_hash)
+        if entry is None:
+            return False
+        self._notify(entry)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._entries)
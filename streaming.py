@@ -0,0 +1,53 @@
+"""
+Hulpmiddelen voor streaming endpoints (NDJSON in en uit).
+"""
+
+from __future__ import annotations
+
+from typing import AsyncIterator, List
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+async def aiter_line_batches(chunks: AsyncIterator[bytes]) -> AsyncIterator[List[bytes]]:
+    """
+    Splitst een stroom bytes op b"\\n" en geeft per binnenkomende chunk de
+    complete lijnen terug. Een onvolledige laatste lijn wacht op de volgende
+    chunk, dus het geheugen blijft begrensd tot één chunk plus één lijn.
+    """
+    pending: List[bytes] = []
+
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        pieces = chunk.split(b"\n")
+        if len(pieces) == 1:
+            pending.append(chunk)
+            continue
+
+        pending.append(pieces[0])
+        pieces[0] = b"".join(pending)
+        tail = pieces.pop()
+        pending = [tail] if tail else []
+        yield pieces
+
+    if pending:
+        yield [b"".join(pending)]
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse die de request-body mag blijven lezen terwijl het
+    antwoord al verstuurd wordt.
+
+    De standaard StreamingResponse luistert (bij ASGI < 2.4) zelf op
+    `receive()` voor een disconnect en zou zo body-chunks wegnemen. Hier leest
+    de body-iterator de request zelf; een disconnect komt via
+    `Request.stream()` als ClientDisconnect naar boven.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,73 @@
+"""
+Differentiële test: `evaluate_columnar()` vs. `evaluate()` per record.
+
+Zowel object-kolommen (`from_records`) als numerieke kolommen
+(`from_columns`), met gehele getallen boven 2**53 die in een float64 niet
+meer exact passen.
+
+    python -m pytest tests
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from benchmarks.common import ensure_env
+
+ensure_env()
+
+from app import evaluate  # noqa: E402
+from columnar import ColumnBatch, evaluate_columnar  # noqa: E402
+from dcl_compiler import compile_schema  # noqa: E402
+from models_dcl import DCLRule, DCLSchema  # noqa: E402
+
+BIG = 10**18
+RULES = [
+    ("in", [BIG]),
+    ("in", [BIG + 1]),
+    ("in", [BIG, 0.5]),
+    ("in", [BIG + 1, 2.5]),
+    ("in", [2**53 + 1, 1.0]),
+    ("in", [7, 2.5]),
+    ("in", [float(BIG), "x"]),
+    ("equals", BIG),
+    ("equals", BIG + 1),
+    ("max", BIG),
+    ("min", BIG + 1),
+]
+VALUES = [0, 1, 7, BIG, BIG + 1, -BIG - 1, 2**53, 2**53 + 1]
+
+
+def make_schema() -> DCLSchema:
+    rules = [
+        DCLRule(id=f"r{i + 1}", type=typ, field="n", value=value)
+        for i, (typ, value) in enumerate(RULES)
+    ]
+    return DCLSchema(law_title="test", rules=rules, source_text="")
+
+
+def assert_same(schema: DCLSchema, batch: ColumnBatch, records) -> None:
+    result = evaluate_columnar(compile_schema(schema), batch)
+    for i, record in enumerate(records):
+        expected = [r.passed for r in evaluate(schema, record)[0]]
+        assert list(result.passed[:, i]) == expected, record
+
+
+def test_object_column_matches_evaluate():
+    schema = make_schema()
+    records = [{"n": v} for v in VALUES + [2.5, 0.5, float(BIG), None, "x"]]
+    assert_same(schema, ColumnBatch.from_records(records), records)
+
+
+def test_int_column_matches_evaluate():
+    schema = make_schema()
+    records = [{"n": v} for v in VALUES]
+    batch = ColumnBatch.from_columns({"n": np.array(VALUES, dtype=np.int64)})
+    assert_same(schema, batch, records)
+
+
+def test_float_column_matches_evaluate():
+    schema = make_schema()
+    values = [0.0, 0.5, 2.5, 7.0, float(BIG), float(2**53)]
+    records = [{"n": v} for v in values]
+    assert_same(schema, ColumnBatch.from_columns({"n": np.array(values)}), records)
@@ -0,0 +1,57 @@
+"""
+Tests voor `dcl_parser`: incrementeel herparsen en streaming.
+
+    python -m pytest tests
+"""
+
+from __future__ import annotations
+
+import random
+
+from dcl_parser import StreamParser, parse_law_text, parse_rules, reparse, splice_changes
+
+LAW = "require a\nmax w 5\nequals c BE\nmin w 1\nin d x,y\n"
+
+
+def _changes(start: int, end: int, text: str):
+    base = parse_law_text(LAW)
+    schema, splice = reparse(base, start, end, text)
+    removed, added = splice_changes(base, schema, splice)
+    return [r.id for r in removed], [(r.id, r.type, r.field) for r in added]
+
+
+def test_splice_changes_lists_only_edited_rules():
+    assert _changes(3, 4, "equals c NL\n") == (["r3"], [("r3", "equals", "c")])
+    # ingevoegd/verwijderd: de buren en de verschoven regels tellen niet
+    assert _changes(2, 2, "require z\n") == ([], [("r2", "required", "z")])
+    assert _changes(2, 3, "") == (["r2"], [])
+    # dezelfde regel opnieuw: niets gewijzigd
+    assert _changes(3, 4, "equals c BE\n") == ([], [])
+
+
+def _stream(pieces) -> list:
+    parser = StreamParser()
+    rules = []
+    for piece in pieces:
+        rules += parser.feed(piece)
+    return rules + parser.close()
+
+
+def test_stream_matches_parse_rules():
+    rng = random.Random(24)
+    breaks = ["\n", "\r", "\r\n", "\x0b", "\x85", "\u2028", ""]
+    lines = ["require a", "max w 5", "equals c BE", "in d x,y", "onzin", ""]
+    for _ in range(200):
+        text = "".join(rng.choice(lines) + rng.choice(breaks) for _ in range(rng.randrange(20)))
+        cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randrange(8))))
+        pieces = [text[i:j] for i, j in zip([0] + cuts, cuts + [len(text)])]
+        assert _stream(pieces) == parse_rules(text), repr(text)
+
+
+def test_stream_long_line_without_newline():
+    # 2 MB in stukjes van 8 tekens: kwadratisch samenvoegen duurt hier minuten
+    value = "x" * (1 << 21)
+    pieces = ["require a\nequals c "] + [value[i : i + 8] for i in range(0, len(value), 8)]
+    rules = _stream(pieces)
+    assert [r.id for r in rules] == ["r1", "r2"]
+    assert rules == parse_rules("require a\nequals c " + value)
@@ -0,0 +1,141 @@
+"""
+Differentiële test: `dcl_sql.check_in_db()` op SQLite vs. `evaluate()`.
+
+Willekeurige schema's over een JSON-kolom én getypeerde kolommen, met
+randgevallen (True vs. 1, getallen als string, lege strings, null vs.
+ontbrekend, lijsten als waarde): per regel moeten de tellers en de ids van
+de gefaalde rijen gelijk zijn.
+
+    python -m pytest tests
+"""
+
+from __future__ import annotations
+
+import random
+
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    Float,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    insert,
+    select,
+)
+
+from benchmarks.common import ensure_env
+
+ensure_env()
+
+from app import evaluate  # noqa: E402
+from dcl_sql import ColumnSource, JsonSource, check_in_db  # noqa: E402
+from models_dcl import DCLRule, DCLSchema  # noqa: E402
+
+FIELDS = ["manufacturer", "country", "weight", "category", "active"]
+JSON_VALUES = [
+    "ACME", "", "BE", "NL", None, 0, 1, True, False, 1.0, 7, 42, 50, 50.5, -3,
+    "42", " 7 ", "1_000", "1e3", "abc", "inf", "-Infinity", "nan", [1], {"a": 1},
+]
+RULE_VALUES = {
+    "required": [None],
+    "equals": ["BE", "", None, 1, True, False, 0, 42.0, "42", 50.5],
+    "max": [50, 50.0, "50", 0, "abc", 1e309, -1e309, 7],
+    "min": [0, 1, "7", 42.5, None, 1e309, -1e309],
+    "in": [["BE", "NL"], [1, "1"], [True], [], [None, ""], [42, 7.0, "x"], "BE"],
+    "regex": [".*"],
+}
+ROWS = 500
+SCHEMAS = 30
+
+metadata = MetaData()
+records = Table(
+    "records", metadata, Column("id", Integer, primary_key=True), Column("data", JSON)
+)
+typed = Table(
+    "typed",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("manufacturer", String),
+    Column("country", String),
+    Column("weight", Float),
+    Column("category", String),
+    Column("active", Boolean),
+)
+
+
+def make_schema(rng: random.Random, n_rules: int) -> DCLSchema:
+    rules = []
+    for i in range(n_rules):
+        typ = rng.choice(list(RULE_VALUES))
+        rules.append(
+            DCLRule(
+                id=f"r{i + 1}",
+                type=typ,
+                field=rng.choice(FIELDS),
+                value=rng.choice(RULE_VALUES[typ]),
+            )
+        )
+    return DCLSchema(law_title="test", rules=rules, source_text="")
+
+
+def make_record(rng: random.Random) -> dict:
+    return {f: rng.choice(JSON_VALUES) for f in FIELDS if rng.random() < 0.8}
+
+
+def make_typed(rng: random.Random) -> dict:
+    return {
+        "manufacturer": rng.choice(["ACME", "", None]),
+        "country": rng.choice(["BE", "NL", "42", " 7 ", "1e3", "abc", None]),
+        "weight": rng.choice([0.0, 1.0, 7.0, 42.0, 50.0, 50.5, -3.0, None]),
+        "category": rng.choice(["BE", "x", "1", "", None]),
+        "active": rng.choice([True, False, None]),
+    }
+
+
+def python_failing(schema: DCLSchema, rows) -> dict:
+    failing = {r.id: [] for r in schema.rules}
+    for row_id, data in rows:
+        results, _ = evaluate(schema, data)
+        for r in results:
+            if not r.passed:
+                failing[r.rule_id].append(row_id)
+    return failing
+
+
+def assert_same(conn, schema: DCLSchema, source, rows) -> None:
+    expected = python_failing(schema, rows)
+    got = check_in_db(conn, schema, source, failing_limit=len(rows))
+    assert got["rows"] == len(rows)
+    for r in got["rules"]:
+        assert r["failing_ids"] == expected[r["rule_id"]], (r["rule_id"], r)
+        assert r["failed"] == len(expected[r["rule_id"]])
+
+
+def test_json_column_matches_evaluate():
+    rng = random.Random(19)
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        rows = [(i, make_record(rng)) for i in range(1, ROWS + 1)]
+        conn.execute(insert(records), [{"id": i, "data": d} for i, d in rows])
+        for _ in range(SCHEMAS):
+            assert_same(conn, make_schema(rng, 20), JsonSource(records, "data"), rows)
+
+
+def test_typed_columns_match_evaluate():
+    rng = random.Random(19)
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(typed), [{"id": i, **make_typed(rng)} for i in range(1, ROWS + 1)])
+        # Python ziet de rijen zoals ze uit de database komen (NULL = ontbrekend)
+        rows = [
+            (row.id, {k: v for k, v in row._mapping.items() if k != "id" and v is not None})
+            for row in conn.execute(select(typed).order_by(typed.c.id))
+        ]
+        for _ in range(SCHEMAS):
+            assert_same(conn, make_schema(rng, 20), ColumnSource(typed), rows)
@@ -0,0 +1,36 @@
+"""
+Test: het gedeelde predicatennetwerk geeft per schema exact `evaluate()`,
+ook voor waarden die enkel in de volgorde van dict-sleutels of in hun type
+verschillen (en dus geen predicaat mogen delen).
+
+    python -m pytest tests
+"""
+
+from __future__ import annotations
+
+from benchmarks.common import ensure_env
+
+ensure_env()
+
+from app import evaluate  # noqa: E402
+from models_dcl import DCLRule, DCLSchema  # noqa: E402
+from predicate_network import PredicateNetwork  # noqa: E402
+
+VALUES = [{"a": 1, "b": 2}, {"b": 2, "a": 1}, {"a": 1.0, "b": 2}, 1, 1.0, True, [1, 2], [2, 1]]
+RECORDS = [{"x": {"a": 1, "b": 2}}, {"x": 1}, {"x": [1, 2]}, {"x": 5}, {}]
+
+
+def test_network_matches_evaluate():
+    network = PredicateNetwork()
+    schemas = {}
+    for i, value in enumerate(VALUES):
+        for typ in ("equals", "in"):
+            rules = [DCLRule(id="r1", type=typ, field="x", value=value)]
+            schemas[f"{typ}{i}"] = DCLSchema(law_title="test", rules=rules, source_text="")
+            network.add(f"{typ}{i}", schemas[f"{typ}{i}"])
+
+    assert network.predicate_count == len(schemas)
+    for record in RECORDS:
+        out = network.evaluate(record)
+        for key, schema in schemas.items():
+            assert out[key] == evaluate(schema, record), (key, record)
@@ -0,0 +1,107 @@
+"""
+Streaming export van de use-case inventory als NDJSON, CSV of Parquet.
+
+Elke writer krijgt de rijen per batch (zoals ze uit de server-side cursor
+komen) en geeft per batch meteen de bytes terug, zodat het geheugen
+begrensd blijft tot één batch.
+
+Parquet vraagt `pyarrow`; dat is optioneel (zie `parquet_available()`).
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Dict, List
+
+COLUMNS = [
+    "id",
+    "created_at",
+    "system_name",
+    "purpose",
+    "context",
+    "data_used",
+    "safeguards",
+    "extra_details",
+    "record_hash",
+]
+
+Batches = AsyncIterator[List[Dict[str, Any]]]
+
+
+async def write_ndjson(batches: Batches) -> AsyncIterator[bytes]:
+    async for rows in batches:
+        yield "".join(
+            json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in rows
+        ).encode("utf-8")
+
+
+async def write_csv(batches: Batches) -> AsyncIterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=COLUMNS)
+    writer.writeheader()
+    yield buf.getvalue().encode("utf-8")
+
+    async for rows in batches:
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows(rows)
+        yield buf.getvalue().encode("utf-8")
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class _DrainableSink(io.RawIOBase):
+    """Bestandsobject dat wat er geschreven wordt bijhoudt tot het opgehaald wordt."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+async def write_parquet(batches: Batches) -> AsyncIterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [("id", pa.int64()), ("created_at", pa.string())]
+        + [(c, pa.string()) for c in COLUMNS[2:]]
+    )
+    sink = _DrainableSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        # één row group per batch
+        async for rows in batches:
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+EXPORT_FORMATS = {
+    "ndjson": (write_ndjson, "application/x-ndjson"),
+    "csv": (write_csv, "text/csv; charset=utf-8"),
+    "parquet": (write_parquet, "application/vnd.apache.parquet"),
+}
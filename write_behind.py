@@ -0,0 +1,111 @@
+"""
+Write-behind queue: schrijfopdrachten verzamelen en in batches wegschrijven.
+
+Callers zetten een item in de queue en wachten (optioneel) op het resultaat
+van de flush, bv. de nieuwe id. Een achtergrondtaak flusht zodra er
+`max_batch` items klaarstaan of `max_delay` seconden verstreken zijn sinds
+het eerste item van de batch, met één multi-row INSERT per batch.
+
+`stop()` sluit de queue en schrijft alles wat nog wacht weg (graceful drain);
+`start()` opent ze opnieuw, bv. bij een volgende startup van de app.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Tuple
+
+Flush = Callable[[List[Any]], Awaitable[Sequence[Any]]]
+
+_STOP = object()
+
+
+class WriteBehindQueue:
+    def __init__(
+        self,
+        flush: Flush,
+        max_batch: int = 100,
+        max_delay: float = 0.01,
+        max_queue: int = 10_000,
+    ):
+        self.flush = flush
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_queue = max_queue
+        self._queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=max_queue)
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    def start(self) -> None:
+        """Opent een gestopte queue opnieuw (de achtergrondtaak start bij het eerste item)."""
+        if not self._closed:
+            return
+        # een asyncio.Queue hoort bij één event loop; een nieuwe startup kan een andere hebben
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._closed = False
+
+    def _ensure_started(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def enqueue(self, item: Any) -> "asyncio.Future[Any]":
+        """Zet een item in de queue; de future krijgt het flush-resultaat."""
+        if self._closed:
+            raise RuntimeError("write-behind queue is closed")
+        self._ensure_started()
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, fut))
+        return fut
+
+    async def submit(self, item: Any) -> Any:
+        """Zet een item in de queue en wacht tot het weggeschreven is."""
+        return await (await self.enqueue(item))
+
+    async def _next_batch(self) -> Tuple[List[Tuple[Any, asyncio.Future]], bool]:
+        first = await self._queue.get()
+        if first is _STOP:
+            return [], True
+
+        batch = [first]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_delay
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            try:
+                if timeout > 0:
+                    entry = await asyncio.wait_for(self._queue.get(), timeout)
+                else:
+                    entry = self._queue.get_nowait()
+            except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                break
+            if entry is _STOP:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._next_batch()
+            if not batch:
+                continue
+            items = [item for item, _ in batch]
+            try:
+                results = await self.flush(items)
+            except Exception as exc:
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(exc)
+                continue
+            for (_, fut), result in zip(batch, results):
+                if not fut.done():
+                    fut.set_result(result)
+
+    async def stop(self) -> None:
+        """Sluit de queue en wacht tot alle items weggeschreven zijn."""
+        self._closed = True
+        if self._task is None:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None